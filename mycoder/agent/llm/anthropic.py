@@ -4,16 +4,26 @@ Anthropic LLM provider implementation for MyCoder.
 This module implements the LLM provider interface for Anthropic's Claude models.
 """
 
+import asyncio
+import atexit
+import hashlib
 import json
 import os
 import logging
-from typing import Any, Dict, List, Optional, Tuple, Union
+import random
+from collections import OrderedDict
+from contextlib import AsyncExitStack, asynccontextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Type, Union
 
 import anthropic
-from anthropic.types import ContentBlock, Message as AnthropicMessage
+import httpx
+from anthropic.types import Message as AnthropicMessage
+from anthropic.lib.streaming import AsyncMessageStream
 from anthropic import Anthropic, AsyncAnthropic, APIError, RateLimitError
 
 from .base import LLMProvider, LLMResponse, Message, MessageRole, ToolCall
+from .cache import RedisResponseCache, ResponseCache, SemanticCache, make_cache_key
 from .exceptions import (
     LLMError,
     ProviderAPIError,
@@ -24,6 +34,100 @@ from .exceptions import (
     ContextLengthExceededError
 )
 
+# A single request for generate_batch: (messages, tools, temperature, max_tokens)
+BatchRequest = Tuple[List[Message], Optional[List[Dict[str, Any]]], float, Optional[int]]
+
+# Substrings of bad request messages that identify more specific errors. Anthropic
+# reports both as invalid_request_error, so the error type can't tell them apart.
+_CONTEXT_LENGTH_KEYWORDS = ("maximum context length", "tokens")
+_CONTENT_FILTER_KEYWORDS = ("content filtered", "content policy")
+
+# Provider errors raised for specific Anthropic API errors; others become ProviderAPIError
+_API_ERROR_MAP: Dict[Type[anthropic.APIError], Type[ProviderAPIError]] = {
+    anthropic.AuthenticationError: ProviderAuthenticationError,
+    anthropic.RateLimitError: ProviderRateLimitError
+}
+
+# Responses to deterministic requests, shared by all provider instances
+_RESPONSE_CACHE = ResponseCache(maxsize=256)
+
+# Redis-backed response caches shared by all provider instances, keyed by URL and TTL
+_REDIS_CACHES: Dict[Tuple[str, int], RedisResponseCache] = {}
+
+# Connection pool limits for the shared HTTP clients
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=2000, max_keepalive_connections=500)
+
+# Anthropic clients shared by all provider instances, keyed by API key
+_CLIENT_CACHE: Dict[str, AsyncAnthropic] = {}
+
+
+def _get_shared_client(api_key: str) -> AsyncAnthropic:
+    """
+    Get the shared Anthropic client for an API key, creating it if needed.
+    
+    Sharing one client per key lets every provider instance reuse the same
+    connection pool instead of paying connection setup for each instance.
+    
+    Args:
+        api_key: The Anthropic API key
+        
+    Returns:
+        AsyncAnthropic: The shared client
+    """
+    client = _CLIENT_CACHE.get(api_key)
+    if client is None:
+        client = AsyncAnthropic(
+            api_key=api_key,
+            http_client=anthropic.DefaultAsyncHttpxClient(limits=HTTP_POOL_LIMITS)
+        )
+        _CLIENT_CACHE[api_key] = client
+    return client
+
+
+def _get_redis_cache(url: str, ttl: int) -> RedisResponseCache:
+    """
+    Get the shared Redis response cache for a URL, creating it if needed.
+    
+    Args:
+        url: The Redis connection URL
+        ttl: Seconds before a cached response expires
+        
+    Returns:
+        RedisResponseCache: The shared cache
+    """
+    cache = _REDIS_CACHES.get((url, ttl))
+    if cache is None:
+        cache = RedisResponseCache(url, ttl=ttl)
+        _REDIS_CACHES[(url, ttl)] = cache
+    return cache
+
+
+async def close_shared_clients() -> None:
+    """Close all shared Anthropic clients, Redis caches and their connection pools."""
+    clients = list(_CLIENT_CACHE.values())
+    _CLIENT_CACHE.clear()
+    for client in clients:
+        await client.close()
+    
+    redis_caches = list(_REDIS_CACHES.values())
+    _REDIS_CACHES.clear()
+    for cache in redis_caches:
+        await cache.close()
+
+
+def _close_shared_clients_at_exit() -> None:
+    """Best-effort cleanup of the shared clients when the interpreter exits."""
+    if not _CLIENT_CACHE and not _REDIS_CACHES:
+        return
+    try:
+        asyncio.run(close_shared_clients())
+    except Exception:
+        # The event loop the pools were bound to may already be gone
+        pass
+
+
+atexit.register(_close_shared_clients_at_exit)
+
 
 class AnthropicConfig:
     """Configuration for the Anthropic provider."""
@@ -39,6 +143,23 @@ class AnthropicConfig:
         "claude-instant-1.2": 100000
     }
     
+    # Bounds for the randomized exponential backoff on rate limit errors (seconds)
+    RATE_LIMIT_MIN_BACKOFF = 1.0
+    RATE_LIMIT_MAX_BACKOFF = 60.0
+    
+    # Anthropic only caches prompt prefixes of at least this many tokens
+    PROMPT_CACHE_MIN_TOKENS = 1024
+    
+    # Memoized token counts kept per provider, and the longest text used as its own key
+    TOKEN_COUNT_CACHE_SIZE = 4096
+    TOKEN_COUNT_KEY_MAX_CHARS = 256
+    
+    # Maximum number of distinct tool lists whose formatted schemas are kept
+    TOOL_CACHE_SIZE = 32
+    
+    # Seconds to wait between status checks of a submitted message batch
+    BATCH_POLL_INTERVAL = 5.0
+    
     # Claude message roles mapping
     ROLE_MAPPING = {
         MessageRole.SYSTEM: "system",  # Direct mapping for system
@@ -51,7 +172,15 @@ class AnthropicConfig:
         self,
         api_key: Optional[str] = None,
         model: str = DEFAULT_MODEL,
-        organization: Optional[str] = None
+        organization: Optional[str] = None,
+        cache_responses: bool = True,
+        semantic_cache: bool = False,
+        semantic_cache_threshold: float = 0.92,
+        max_concurrent: int = 50,
+        max_retries: int = 5,
+        prompt_caching: bool = True,
+        redis_url: Optional[str] = None,
+        redis_cache_ttl: int = 3600
     ):
         """
         Initialize the Anthropic configuration.
@@ -60,6 +189,15 @@ class AnthropicConfig:
             api_key: The Anthropic API key (falls back to ANTHROPIC_API_KEY env var)
             model: The model to use (defaults to claude-3-opus)
             organization: The organization ID (not used for Anthropic but kept for interface consistency)
+            cache_responses: Whether to cache responses to deterministic (temperature 0) requests
+            semantic_cache: Whether to reuse responses for semantically similar prompts
+            semantic_cache_threshold: Minimum cosine similarity for a semantic cache hit
+            max_concurrent: Maximum number of requests in flight at once
+            max_retries: Maximum number of retries when the rate limit is exceeded
+            prompt_caching: Whether to mark the system prompt and tools as cacheable prefixes
+            redis_url: Redis URL for sharing cached responses across processes
+                (defaults to an in-process cache)
+            redis_cache_ttl: Seconds before a response cached in Redis expires
         """
         self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
         if not self.api_key:
@@ -67,6 +205,14 @@ class AnthropicConfig:
         
         self.model = model
         self.organization = organization  # Not used by Anthropic but kept for consistency
+        self.cache_responses = cache_responses
+        self.semantic_cache = semantic_cache
+        self.semantic_cache_threshold = semantic_cache_threshold
+        self.max_concurrent = max_concurrent
+        self.max_retries = max_retries
+        self.prompt_caching = prompt_caching
+        self.redis_url = redis_url
+        self.redis_cache_ttl = redis_cache_ttl
         
         # Set up logging
         self.logger = logging.getLogger("mycoder.llm.anthropic")
@@ -87,8 +233,22 @@ class AnthropicProvider(LLMProvider):
             config: The Anthropic configuration
         """
         self.config = config
-        self.client = AsyncAnthropic(api_key=config.api_key)
+        self.client = _get_shared_client(config.api_key)
         self.logger = config.logger
+        self._response_cache: Optional[Union[ResponseCache, RedisResponseCache]] = None
+        if config.cache_responses:
+            self._response_cache = (
+                _get_redis_cache(config.redis_url, config.redis_cache_ttl)
+                if config.redis_url else _RESPONSE_CACHE
+            )
+        self._semantic_cache = (
+            SemanticCache(threshold=config.semantic_cache_threshold)
+            if config.semantic_cache else None
+        )
+        self._semaphore = asyncio.Semaphore(config.max_concurrent)
+        self._token_counts: "OrderedDict[Union[str, bytes], int]" = OrderedDict()
+        self._tools_by_id: Dict[int, Tuple[List[Dict[str, Any]], Tuple[Dict[str, Any], ...]]] = {}
+        self._tools_by_hash: Dict[bytes, Tuple[Dict[str, Any], ...]] = {}
     
     @property
     def provider_name(self) -> str:
@@ -107,7 +267,7 @@ class AnthropicProvider(LLMProvider):
             self.config.model, 100000  # Default fallback if model not in the dict
         )
     
-    def _format_message_content(self, message: Message) -> List[ContentBlock]:
+    def _format_message_content(self, message: Message) -> List[Dict[str, str]]:
         """
         Format the message content for Anthropic's API.
         
@@ -115,9 +275,9 @@ class AnthropicProvider(LLMProvider):
             message: The message to format
             
         Returns:
-            List[ContentBlock]: Formatted content blocks
+            List[Dict[str, str]]: Formatted text content blocks
         """
-        blocks = []
+        blocks: List[Dict[str, str]] = []
         
         # If it's a string, convert to a text content block
         if isinstance(message.content, str):
@@ -129,7 +289,53 @@ class AnthropicProvider(LLMProvider):
         
         return blocks
     
-    def format_messages(self, messages: List[Message]) -> List[Dict[str, Any]]:
+    def _format_chat_message(self, message: Message, role: str) -> Dict[str, Any]:
+        """
+        Format a user or assistant message for Anthropic's API.
+        
+        Args:
+            message: The message to format
+            role: The Anthropic role name for the message
+            
+        Returns:
+            Dict[str, Any]: The formatted message
+        """
+        return {
+            "role": role,
+            "content": self._format_message_content(message)
+        }
+    
+    def _format_tool_message(self, message: Message) -> Optional[Dict[str, Any]]:
+        """
+        Format a tool result message for Anthropic's API.
+        
+        Args:
+            message: The message to format
+            
+        Returns:
+            Optional[Dict[str, Any]]: The formatted message, or None if the
+                message isn't linked to a tool call
+        """
+        if not message.tool_call_id:
+            return None
+        return {
+            "role": "assistant",  # In Anthropic, tool results are part of the assistant-tool exchange
+            "content": [{"type": "tool_result", "tool_use_id": message.tool_call_id, "content": message.content}]
+        }
+    
+    # Formatters for each non-system role, called as formatter(self, message).
+    # Role names are bound up front so formatting needs a single lookup per message.
+    _MESSAGE_FORMATTERS = {
+        MessageRole.USER: partial(
+            _format_chat_message, role=AnthropicConfig.ROLE_MAPPING[MessageRole.USER]
+        ),
+        MessageRole.ASSISTANT: partial(
+            _format_chat_message, role=AnthropicConfig.ROLE_MAPPING[MessageRole.ASSISTANT]
+        ),
+        MessageRole.TOOL: _format_tool_message
+    }
+    
+    def format_messages(self, messages: List[Message]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """
         Format a list of messages for Anthropic's API.
         
@@ -137,42 +343,20 @@ class AnthropicProvider(LLMProvider):
             messages: The messages to format
             
         Returns:
-            List[Dict[str, Any]]: The formatted messages for Anthropic's API
+            Tuple[List[Dict[str, Any]], Optional[str]]: The formatted messages and
+                the system prompt, which Anthropic takes as a separate parameter
         """
-        # Filter out any empty messages
-        formatted_messages = []
+        # Anthropic takes the system prompt separately; the last one wins
+        system = next((m for m in reversed(messages) if m.role == MessageRole.SYSTEM), None)
         system_message = None
+        if system is not None:
+            system_message = system.content if isinstance(system.content, str) else system.content.text
+        
+        formatters = self._MESSAGE_FORMATTERS
+        # Empty string messages are skipped, as are tool results without a tool call ID
+        formatted = (formatters[m.role](self, m) for m in messages if m.content and m.role in formatters)
+        formatted_messages = [message for message in formatted if message is not None]
         
-        for message in messages:
-            # Extract system message - Anthropic handles it differently
-            if message.role == MessageRole.SYSTEM:
-                system_message = message.content if isinstance(message.content, str) else message.content.text
-                continue
-            
-            # Skip empty messages
-            if isinstance(message.content, str) and not message.content:
-                continue
-            
-            # Map role
-            role = AnthropicConfig.ROLE_MAPPING.get(message.role)
-            if not role:
-                self.logger.warning(f"Unknown message role: {message.role}, skipping")
-                continue
-            
-            # Format standard messages
-            if message.role in (MessageRole.USER, MessageRole.ASSISTANT):
-                formatted_messages.append({
-                    "role": role, 
-                    "content": self._format_message_content(message)
-                })
-            # Format tool messages
-            elif message.role == MessageRole.TOOL and message.tool_call_id:
-                # Tool responses in Anthropic format
-                formatted_messages.append({
-                    "role": "assistant",  # In Anthropic, tool results are part of the assistant-tool exchange
-                    "content": [{"type": "tool_result", "tool_use_id": message.tool_call_id, "content": message.content}]
-                })
-            
         return formatted_messages, system_message
     
     def format_tool_for_anthropic(self, tool_schema: Dict[str, Any]) -> Dict[str, Any]:
@@ -204,6 +388,153 @@ class AnthropicProvider(LLMProvider):
         """
         return self.format_tool_for_anthropic(tool_schema)
     
+    def _format_tools(self, tools: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], ...]:
+        """
+        Format tool schemas for Anthropic's API, reusing earlier results.
+        
+        Agent loops usually pass the same tool list on every turn, so formatted
+        schemas are remembered by list identity, falling back to a content hash
+        when the caller rebuilds an equal list. Lists mutated in place after
+        being passed in are not detected, so pass a new list when tools change.
+        
+        Args:
+            tools: The tool schemas to format
+            
+        Returns:
+            Tuple[Dict[str, Any], ...]: The formatted tool schemas
+        """
+        cached = self._tools_by_id.get(id(tools))
+        # Holding a reference to the list keeps its id from being reused
+        if cached is not None and cached[0] is tools:
+            return cached[1]
+        
+        key = make_cache_key({"tools": tools})
+        formatted = self._tools_by_hash.get(key)
+        if formatted is None:
+            formatted = tuple(self.format_tool_for_anthropic(tool) for tool in tools)
+            if len(self._tools_by_hash) >= AnthropicConfig.TOOL_CACHE_SIZE:
+                self._tools_by_hash.clear()
+            self._tools_by_hash[key] = formatted
+        
+        if len(self._tools_by_id) >= AnthropicConfig.TOOL_CACHE_SIZE:
+            self._tools_by_id.clear()
+        self._tools_by_id[id(tools)] = (tools, formatted)
+        return formatted
+    
+    def _build_request(
+        self,
+        messages: List[Message],
+        tools: Optional[List[Dict[str, Any]]],
+        temperature: float,
+        max_tokens: Optional[int]
+    ) -> Dict[str, Any]:
+        """
+        Build the keyword arguments for a messages API request.
+        
+        Args:
+            messages: The conversation messages
+            tools: Optional tool definitions
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            
+        Returns:
+            Dict[str, Any]: The request parameters
+        """
+        anthropic_messages, system_message = self.format_messages(messages)
+        
+        request = {
+            "model": self.config.model,
+            "messages": anthropic_messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens or 4096
+        }
+        if system_message:
+            request["system"] = system_message
+        if tools:
+            request["tools"] = list(self._format_tools(tools))
+        
+        if self.config.prompt_caching:
+            self._add_cache_breakpoints(request)
+        return request
+    
+    @staticmethod
+    def _add_cache_breakpoints(request: Dict[str, Any]) -> None:
+        """
+        Mark the stable prefix of a request for Anthropic prompt caching.
+        
+        The API caches everything up to a block marked with ``cache_control``.
+        Tools come first in the prompt, so marking the last tool caches the whole
+        tool list, and marking the system prompt extends the cached prefix over it.
+        Conversation messages follow the marked blocks and are never cached.
+        
+        Args:
+            request: The request parameters, updated in place
+        """
+        tools = request.get("tools")
+        if tools:
+            # Copy the last tool so formatted schemas can be safely reused elsewhere
+            tools[-1] = {**tools[-1], "cache_control": {"type": "ephemeral"}}
+        
+        system_message = request.get("system")
+        # Rough estimate of ~4 characters per token; shorter prompts can't be cached
+        if system_message and len(system_message) // 4 >= AnthropicConfig.PROMPT_CACHE_MIN_TOKENS:
+            request["system"] = [{
+                "type": "text",
+                "text": system_message,
+                "cache_control": {"type": "ephemeral"}
+            }]
+    
+    @staticmethod
+    def _to_llm_response(response: AnthropicMessage) -> LLMResponse:
+        """
+        Convert a complete Anthropic message into an LLMResponse.
+        
+        Args:
+            response: The final message returned by the API
+            
+        Returns:
+            LLMResponse: The converted response
+        """
+        text_parts: List[str] = []
+        # Most responses have no tool calls, so the list is only created when needed
+        tool_calls: Optional[List[ToolCall]] = None
+        
+        for content_block in response.content:
+            if content_block.type == "text":
+                text_parts.append(content_block.text)
+            elif content_block.type == "tool_use":
+                if tool_calls is None:
+                    tool_calls = []
+                # Convert Anthropic tool_use to our ToolCall format
+                tool_calls.append(
+                    ToolCall(
+                        id=content_block.id,
+                        name=content_block.name,
+                        arguments=content_block.input
+                    )
+                )
+        
+        # Format response, with tool calls if present
+        message = Message(
+            role=MessageRole.ASSISTANT,
+            content="".join(text_parts),
+            tool_calls=tool_calls
+        )
+        
+        # Extract usage information
+        usage = None
+        if hasattr(response, "usage"):
+            usage = {
+                "prompt_tokens": response.usage.input_tokens,
+                "completion_tokens": response.usage.output_tokens,
+                "total_tokens": response.usage.input_tokens + response.usage.output_tokens
+            }
+        
+        return LLMResponse(
+            message=message,
+            usage=usage
+        )
+    
     async def generate(
         self,
         messages: List[Message],
@@ -214,6 +545,9 @@ class AnthropicProvider(LLMProvider):
         """
         Generate a response using Anthropic's API.
         
+        The response is streamed from the API and assembled once complete, which
+        keeps long generations from hitting server idle timeouts.
+        
         Args:
             messages: The conversation messages
             tools: Optional tool definitions
@@ -226,128 +560,262 @@ class AnthropicProvider(LLMProvider):
         Raises:
             LLMError: If there's an error generating a response
         """
-        # Format messages for Anthropic
-        anthropic_messages, system_message = self.format_messages(messages)
+        request = self._build_request(messages, tools, temperature, max_tokens)
         
-        # Format tools for Anthropic if provided
-        anthropic_tools = None
-        if tools:
-            anthropic_tools = [self.format_tool_for_anthropic(tool) for tool in tools]
+        # Only deterministic requests can be answered from the cache
+        cache_key = None
+        if self._response_cache is not None and temperature == 0:
+            cache_key = make_cache_key(request)
+            cached = await self._response_cache.get(cache_key)
+            if cached is not None:
+                self.logger.debug("Returning cached Anthropic response")
+                return cached
+        
+        # Paraphrased prompts in the same context can reuse an earlier answer
+        semantic_namespace = None
+        if self._semantic_cache is not None:
+            semantic_namespace = make_cache_key(
+                {"model": self.config.model, "tools": request.get("tools")}
+            ).hex()
+            cached = await self._semantic_cache.lookup(semantic_namespace, messages)
+            if cached is not None:
+                self.logger.debug("Returning semantically cached Anthropic response")
+                return cached
         
         try:
-            # Get response from Anthropic
-            self.logger.debug(f"Sending request to Anthropic with {len(anthropic_messages)} messages")
+            self.logger.debug("Sending request to Anthropic with %d messages", len(request["messages"]))
             
-            # Create message
-            response = await self.client.messages.create(
-                model=self.config.model,
-                messages=anthropic_messages,
-                system=system_message,
-                temperature=temperature,
-                max_tokens=max_tokens or 4096,
-                tools=anthropic_tools
-            )
+            response = await self._create_message(request)
+            llm_response = self._to_llm_response(response)
+        except Exception as e:
+            raise self._translate_error(e) from e
+        
+        # Tool call IDs must stay unique, so only plain text responses are cached
+        if not llm_response.message.tool_calls:
+            if cache_key is not None:
+                await self._response_cache.set(cache_key, llm_response)
+            if semantic_namespace is not None:
+                await self._semantic_cache.insert(semantic_namespace, messages, llm_response)
+        
+        return llm_response
+    
+    async def generate_stream(
+        self,
+        messages: List[Message],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[Message]:
+        """
+        Stream a response from Anthropic's API as it is generated.
+        
+        Each yielded message holds all text received so far. The last message
+        is the complete response, including any tool calls.
+        
+        Args:
+            messages: The conversation messages
+            tools: Optional tool definitions
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
             
-            # Extract response content
-            content_text = ""
-            tool_calls = []
+        Yields:
+            Message: The partial assistant message
             
-            for content_block in response.content:
-                if content_block.type == "text":
-                    content_text += content_block.text
-                elif content_block.type == "tool_use":
-                    # Convert Anthropic tool_use to our ToolCall format
-                    tool_calls.append(
-                        ToolCall(
-                            id=content_block.id,
-                            name=content_block.name,
-                            arguments=content_block.input
-                        )
-                    )
+        Raises:
+            LLMError: If there's an error generating a response
+        """
+        request = self._build_request(messages, tools, temperature, max_tokens)
+        
+        try:
+            async with self._open_stream(request) as stream:
+                content_text = ""
+                async for text in stream.text_stream:
+                    content_text += text
+                    yield Message(role=MessageRole.ASSISTANT, content=content_text)
+                
+                response = await stream.get_final_message()
+            final_message = self._to_llm_response(response).message
+        except Exception as e:
+            raise self._translate_error(e) from e
+        
+        yield final_message
+    
+    async def generate_batch(self, batch: List[BatchRequest]) -> List[LLMResponse]:
+        """
+        Generate responses for many independent requests with the Message Batches API.
+        
+        All requests are submitted in a single batch, which is billed at a
+        discount but may take a while to complete. The batch is polled until
+        processing has ended.
+        
+        Args:
+            batch: Requests as (messages, tools, temperature, max_tokens) tuples
             
-            # Format response
-            message = Message(
-                role=MessageRole.ASSISTANT,
-                content=content_text
-            )
+        Returns:
+            List[LLMResponse]: The responses, in the same order as the requests
             
-            # Add tool calls if present
-            if tool_calls:
-                message.tool_calls = tool_calls
+        Raises:
+            LLMError: If the batch can't be processed or any request in it fails
+        """
+        if not batch:
+            return []
+        
+        batch_requests = [
+            {"custom_id": str(index), "params": self._build_request(*request)}
+            for index, request in enumerate(batch)
+        ]
+        
+        try:
+            message_batch = await self.client.messages.batches.create(requests=batch_requests)
+            self.logger.debug(
+                "Submitted Anthropic message batch %s with %d requests", message_batch.id, len(batch)
+            )
             
-            # Extract usage information
-            usage = None
-            if hasattr(response, "usage"):
-                usage = {
-                    "prompt_tokens": response.usage.input_tokens,
-                    "completion_tokens": response.usage.output_tokens,
-                    "total_tokens": response.usage.input_tokens + response.usage.output_tokens
-                }
+            while message_batch.processing_status != "ended":
+                await asyncio.sleep(AnthropicConfig.BATCH_POLL_INTERVAL)
+                message_batch = await self.client.messages.batches.retrieve(message_batch.id)
             
-            return LLMResponse(
-                message=message,
-                usage=usage
-            )
+            responses: List[Optional[LLMResponse]] = [None] * len(batch)
+            async for entry in await self.client.messages.batches.results(message_batch.id):
+                if entry.result.type != "succeeded":
+                    detail = getattr(entry.result, "error", None) or entry.result.type
+                    raise ProviderAPIError(
+                        message=f"Batch request {entry.custom_id} failed: {detail}",
+                        provider=self.provider_name,
+                        model=self.model_name
+                    )
+                responses[int(entry.custom_id)] = self._to_llm_response(entry.result.message)
+        except LLMError:
+            raise
+        except Exception as e:
+            raise self._translate_error(e) from e
         
-        except anthropic.AuthenticationError as e:
-            self.logger.error(f"Anthropic authentication error: {str(e)}")
-            raise ProviderAuthenticationError(
-                message=str(e),
+        if any(response is None for response in responses):
+            raise ProviderAPIError(
+                message=f"Message batch {message_batch.id} is missing results",
                 provider=self.provider_name,
                 model=self.model_name
             )
+        return responses
+    
+    @staticmethod
+    def _classify_bad_request(error_msg: str) -> Type[LLMError]:
+        """
+        Pick the most specific error class for a bad request.
+        
+        Args:
+            error_msg: The error message returned by the API
+            
+        Returns:
+            Type[LLMError]: The error class to raise
+        """
+        lowered = error_msg.lower()
+        
+        # Check if it's a context length error
+        if any(keyword in lowered for keyword in _CONTEXT_LENGTH_KEYWORDS):
+            return ContextLengthExceededError
         
-        except anthropic.RateLimitError as e:
-            self.logger.error(f"Anthropic rate limit error: {str(e)}")
-            raise ProviderRateLimitError(
-                message=str(e),
+        # Check if it's a content filter error
+        if any(keyword in lowered for keyword in _CONTENT_FILTER_KEYWORDS):
+            return ContentFilterError
+        
+        return ProviderAPIError
+    
+    def _translate_error(self, error: Exception) -> LLMError:
+        """
+        Convert an exception raised while calling the API into an LLMError.
+        
+        Args:
+            error: The exception that was raised
+            
+        Returns:
+            LLMError: The error to raise in its place
+        """
+        if not isinstance(error, anthropic.APIError):
+            self.logger.error("Error generating response: %s", error)
+            return LLMError(
+                message=f"Unexpected error: {str(error)}",
                 provider=self.provider_name,
                 model=self.model_name
             )
         
-        except anthropic.BadRequestError as e:
-            error_msg = str(e)
-            self.logger.error(f"Anthropic API error: {error_msg}")
-            
-            # Check if it's a context length error
-            if "maximum context length" in error_msg.lower() or "tokens" in error_msg.lower():
-                raise ContextLengthExceededError(
+        error_msg = str(error)
+        self.logger.error("Anthropic API error (%s): %s", type(error).__name__, error_msg)
+        
+        if isinstance(error, anthropic.BadRequestError):
+            error_class = self._classify_bad_request(error_msg)
+            if error_class is not ProviderAPIError:
+                return error_class(
                     message=error_msg,
                     provider=self.provider_name,
                     model=self.model_name
                 )
+        
+        error_class = _API_ERROR_MAP.get(type(error), ProviderAPIError)
+        return error_class(
+            message=error_msg,
+            provider=self.provider_name,
+            model=self.model_name,
+            status_code=getattr(error, "status_code", None)
+        )
+    
+    @asynccontextmanager
+    async def _open_stream(self, request: Dict[str, Any]) -> AsyncIterator[AsyncMessageStream]:
+        """
+        Open a streaming request to the messages API with bounded concurrency.
+        
+        At most ``max_concurrent`` streams are open at once. Rate limit errors
+        raised while opening the stream are retried with randomized exponential
+        backoff, and the concurrency slot is released while waiting so other
+        requests can proceed.
+        
+        Args:
+            request: Keyword arguments for ``messages.stream``
             
-            # Check if it's a content filter error
-            elif "content filtered" in error_msg.lower() or "content policy" in error_msg.lower():
-                raise ContentFilterError(
-                    message=error_msg,
-                    provider=self.provider_name,
-                    model=self.model_name
-                )
+        Yields:
+            AsyncMessageStream: The open response stream
             
-            # Generic API error
-            else:
-                raise ProviderAPIError(
-                    message=error_msg,
-                    provider=self.provider_name,
-                    model=self.model_name
-                )
-        
-        except anthropic.APIError as e:
-            self.logger.error(f"Anthropic API error: {str(e)}")
-            raise ProviderAPIError(
-                message=str(e),
-                provider=self.provider_name,
-                model=self.model_name
-            )
+        Raises:
+            anthropic.RateLimitError: If the rate limit is still exceeded after all retries
+        """
+        attempt = 0
+        while True:
+            async with AsyncExitStack() as stack:
+                await stack.enter_async_context(self._semaphore)
+                try:
+                    stream = await stack.enter_async_context(self.client.messages.stream(**request))
+                except anthropic.RateLimitError:
+                    if attempt >= self.config.max_retries:
+                        raise
+                    
+                    attempt += 1
+                    max_delay = min(
+                        AnthropicConfig.RATE_LIMIT_MAX_BACKOFF,
+                        AnthropicConfig.RATE_LIMIT_MIN_BACKOFF * 2 ** attempt
+                    )
+                    delay = random.uniform(AnthropicConfig.RATE_LIMIT_MIN_BACKOFF, max_delay)
+                    self.logger.warning(
+                        "Anthropic rate limit exceeded, retrying in %.1fs (attempt %d/%d)",
+                        delay, attempt, self.config.max_retries
+                    )
+                else:
+                    yield stream
+                    return
+            
+            await asyncio.sleep(delay)
+    
+    async def _create_message(self, request: Dict[str, Any]) -> AnthropicMessage:
+        """
+        Stream a request to the messages API and wait for the complete message.
         
-        except Exception as e:
-            self.logger.error(f"Error generating response: {str(e)}")
-            raise LLMError(
-                message=f"Unexpected error: {str(e)}",
-                provider=self.provider_name,
-                model=self.model_name
-            )
+        Args:
+            request: Keyword arguments for ``messages.stream``
+            
+        Returns:
+            AnthropicMessage: The final message
+        """
+        async with self._open_stream(request) as stream:
+            return await stream.get_final_message()
     
     def count_tokens(self, text: str) -> int:
         """
@@ -362,14 +830,30 @@ class AnthropicProvider(LLMProvider):
         if not text:
             return 0
         
+        # Token counts are deterministic, so repeated prefixes are memoized.
+        # Long texts are keyed by digest to keep the cache's memory bounded.
+        key: Union[str, bytes] = text
+        if len(text) > AnthropicConfig.TOKEN_COUNT_KEY_MAX_CHARS:
+            key = hashlib.sha1(text.encode("utf-8")).digest()
+        count = self._token_counts.get(key)
+        if count is not None:
+            self._token_counts.move_to_end(key)
+            return count
+        
         # Use Anthropic's token counting utility
-        return self.client.count_tokens(text)
+        count = self.client.count_tokens(text)
+        
+        self._token_counts[key] = count
+        if len(self._token_counts) > AnthropicConfig.TOKEN_COUNT_CACHE_SIZE:
+            self._token_counts.popitem(last=False)
+        return count
 
 
 def create_anthropic_provider(
     api_key: Optional[str] = None,
     model: str = AnthropicConfig.DEFAULT_MODEL,
-    organization: Optional[str] = None
+    organization: Optional[str] = None,
+    cache_responses: bool = True
 ) -> AnthropicProvider:
     """
     Create an Anthropic provider with the given configuration.
@@ -381,6 +865,7 @@ def create_anthropic_provider(
         api_key: The Anthropic API key (falls back to ANTHROPIC_API_KEY env var)
         model: The model to use (defaults to claude-3-opus)
         organization: The organization ID (not used for Anthropic but kept for interface consistency)
+        cache_responses: Whether to cache responses to deterministic (temperature 0) requests
         
     Returns:
         AnthropicProvider: The Anthropic provider
@@ -391,6 +876,7 @@ def create_anthropic_provider(
     config = AnthropicConfig(
         api_key=api_key,
         model=model,
-        organization=organization
+        organization=organization,
+        cache_responses=cache_responses
     )
     return AnthropicProvider(config) 
\ No newline at end of file
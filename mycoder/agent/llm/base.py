@@ -7,8 +7,9 @@ along with common types and utility functions.
 
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
+import orjson
 from pydantic import BaseModel, Field
 
 
@@ -48,8 +49,13 @@ class ToolCall(BaseModel):
     
     id: str
     name: str
-    arguments: Dict[str, Any]
+    arguments: Dict[str, Any]  # Already parsed; use arguments_json when a string is needed
     result: Optional[ToolCallResult] = None
+    
+    @property
+    def arguments_json(self) -> str:
+        """Get the arguments encoded as JSON, as they are now."""
+        return orjson.dumps(self.arguments, default=str).decode("utf-8")
 
 
 class Message(BaseModel):
@@ -138,6 +144,35 @@ class LLMProvider(ABC):
         """
         pass
     
+    async def generate_stream(
+        self,
+        messages: List[Message],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[Message]:
+        """
+        Stream a response from the LLM as it is generated.
+        
+        Each yielded message holds the response generated so far, and the last
+        one is the complete response. This default implementation yields the
+        full response once; providers that support streaming should override it.
+        
+        Args:
+            messages: List of messages in the conversation
+            tools: Optional list of tool definitions
+            temperature: Sampling temperature (0.0-1.0)
+            max_tokens: Maximum number of tokens to generate
+            
+        Yields:
+            Message: The partial assistant message
+            
+        Raises:
+            LLMError: If there's an error generating a response
+        """
+        response = await self.generate(messages, tools, temperature, max_tokens)
+        yield response.message
+    
     @abstractmethod
     def count_tokens(self, text: str) -> int:
         """
@@ -180,8 +215,7 @@ class LLMProvider(ABC):
                     total += self.count_tokens(tool_call.name)
                     
                     # Count arguments as JSON
-                    args_json = str(tool_call.arguments)
-                    total += self.count_tokens(args_json)
+                    total += self.count_tokens(tool_call.arguments_json)
                     
                     # Count result if present
                     if tool_call.result:
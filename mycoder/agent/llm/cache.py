@@ -0,0 +1,470 @@
+"""
+Response caching for LLM providers in MyCoder.
+
+This module provides caches that let providers skip repeated API calls, either
+for identical deterministic requests or for semantically similar prompts.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import orjson
+
+from .base import LLMResponse, Message, MessageRole
+
+
+def make_cache_key(payload: Dict[str, Any]) -> bytes:
+    """
+    Build a stable cache key for a request payload.
+
+    Args:
+        payload: The request parameters that determine the response
+
+    Returns:
+        bytes: SHA-256 digest of the canonical JSON encoding of the payload
+    """
+    serialized = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS, default=str)
+    return hashlib.sha256(serialized).digest()
+
+
+class ResponseCache:
+    """
+    In-process LRU cache of LLM responses, with optional expiry.
+
+    The accessors are coroutines so that other backends can share the same
+    interface. The in-memory implementation never awaits inside them, so each
+    operation is atomic with respect to other coroutines on the event loop.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of responses to keep
+            ttl: Seconds before a cached response expires (never, if None)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Each entry holds the response and its expiry time on the monotonic clock
+        self._entries: "OrderedDict[bytes, Tuple[LLMResponse, float]]" = OrderedDict()
+
+    async def get(self, key: bytes) -> Optional[LLMResponse]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            Optional[LLMResponse]: A copy of the cached response, or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        response, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        # Hand out a copy so callers can't mutate the cached entry
+        return response.model_copy(deep=True)
+
+    async def set(self, key: bytes, response: LLMResponse) -> None:
+        """
+        Store a response, evicting the least recently used entry if full.
+
+        Args:
+            key: The cache key
+            response: The response to cache
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else math.inf
+        self._entries[key] = (response.model_copy(deep=True), expires_at)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        """Get the number of cached responses."""
+        return len(self._entries)
+
+
+class RedisResponseCache:
+    """
+    LLM response cache stored in Redis.
+
+    Shares cached responses across processes and hosts, with the same
+    interface as ResponseCache. Entries expire after a TTL instead of being
+    evicted by recency. Redis errors are logged and treated as cache misses
+    so that an unavailable cache never fails a request.
+    """
+
+    KEY_PREFIX = "mycoder:llm:response:"
+
+    def __init__(self, url: str, ttl: int = 3600, client: Optional[Any] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            url: The Redis connection URL (e.g. "redis://localhost:6379/0")
+            ttl: Seconds before a cached response expires
+            client: Optional existing redis.asyncio client to use instead of connecting to url
+
+        Raises:
+            ImportError: If no client was given and the redis package is not installed
+        """
+        if client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError as e:
+                raise ImportError("redis is required for the Redis response cache") from e
+            client = redis.from_url(url)
+
+        self.url = url
+        self.ttl = ttl
+        self._client = client
+        self.logger = logging.getLogger("mycoder.llm.cache")
+
+    async def get(self, key: bytes) -> Optional[LLMResponse]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            Optional[LLMResponse]: The cached response, or None on a miss
+        """
+        try:
+            raw = await self._client.get(self.KEY_PREFIX + key.hex())
+        except Exception as e:
+            self.logger.warning("Redis cache lookup failed: %s", e)
+            return None
+
+        if raw is None:
+            return None
+        return LLMResponse.model_validate(orjson.loads(raw))
+
+    async def set(self, key: bytes, response: LLMResponse) -> None:
+        """
+        Store a response until the TTL expires.
+
+        Args:
+            key: The cache key
+            response: The response to cache
+        """
+        try:
+            await self._client.set(
+                self.KEY_PREFIX + key.hex(),
+                orjson.dumps(response.model_dump(mode="json")),
+                ex=self.ttl
+            )
+        except Exception as e:
+            self.logger.warning("Redis cache update failed: %s", e)
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        await self._client.aclose()
+
+
+# Rows allocated for a scope's first vectors; the matrix doubles from here up to maxsize
+INITIAL_INDEX_ROWS = 8
+
+
+def _import_numpy() -> Optional[Any]:
+    """
+    Import NumPy if it is installed.
+
+    Returns:
+        Optional[Any]: The numpy module, or None if it isn't available
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class _VectorIndex:
+    """
+    Fixed-size store of unit vectors and their responses for one cache scope.
+
+    With NumPy available the vectors live in a float32 ring buffer and a
+    lookup is a single matrix-vector product. The buffer starts small and
+    doubles as it fills, up to maxsize rows, so a scope that only ever
+    holds a few entries stays small. Otherwise the similarities are computed
+    with a Python loop.
+    """
+
+    def __init__(self, maxsize: int):
+        """
+        Initialize the index.
+
+        Args:
+            maxsize: Maximum number of entries; the oldest entry is replaced when full
+        """
+        self.maxsize = maxsize
+        self._np = _import_numpy()
+        self._matrix: Optional[Any] = None
+        self._vectors: List[Tuple[float, ...]] = []
+        self._responses: List[LLMResponse] = []
+        self._next = 0
+
+    def __len__(self) -> int:
+        """Get the number of stored entries."""
+        return len(self._responses)
+
+    def add(self, vector: Tuple[float, ...], response: LLMResponse) -> None:
+        """
+        Store a vector and its response.
+
+        Args:
+            vector: The L2-normalized embedding
+            response: The response to return for matching prompts
+        """
+        if self._np is not None:
+            if self._matrix is None:
+                rows = min(INITIAL_INDEX_ROWS, self.maxsize)
+                self._matrix = self._np.zeros((rows, len(vector)), dtype=self._np.float32)
+            elif self._next >= len(self._matrix):
+                # Only reached while filling up, since the ring wraps at maxsize
+                grown = self._np.zeros(
+                    (min(len(self._matrix) * 2, self.maxsize), self._matrix.shape[1]),
+                    dtype=self._np.float32
+                )
+                grown[:len(self._matrix)] = self._matrix
+                self._matrix = grown
+            self._matrix[self._next] = vector
+        elif len(self._vectors) < self.maxsize:
+            self._vectors.append(vector)
+        else:
+            self._vectors[self._next] = vector
+
+        if len(self._responses) < self.maxsize:
+            self._responses.append(response)
+        else:
+            self._responses[self._next] = response
+        self._next = (self._next + 1) % self.maxsize
+
+    def best_match(self, query: Tuple[float, ...]) -> Tuple[float, Optional[LLMResponse]]:
+        """
+        Find the stored entry most similar to a query vector.
+
+        Args:
+            query: The L2-normalized query embedding
+
+        Returns:
+            Tuple[float, Optional[LLMResponse]]: The cosine similarity and
+                response of the best match, or (-1.0, None) if the index is empty
+        """
+        count = len(self._responses)
+        if not count:
+            return -1.0, None
+
+        if self._np is not None:
+            scores = self._matrix[:count] @ self._np.asarray(query, dtype=self._np.float32)
+            index = int(scores.argmax())
+            return float(scores[index]), self._responses[index]
+
+        best_score, best_response = -1.0, None
+        for vector, response in zip(self._vectors, self._responses):
+            score = sum(a * b for a, b in zip(vector, query))
+            if score > best_score:
+                best_score, best_response = score, response
+        return best_score, best_response
+
+
+class SemanticCache:
+    """
+    Cache that matches prompts by embedding similarity.
+
+    The final user message of a conversation is embedded and compared against
+    previously answered prompts using cosine similarity, so paraphrased
+    questions can reuse an earlier response. Entries are partitioned by
+    namespace (model, system prompt, tools and earlier conversation) so a
+    response is never reused in a different context. The context changes every
+    turn of a conversation, so only the max_scopes most recently used
+    partitions are kept. Similarity search uses NumPy when it is installed.
+    """
+
+    DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        maxsize: int = 256,
+        embed: Optional[Callable[[str], Sequence[float]]] = None,
+        max_scopes: int = 64
+    ):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a cached response to be reused
+            maxsize: Maximum number of responses to keep per namespace
+            embed: Function mapping text to an embedding vector (defaults to a
+                local sentence-transformers model)
+            max_scopes: Maximum number of namespace and context partitions to
+                keep; the least recently used one is dropped when full
+        """
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.max_scopes = max_scopes
+        self._embed = embed
+        self._entries: "OrderedDict[bytes, _VectorIndex]" = OrderedDict()
+        # A miss is followed by an insert for the same prompt, so remember the last embedding
+        self._last_embedding: Optional[Tuple[str, Tuple[float, ...]]] = None
+
+    def _get_embedder(self) -> Callable[[str], Sequence[float]]:
+        """
+        Get the embedding function, loading the default model if needed.
+
+        Returns:
+            Callable[[str], Sequence[float]]: The embedding function
+
+        Raises:
+            ImportError: If no embedding function was given and
+                sentence-transformers is not installed
+        """
+        if self._embed is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError as e:
+                raise ImportError(
+                    "sentence-transformers is required for semantic caching "
+                    "unless a custom embedding function is provided"
+                ) from e
+
+            model = SentenceTransformer(self.DEFAULT_EMBEDDING_MODEL)
+            self._embed = model.encode
+        return self._embed
+
+    @staticmethod
+    def _split_prompt(messages: List[Message]) -> Optional[Tuple[List[Message], str]]:
+        """
+        Split a conversation into its context and final user prompt.
+
+        Args:
+            messages: The conversation messages
+
+        Returns:
+            Optional[Tuple[List[Message], str]]: The earlier messages and the
+                final user prompt text, or None if the conversation doesn't
+                end with a user message
+        """
+        if not messages or messages[-1].role != MessageRole.USER:
+            return None
+
+        content = messages[-1].content
+        text = content if isinstance(content, str) else content.text
+        if not text:
+            return None
+        return messages[:-1], text
+
+    async def _embed_text(self, text: str) -> Tuple[float, ...]:
+        """
+        Embed text and normalize it to unit length.
+
+        Args:
+            text: The text to embed
+
+        Returns:
+            Tuple[float, ...]: The L2-normalized embedding
+        """
+        if self._last_embedding is not None and self._last_embedding[0] == text:
+            return self._last_embedding[1]
+
+        embed = await asyncio.to_thread(self._get_embedder)
+        vector = [float(x) for x in await asyncio.to_thread(embed, text)]
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        normalized = tuple(x / norm for x in vector)
+
+        self._last_embedding = (text, normalized)
+        return normalized
+
+    async def lookup(self, namespace: str, messages: List[Message]) -> Optional[LLMResponse]:
+        """
+        Find a cached response for a semantically similar prompt.
+
+        Args:
+            namespace: Partition key for the request context (e.g. the model)
+            messages: The conversation messages
+
+        Returns:
+            Optional[LLMResponse]: A copy of the best matching response, or None
+        """
+        split = self._split_prompt(messages)
+        if split is None:
+            return None
+        context, prompt = split
+
+        scope = self._scope(namespace, context)
+        index = self._entries.get(scope)
+        if not index:
+            return None
+        self._entries.move_to_end(scope)
+
+        query = await self._embed_text(prompt)
+        best_score, best_response = index.best_match(query)
+
+        if best_response is None or best_score < self.threshold:
+            return None
+        return best_response.model_copy(deep=True)
+
+    async def insert(self, namespace: str, messages: List[Message], response: LLMResponse) -> None:
+        """
+        Cache a response for the conversation's final user prompt.
+
+        Args:
+            namespace: Partition key for the request context (e.g. the model)
+            messages: The conversation messages
+            response: The response to cache
+        """
+        split = self._split_prompt(messages)
+        if split is None:
+            return
+        context, prompt = split
+
+        vector = await self._embed_text(prompt)
+        scope = self._scope(namespace, context)
+        index = self._entries.get(scope)
+        if index is None:
+            index = self._entries[scope] = _VectorIndex(self.maxsize)
+            while len(self._entries) > self.max_scopes:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(scope)
+        index.add(vector, response.model_copy(deep=True))
+
+    @staticmethod
+    def _scope(namespace: str, context: List[Message]) -> bytes:
+        """
+        Build the partition key for a namespace and conversation context.
+
+        Args:
+            namespace: Partition key for the request context
+            context: The messages preceding the final user prompt
+
+        Returns:
+            bytes: The partition key
+        """
+        return make_cache_key({
+            "namespace": namespace,
+            "context": [message.model_dump(mode="json") for message in context]
+        })
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._entries.clear()
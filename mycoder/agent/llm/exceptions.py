@@ -4,12 +4,16 @@ Exceptions for LLM providers in MyCoder.
 This module defines the exceptions that can be raised by LLM providers.
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 
 class LLMError(Exception):
     """Base exception for all LLM-related errors."""
     
+    # Slots keep attributes out of a per-instance __dict__, since errors can be
+    # raised in large numbers during rate limit storms and outages
+    __slots__ = ("provider", "model", "details")
+    
     def __init__(
         self,
         message: str,
@@ -31,19 +35,56 @@ class LLMError(Exception):
         self.details = details or {}
         
         # Format the message with provider and model information if available
-        if provider and model:
-            full_message = f"[{provider}/{model}] {message}"
-        elif provider:
-            full_message = f"[{provider}] {message}"
+        if not provider:
+            super().__init__(message)
+        elif model:
+            super().__init__(f"[{provider}/{model}] {message}")
         else:
-            full_message = message
+            super().__init__(f"[{provider}] {message}")
+    
+    def __reduce__(self) -> Tuple[Callable[..., "LLMError"], Tuple[Any, ...]]:
+        """
+        Support pickling without losing slot attributes.
         
-        super().__init__(full_message)
+        The default implementation drops slot values and re-runs __init__ with
+        only the formatted message, which fails for subclasses.
+        
+        Returns:
+            tuple: The restore function and its arguments
+        """
+        state = {
+            name: getattr(self, name)
+            for cls in type(self).__mro__
+            for name in getattr(cls, "__slots__", ())
+            if hasattr(self, name)
+        }
+        return _restore_error, (type(self), self.args, state)
+
+
+def _restore_error(cls: type, args: tuple, state: Dict[str, Any]) -> LLMError:
+    """
+    Recreate an LLM error from its pickled arguments and attributes.
+    
+    Args:
+        cls: The error class
+        args: The exception arguments
+        state: The slot attribute values
+        
+    Returns:
+        LLMError: The restored error
+    """
+    error = cls.__new__(cls, *args)
+    error.args = args
+    for name, value in state.items():
+        setattr(error, name, value)
+    return error
 
 
 class ProviderAPIError(LLMError):
     """Exception raised when there's an API error from the provider."""
     
+    __slots__ = ("status_code",)
+    
     def __init__(
         self,
         message: str,
@@ -74,27 +115,29 @@ class ProviderAPIError(LLMError):
 
 class ProviderRateLimitError(ProviderAPIError):
     """Exception raised when the provider's rate limit is exceeded."""
-    pass
+    __slots__ = ()
 
 
 class ProviderAuthenticationError(ProviderAPIError):
     """Exception raised when there's an authentication error with the provider."""
-    pass
+    __slots__ = ()
 
 
 class ModelNotFoundError(LLMError):
     """Exception raised when the requested model is not found."""
-    pass
+    __slots__ = ()
 
 
 class ContentFilterError(LLMError):
     """Exception raised when the content is filtered by the provider's content filter."""
-    pass
+    __slots__ = ()
 
 
 class ContextLengthExceededError(LLMError):
     """Exception raised when the context length is exceeded."""
     
+    __slots__ = ("token_count", "max_tokens")
+    
     def __init__(
         self,
         message: str,
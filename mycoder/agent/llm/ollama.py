@@ -6,16 +6,18 @@ for the Ollama API, allowing local models to be used with MyCoder.
 """
 
 import asyncio
+import functools
 import json
 import os
-import re
 import uuid
-from typing import Any, Dict, List, Optional, Union, cast
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union, cast
 
 import httpx
+import orjson
 from pydantic import BaseModel, Field
 
 from .base import LLMProvider, LLMResponse, Message, MessageRole, ToolCall
+from .cache import ResponseCache, make_cache_key
 from .exceptions import LLMError, ProviderAPIError
 
 
@@ -34,7 +36,12 @@ class OllamaModelInfo(BaseModel):
 
 
 class OllamaResponse(BaseModel):
-    """Response from Ollama API."""
+    """
+    Response from Ollama API.
+    
+    Documents the response schema. The provider reads the fields it needs
+    straight from the decoded JSON rather than validating into this model.
+    """
     
     model: str
     created_at: str
@@ -64,13 +71,202 @@ class OllamaConfig(BaseModel):
         default=4096,
         description="Context window size in tokens"
     )
+    max_connections: int = Field(
+        default=100,
+        description="Maximum number of concurrent connections to the Ollama server"
+    )
+    max_keepalive_connections: int = Field(
+        default=20,
+        description="Maximum number of idle connections kept open for reuse"
+    )
+    keepalive_expiry: float = Field(
+        default=30.0,
+        description="Seconds an idle connection is kept open"
+    )
+    http2: bool = Field(
+        default=False,
+        description="Use HTTP/2 for HTTPS endpoints (requires the h2 package)"
+    )
+    num_parallel: int = Field(
+        default=4,
+        description="Maximum concurrent requests; match the server's OLLAMA_NUM_PARALLEL"
+    )
+    cache_enabled: bool = Field(
+        default=True,
+        description="Cache responses to deterministic (temperature 0) requests"
+    )
+    cache_size: int = Field(
+        default=512,
+        description="Maximum number of cached responses"
+    )
+    cache_ttl: float = Field(
+        default=600.0,
+        description="Seconds before a cached response expires"
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _get_tokenizer() -> Optional[Any]:
+    """
+    Load the tiktoken encoding used to approximate Ollama token counts.
+    
+    Returns:
+        Optional[Any]: The encoding, or None if tiktoken is unavailable
+    """
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # Not installed, or the encoding file couldn't be downloaded
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _count_tokens(text: str) -> int:
+    """
+    Count tokens in text, memoizing the result.
+    
+    Ollama doesn't expose a tokenizer without making API calls, and each model
+    may use a different one, so cl100k_base serves as a close approximation.
+    Without tiktoken a rough word and character based estimate is used.
+    
+    Args:
+        text: The text to count tokens for
+        
+    Returns:
+        int: The approximate number of tokens
+    """
+    tokenizer = _get_tokenizer()
+    if tokenizer is not None:
+        return len(tokenizer.encode(text, disallowed_special=()))
+    
+    # This is a very rough approximation.
+    words = text.split()
+    return len(words) + len(text) // 4
+
+
+@functools.lru_cache(maxsize=64)
+def _build_tool_instruction(signature: Tuple[Tuple[Any, Any, bytes], ...]) -> str:
+    """
+    Build the system instruction describing a set of tools.
+    
+    Args:
+        signature: (name, description, JSON-encoded parameters) for each tool
+        
+    Returns:
+        str: System instruction for using tools
+    """
+    tool_descriptions = []
+    for name, description, parameters in signature:
+        params_str = json.dumps(orjson.loads(parameters), indent=2)
+        tool_descriptions.append(
+            f"Tool: {name}\n"
+            f"Description: {description}\n"
+            f"Parameters: {params_str}\n"
+        )
+    
+    tools_str = "\n".join(tool_descriptions)
+    
+    return f"{OllamaProvider.TOOL_INSTRUCTION_PREFIX}Available tools:\n\n{tools_str}"
+
+
+def _match_braces(text: str, start: int) -> Optional[int]:
+    """
+    Find the end of the JSON object starting at a given opening brace.
+    
+    Scans forward once, tracking brace depth and skipping over string
+    literals (including escaped quotes) so braces inside strings are ignored.
+    
+    Args:
+        text: The text to scan
+        start: Index of the opening brace
+        
+    Returns:
+        Optional[int]: Index just past the matching closing brace, or None if
+            the object is not closed
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return index + 1
+    return None
+
+
+def extract_json_object(text: str) -> Optional[str]:
+    """
+    Extract the first JSON object from model output.
+    
+    An object inside a fenced code block (```json or plain ```) is preferred.
+    Otherwise the first brace-delimited object in the text is used. This runs
+    in linear time, unlike a backtracking regular expression.
+    
+    Args:
+        text: The model output
+        
+    Returns:
+        Optional[str]: The candidate JSON object text, or None if there is none
+    """
+    fence = text.find("```")
+    if fence != -1:
+        block_end = text.find("```", fence + 3)
+        if block_end == -1:
+            block_end = len(text)
+        start = text.find("{", fence + 3, block_end)
+        if start != -1:
+            end = _match_braces(text, start)
+            if end is not None and end <= block_end:
+                return text[start:end]
+    
+    start = text.find("{")
+    if start == -1:
+        return None
+    end = _match_braces(text, start)
+    return text[start:end] if end is not None else None
+
+
+def _message_key(message: Message) -> Tuple[Any, ...]:
+    """
+    Get a snapshot of what a message contributes to the prompt.
+    
+    Args:
+        message: The message
+        
+    Returns:
+        Tuple[Any, ...]: A tuple that compares equal for messages formatted alike
+    """
+    content = message.content
+    return (
+        message.role,
+        content if isinstance(content, str) else (content.type, content.text),
+        message.tool_call_id,
+        tuple((call.id, call.name, call.arguments_json) for call in message.tool_calls or ())
+    )
 
 
-# Pattern to extract function calls from markdown or JSON in Ollama output
-FUNCTION_CALL_PATTERN = re.compile(
-    r"```(json|.*)\s*({[\s\S]*?})\s*```|({[\s\S]*})",
-    re.MULTILINE
-)
+class _FormattedConversation:
+    """A conversation's formatted prompt text, kept one string per message."""
+    
+    __slots__ = ("keys", "texts")
+    
+    def __init__(self) -> None:
+        self.keys: List[Tuple[Any, ...]] = []
+        self.texts: List[str] = []
 
 
 class OllamaProvider(LLMProvider):
@@ -82,6 +278,16 @@ class OllamaProvider(LLMProvider):
     consistently with all models.
     """
     
+    # Leading part of the tool instruction, shared by every tool set
+    TOOL_INSTRUCTION_PREFIX = (
+        "You have access to the following tools. When you need to use a tool, "
+        "respond with a JSON object in the following format:\n\n"
+        "```json\n{\n  \"name\": \"tool_name\",\n  \"arguments\": {\n    \"arg1\": \"value1\",\n    \"arg2\": \"value2\"\n  }\n}\n```\n\n"
+    )
+    
+    # Number of formatted conversations kept for reuse by later turns
+    PROMPT_PREFIX_CACHE_SIZE = 32
+    
     def __init__(
         self,
         config: Optional[OllamaConfig] = None,
@@ -100,10 +306,35 @@ class OllamaProvider(LLMProvider):
             if hasattr(self._config, key):
                 setattr(self._config, key, value)
         
+        # Keep connections alive between requests so concurrent calls reuse them,
+        # and retry once if a connection can't be established.
+        # HTTP/2 is only negotiated over TLS; plain http:// servers use HTTP/1.1.
+        transport = httpx.AsyncHTTPTransport(
+            http2=self._config.http2,
+            limits=httpx.Limits(
+                max_connections=self._config.max_connections,
+                max_keepalive_connections=self._config.max_keepalive_connections,
+                keepalive_expiry=self._config.keepalive_expiry
+            ),
+            retries=1
+        )
         self._http_client = httpx.AsyncClient(
             base_url=self._config.base_url,
-            timeout=120.0
+            timeout=120.0,
+            transport=transport
         )
+        
+        # Requests beyond the server's parallelism would only queue server-side
+        self._semaphore = asyncio.Semaphore(self._config.num_parallel)
+        # Deterministic requests currently in flight, keyed by payload, so
+        # identical concurrent calls share a single server request
+        self._in_flight: Dict[bytes, "asyncio.Future[Dict[str, Any]]"] = {}
+        self._response_cache = (
+            ResponseCache(maxsize=self._config.cache_size, ttl=self._config.cache_ttl)
+            if self._config.cache_enabled else None
+        )
+        # Formatted conversations, least recently used first
+        self._prompt_prefixes: List[_FormattedConversation] = []
     
     @property
     def provider_name(self) -> str:
@@ -158,51 +389,208 @@ class OllamaProvider(LLMProvider):
             LLMError: If there's an error generating a response
         """
         try:
-            # Format prompt in a way Ollama understands
-            prompt = self._format_prompt(messages, tools)
-            
-            # Prepare request payload
-            data = {
-                "model": self._config.model,
-                "prompt": prompt,
-                "stream": False,
-                "temperature": temperature,
-            }
+            data = self._build_payload(messages, tools, temperature, max_tokens, stream=False)
             
-            if max_tokens:
-                data["num_predict"] = max_tokens
-            
-            # If tools are provided, add a system instruction about using them
-            if tools and len(tools) > 0:
-                tool_instruction = self._generate_tool_instruction(tools)
-                data["system"] = tool_instruction
+            # Only deterministic requests can be answered from the cache
+            cache_key = None
+            if self._response_cache is not None and temperature == 0:
+                cache_key = make_cache_key(data)
+                cached = await self._response_cache.get(cache_key)
+                if cached is not None:
+                    return cached
             
             # Make request to Ollama API
-            response = await self._http_client.post("/api/generate", json=data)
-            response.raise_for_status()
+            if temperature == 0:
+                response_data = await self._coalesced_generate(data)
+            else:
+                response_data = await self._post_generate(data)
             
-            # Parse the response
-            ollama_response = OllamaResponse.parse_obj(response.json())
+            # Read the few fields needed directly; the body follows OllamaResponse,
+            # but building a validated model for every response is wasted work
+            prompt_tokens = response_data.get("prompt_eval_count") or 0
+            completion_tokens = response_data.get("eval_count") or 0
             
             # Check for tool calls in the response
-            message = self._parse_response(ollama_response, tools)
+            message = self._parse_response(response_data["response"], tools)
             
             # Create LLMResponse
-            return LLMResponse(
+            llm_response = LLMResponse(
                 message=message,
                 usage={
-                    "prompt_tokens": ollama_response.prompt_eval_count or 0,
-                    "completion_tokens": ollama_response.eval_count or 0,
-                    "total_tokens": (ollama_response.prompt_eval_count or 0) + (ollama_response.eval_count or 0)
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens
                 }
             )
+            
+            # Tool call IDs must stay unique, so only plain text responses are cached
+            if cache_key is not None and not message.tool_calls:
+                await self._response_cache.set(cache_key, llm_response)
+            
+            return llm_response
         
-        except httpx.HTTPStatusError as e:
-            raise LLMError(f"HTTP error from Ollama: {e.response.text}")
-        except httpx.RequestError as e:
-            raise LLMError(f"Request error with Ollama: {str(e)}")
         except Exception as e:
-            raise LLMError(f"Unexpected error with Ollama: {str(e)}")
+            raise self._translate_error(e)
+    
+    async def generate_stream(
+        self,
+        messages: List[Message],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[Message]:
+        """
+        Stream a response from Ollama as it is generated.
+        
+        Ollama streams newline-delimited JSON chunks. Each yielded message holds
+        all text received so far, and the last one is the complete response
+        with any tool calls parsed out.
+        
+        Args:
+            messages: List of messages in the conversation
+            tools: Optional list of tool definitions
+            temperature: Sampling temperature (0.0-1.0)
+            max_tokens: Maximum number of tokens to generate
+            
+        Yields:
+            Message: The partial assistant message
+            
+        Raises:
+            LLMError: If there's an error generating a response
+        """
+        try:
+            data = self._build_payload(messages, tools, temperature, max_tokens, stream=True)
+            
+            content_text = ""
+            async with self._semaphore:
+                async with self._http_client.stream(
+                    "POST",
+                    "/api/generate",
+                    content=orjson.dumps(data),
+                    headers={"Content-Type": "application/json"}
+                ) as response:
+                    if response.is_error:
+                        # Streamed bodies must be read before the error text is available
+                        await response.aread()
+                    response.raise_for_status()
+                    
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+                        chunk = orjson.loads(line)
+                        if chunk.get("response"):
+                            content_text += chunk["response"]
+                            yield Message(role=MessageRole.ASSISTANT, content=content_text)
+            
+            final_message = self._parse_response(content_text, tools)
+        except Exception as e:
+            raise self._translate_error(e)
+        
+        yield final_message
+    
+    def _build_payload(
+        self,
+        messages: List[Message],
+        tools: Optional[List[Dict[str, Any]]],
+        temperature: float,
+        max_tokens: Optional[int],
+        stream: bool
+    ) -> Dict[str, Any]:
+        """
+        Build the request payload for the generate endpoint.
+        
+        Args:
+            messages: List of messages in the conversation
+            tools: Optional list of tool definitions
+            temperature: Sampling temperature (0.0-1.0)
+            max_tokens: Maximum number of tokens to generate
+            stream: Whether the server should stream the response
+            
+        Returns:
+            Dict[str, Any]: The request payload
+        """
+        # Format prompt in a way Ollama understands
+        prompt = self._format_prompt(messages, tools)
+        
+        # Prepare request payload
+        data = {
+            "model": self._config.model,
+            "prompt": prompt,
+            "stream": stream,
+            "temperature": temperature,
+        }
+        
+        if max_tokens:
+            data["num_predict"] = max_tokens
+        
+        # If tools are provided, add a system instruction about using them
+        if tools and len(tools) > 0:
+            tool_instruction = self._generate_tool_instruction(tools)
+            data["system"] = tool_instruction
+        
+        return data
+    
+    @staticmethod
+    def _translate_error(error: Exception) -> LLMError:
+        """
+        Convert an exception raised while calling Ollama into an LLMError.
+        
+        Args:
+            error: The exception that was raised
+            
+        Returns:
+            LLMError: The error to raise in its place
+        """
+        if isinstance(error, httpx.HTTPStatusError):
+            return LLMError(f"HTTP error from Ollama: {error.response.text}")
+        if isinstance(error, httpx.RequestError):
+            return LLMError(f"Request error with Ollama: {str(error)}")
+        return LLMError(f"Unexpected error with Ollama: {str(error)}")
+    
+    async def _post_generate(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send a generate request, waiting for a free slot if the server is busy.
+        
+        Args:
+            data: The request payload
+            
+        Returns:
+            Dict[str, Any]: The decoded response body
+            
+        Raises:
+            httpx.HTTPStatusError: If the server returns an error status
+        """
+        async with self._semaphore:
+            response = await self._http_client.post(
+                "/api/generate",
+                content=orjson.dumps(data),
+                headers={"Content-Type": "application/json"}
+            )
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    async def _coalesced_generate(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send a generate request, sharing the result with identical requests in flight.
+        
+        Only used for deterministic requests, where every caller would get
+        the same response anyway.
+        
+        Args:
+            data: The request payload
+            
+        Returns:
+            Dict[str, Any]: The decoded response body
+        """
+        key = make_cache_key(data)
+        pending = self._in_flight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._post_generate(data))
+            self._in_flight[key] = pending
+            pending.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        
+        # Shield the shared request so one caller being cancelled doesn't cancel it for the others
+        return await asyncio.shield(pending)
     
     def count_tokens(self, text: str) -> int:
         """
@@ -214,12 +602,7 @@ class OllamaProvider(LLMProvider):
         Returns:
             int: The number of tokens
         """
-        # Simple approximation since Ollama doesn't provide a standard way
-        # to count tokens without making API calls. Each model might use
-        # a different tokenizer.
-        # This is a very rough approximation.
-        words = text.split()
-        return len(words) + len(text) // 4
+        return _count_tokens(text)
     
     def _format_prompt(
         self,
@@ -229,6 +612,10 @@ class OllamaProvider(LLMProvider):
         """
         Format messages into a prompt string for Ollama.
         
+        Agent loops resend the same conversation with a few new messages
+        appended, so only the messages after the longest already formatted
+        prefix of the conversation are formatted.
+        
         Args:
             messages: The messages to format
             tools: Optional list of tool definitions
@@ -245,87 +632,132 @@ class OllamaProvider(LLMProvider):
                 tool_instruction = self._generate_tool_instruction(tools)
                 formatted_messages.append(f"System: {tool_instruction}\n")
         
-        # Format each message
-        for message in messages:
-            if message.role == MessageRole.SYSTEM:
-                formatted_messages.append(f"System: {message.content}\n")
-            elif message.role == MessageRole.USER:
-                formatted_messages.append(f"User: {message.content}\n")
-            elif message.role == MessageRole.ASSISTANT:
-                if isinstance(message.content, str) and message.content.strip():
-                    formatted_messages.append(f"Assistant: {message.content}\n")
-                if message.tool_calls:
-                    for tool_call in message.tool_calls:
-                        args_str = json.dumps(tool_call.arguments, indent=2)
-                        tool_call_str = (
-                            f"I need to use the {tool_call.name} tool.\n"
-                            f"Arguments: ```json\n{args_str}\n```"
-                        )
-                        formatted_messages.append(f"Assistant: {tool_call_str}\n")
-            elif message.role == MessageRole.TOOL:
-                if message.tool_call_id:
-                    # Format tool results
-                    for prev_msg in reversed(messages):
-                        if (prev_msg.role == MessageRole.ASSISTANT and 
-                            prev_msg.tool_calls and 
-                            any(t.id == message.tool_call_id for t in prev_msg.tool_calls)):
-                            for tool_call in prev_msg.tool_calls:
-                                if tool_call.id == message.tool_call_id:
-                                    result_str = f"Result from {tool_call.name}: {message.content}"
-                                    formatted_messages.append(f"{result_str}\n")
-                                    break
-                            break
+        formatted_messages.extend(self._format_conversation(messages).texts)
         
         # Add final prompt for assistant
         formatted_messages.append("Assistant: ")
         
         return "".join(formatted_messages)
     
+    def _format_conversation(self, messages: List[Message]) -> _FormattedConversation:
+        """
+        Format a conversation, reusing the longest formatted prefix of it.
+        
+        Args:
+            messages: The messages of the conversation
+            
+        Returns:
+            _FormattedConversation: The formatted text of each message
+        """
+        keys = [_message_key(message) for message in messages]
+        
+        # Find the formatted conversation sharing the most leading messages
+        best: Optional[_FormattedConversation] = None
+        matched = 0
+        for conversation in self._prompt_prefixes:
+            count = 0
+            for cached_key, key in zip(conversation.keys, keys):
+                if cached_key != key:
+                    break
+                count += 1
+            if count > matched:
+                best, matched = conversation, count
+        
+        if best is not None and matched == len(best.keys):
+            # The conversation grew, so extend its entry in place
+            self._prompt_prefixes.remove(best)
+            conversation = best
+        else:
+            conversation = _FormattedConversation()
+            if best is not None:
+                conversation.keys = best.keys[:matched]
+                conversation.texts = best.texts[:matched]
+            if len(self._prompt_prefixes) >= self.PROMPT_PREFIX_CACHE_SIZE:
+                del self._prompt_prefixes[0]
+        self._prompt_prefixes.append(conversation)
+        
+        # Tool results name the call they answer, which may be in the reused prefix
+        tool_calls_by_id = {
+            tool_call.id: tool_call
+            for message in messages[:matched]
+            for tool_call in message.tool_calls or ()
+        }
+        for message, key in zip(messages[matched:], keys[matched:]):
+            conversation.keys.append(key)
+            conversation.texts.append(self._format_message(message, tool_calls_by_id))
+        return conversation
+    
+    @staticmethod
+    def _format_message(message: Message, tool_calls_by_id: Dict[str, ToolCall]) -> str:
+        """
+        Format one message for the prompt.
+        
+        Args:
+            message: The message to format
+            tool_calls_by_id: Tool calls seen earlier in the conversation, by ID;
+                calls made in this message are added to it
+            
+        Returns:
+            str: The prompt text for the message
+        """
+        if message.role == MessageRole.SYSTEM:
+            return f"System: {message.content}\n"
+        if message.role == MessageRole.USER:
+            return f"User: {message.content}\n"
+        if message.role == MessageRole.ASSISTANT:
+            parts = []
+            if isinstance(message.content, str) and message.content.strip():
+                parts.append(f"Assistant: {message.content}\n")
+            if message.tool_calls:
+                for tool_call in message.tool_calls:
+                    tool_calls_by_id[tool_call.id] = tool_call
+                    args_str = orjson.dumps(tool_call.arguments, option=orjson.OPT_INDENT_2).decode("utf-8")
+                    parts.append(
+                        f"Assistant: I need to use the {tool_call.name} tool.\n"
+                        f"Arguments: ```json\n{args_str}\n```\n"
+                    )
+            return "".join(parts)
+        if message.role == MessageRole.TOOL:
+            # Format tool results
+            tool_call = tool_calls_by_id.get(message.tool_call_id) if message.tool_call_id else None
+            if tool_call is not None:
+                return f"Result from {tool_call.name}: {message.content}\n"
+        return ""
+    
     def _generate_tool_instruction(self, tools: List[Dict[str, Any]]) -> str:
         """
         Generate system instruction for using tools.
         
+        The instruction is memoized by the tools' contents, since the same
+        tool set is usually passed on every turn of a conversation.
+        
         Args:
             tools: The tools available to the model
             
         Returns:
             str: System instruction for using tools
         """
-        tool_descriptions = []
-        for tool in tools:
-            params_str = json.dumps(tool.get("parameters", {}), indent=2)
-            tool_descriptions.append(
-                f"Tool: {tool.get('name')}\n"
-                f"Description: {tool.get('description')}\n"
-                f"Parameters: {params_str}\n"
-            )
-        
-        tools_str = "\n".join(tool_descriptions)
-        
-        return (
-            "You have access to the following tools. When you need to use a tool, "
-            "respond with a JSON object in the following format:\n\n"
-            "```json\n{\n  \"name\": \"tool_name\",\n  \"arguments\": {\n    \"arg1\": \"value1\",\n    \"arg2\": \"value2\"\n  }\n}\n```\n\n"
-            f"Available tools:\n\n{tools_str}"
+        signature = tuple(
+            (tool.get("name"), tool.get("description"), orjson.dumps(tool.get("parameters", {})))
+            for tool in tools
         )
+        return _build_tool_instruction(signature)
     
     def _parse_response(
         self,
-        ollama_response: OllamaResponse,
+        text: str,
         tools: Optional[List[Dict[str, Any]]] = None
     ) -> Message:
         """
-        Parse Ollama response to extract message or tool calls.
+        Parse Ollama response text to extract message or tool calls.
         
         Args:
-            ollama_response: Response from Ollama
+            text: The generated text from Ollama
             tools: Available tools
             
         Returns:
             Message: Parsed message with potential tool calls
         """
-        text = ollama_response.response
-        
         # If no tools or empty response, return simple text message
         if not tools or not text.strip():
             return Message(
@@ -334,20 +766,25 @@ class OllamaProvider(LLMProvider):
             )
         
         # Try to find function call in the response
-        match = FUNCTION_CALL_PATTERN.search(text)
-        if not match:
+        json_str = extract_json_object(text)
+        if json_str is None:
             # No function call found, return text message
             return Message(
                 role=MessageRole.ASSISTANT,
                 content=text
             )
         
-        # Extract the JSON part
-        json_str = match.group(2) or match.group(3)
+        # The candidate is already a balanced {...} span; only parse it if it
+        # could be a tool call, since code-heavy output has many other objects
+        if '"name"' not in json_str or '"arguments"' not in json_str:
+            return Message(
+                role=MessageRole.ASSISTANT,
+                content=text
+            )
         
         try:
             # Try to parse as JSON
-            tool_data = json.loads(json_str)
+            tool_data = orjson.loads(json_str)
             
             # Check if it has the expected structure for a tool call
             if "name" in tool_data and "arguments" in tool_data:
@@ -368,7 +805,7 @@ class OllamaProvider(LLMProvider):
                     tool_calls=[tool_call]
                 )
             
-        except (json.JSONDecodeError, KeyError):
+        except (orjson.JSONDecodeError, KeyError):
             # If JSON parsing fails or structure is wrong, return text message
             pass
         
@@ -5,10 +5,12 @@ This module provides integration with the Model Context Protocol, allowing
 the agent to access external context and tools.
 """
 
-from .client import MCPClient, MCPResource, MCPTool
+from .client import AsyncLoopThread, MCPClient, MCPClientRegistry, MCPResource, MCPTool
 
 __all__ = [
+    "AsyncLoopThread",
     "MCPClient",
+    "MCPClientRegistry",
     "MCPResource",
     "MCPTool",
 ] 
\ No newline at end of file
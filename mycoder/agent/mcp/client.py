@@ -5,17 +5,69 @@ This module provides a client for interacting with Model Context Protocol server
 """
 
 import asyncio
+import base64
+import concurrent.futures
 import json
 import logging
+import threading
+import time
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple, Union
+from functools import lru_cache
+from typing import Any, Coroutine, DefaultDict, Dict, List, Optional, Tuple, TypeVar, Union
 
 import aiohttp
+import orjson
 from pydantic import BaseModel
 
 from src.mycoder.settings.config import MCPServer, MCPServerAuth
 
 
+T = TypeVar("T")
+
+# HTTP session shared by all MCPClient instances so connections are reused
+_shared_session: Optional[aiohttp.ClientSession] = None
+_shared_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_shared_session() -> aiohttp.ClientSession:
+    """
+    Get the shared aiohttp session, creating it if needed.
+    
+    A session is bound to the event loop it was created on, so a new one is
+    created if the running loop has changed or the old session was closed.
+    
+    Returns:
+        aiohttp.ClientSession: The shared session
+    """
+    global _shared_session, _shared_session_loop
+    
+    loop = asyncio.get_running_loop()
+    if _shared_session is None or _shared_session.closed or _shared_session_loop is not loop:
+        _shared_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, keepalive_timeout=30)
+        )
+        _shared_session_loop = loop
+    return _shared_session
+
+
+@lru_cache(maxsize=1024)
+def _split_uri(uri: str) -> Optional[Tuple[str, str]]:
+    """
+    Split an MCP URI into its scheme and path.
+    
+    Args:
+        uri: The URI, in the format scheme://path
+    
+    Returns:
+        Optional[Tuple[str, str]]: The scheme and path, or None if the URI is malformed
+    """
+    if "://" not in uri:
+        return None
+    scheme, path = uri.split("://", 1)
+    return scheme, path
+
+
 class MCPResource(BaseModel):
     """A resource from an MCP server."""
     
@@ -42,6 +94,9 @@ class MCPClient:
     Model Context Protocol specification.
     """
     
+    # Maximum number of requests a single client sends to its server at once
+    MAX_CONCURRENT_REQUESTS = 20
+    
     def __init__(self, server_config: MCPServer):
         """
         Initialize the MCP client.
@@ -52,38 +107,67 @@ class MCPClient:
         self.server_config = server_config
         self.logger = logging.getLogger("mycoder.mcp.client")
         self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        self._cached_auth_headers: Optional[Dict[str, str]] = None
+        self._resources_base = f"{server_config.url}/resources/"
+        self._tools_base = f"{server_config.url}/tools/"
     
     async def __aenter__(self):
         """Enter the async context manager."""
         if not self._session:
-            self._session = aiohttp.ClientSession()
+            self._session = _get_shared_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Exit the async context manager."""
-        if self._session:
-            await self._session.close()
-            self._session = None
+        """Exit the async context manager, leaving the shared session open for reuse."""
+        self._session = None
+    
+    @property
+    def connected(self) -> bool:
+        """Whether the client has an open session usable on the running event loop."""
+        if self._session is None or self._session.closed:
+            return False
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        # The session is bound to the loop it was created on; once the shared
+        # session has been replaced for another loop, this one can't be used
+        return self._session is _shared_session and _shared_session_loop is loop
+    
+    @classmethod
+    async def aclose_shared(cls) -> None:
+        """Close the HTTP session shared by all MCP clients."""
+        global _shared_session, _shared_session_loop
+        
+        if _shared_session is not None and not _shared_session.closed:
+            await _shared_session.close()
+        _shared_session = None
+        _shared_session_loop = None
     
     def _get_auth_headers(self) -> Dict[str, str]:
         """
         Get the authorization headers for the MCP server.
         
+        The headers are built once and a copy is returned on each call, so
+        callers may add their own headers.
+        
         Returns:
             Dict[str, str]: The authorization headers
         """
-        auth = self.server_config.auth
-        headers = {}
-        
-        if auth.type == "bearer" and auth.token:
-            headers["Authorization"] = f"Bearer {auth.token}"
-        elif auth.type == "basic" and auth.username and auth.password:
-            import base64
-            auth_str = f"{auth.username}:{auth.password}"
-            encoded = base64.b64encode(auth_str.encode()).decode()
-            headers["Authorization"] = f"Basic {encoded}"
+        if self._cached_auth_headers is None:
+            auth = self.server_config.auth
+            headers = {}
+            
+            if auth.type == "bearer" and auth.token:
+                headers["Authorization"] = f"Bearer {auth.token}"
+            elif auth.type == "basic" and auth.username and auth.password:
+                credentials = f"{auth.username}:{auth.password}".encode()
+                headers["Authorization"] = "Basic " + base64.b64encode(credentials).decode("ascii")
+            
+            self._cached_auth_headers = headers
         
-        return headers
+        return dict(self._cached_auth_headers)
     
     def _get_session(self) -> aiohttp.ClientSession:
         """
@@ -123,10 +207,10 @@ class MCPClient:
                         f"Error listing MCP resources: {response.status} - {error_text}"
                     )
                 
-                return await response.json()
+                return orjson.loads(await response.read())
         except aiohttp.ClientError as e:
-            self.logger.error(f"Error connecting to MCP server: {str(e)}")
-            raise ValueError(f"Error connecting to MCP server: {str(e)}")
+            self.logger.error("Error connecting to MCP server: %s", e)
+            raise ValueError(f"Error connecting to MCP server: {e}") from e
     
     async def get_resource(self, uri: str) -> MCPResource:
         """
@@ -142,12 +226,12 @@ class MCPClient:
             ValueError: If the resource doesn't exist or the server returns an error
         """
         session = self._get_session()
-        # Extract the path from the URI (format: scheme://path)
-        if "://" not in uri:
+        parts = _split_uri(uri)
+        if parts is None:
             raise ValueError(f"Invalid resource URI format: {uri}")
         
-        scheme, path = uri.split("://", 1)
-        url = f"{self.server_config.url}/resources/{scheme}/{path}"
+        scheme, path = parts
+        url = self._resources_base + scheme + "/" + path
         headers = self._get_auth_headers()
         
         try:
@@ -158,15 +242,15 @@ class MCPClient:
                         f"Error getting MCP resource: {response.status} - {error_text}"
                     )
                 
-                data = await response.json()
+                data = orjson.loads(await response.read())
                 return MCPResource(
                     uri=uri,
                     content=data.get("content", ""),
                     metadata=data.get("metadata")
                 )
         except aiohttp.ClientError as e:
-            self.logger.error(f"Error connecting to MCP server: {str(e)}")
-            raise ValueError(f"Error connecting to MCP server: {str(e)}")
+            self.logger.error("Error connecting to MCP server: %s", e)
+            raise ValueError(f"Error connecting to MCP server: {e}") from e
     
     async def list_tools(self) -> List[MCPTool]:
         """
@@ -190,7 +274,7 @@ class MCPClient:
                         f"Error listing MCP tools: {response.status} - {error_text}"
                     )
                 
-                data = await response.json()
+                data = orjson.loads(await response.read())
                 return [
                     MCPTool(
                         uri=tool.get("uri", ""),
@@ -202,8 +286,8 @@ class MCPClient:
                     for tool in data
                 ]
         except aiohttp.ClientError as e:
-            self.logger.error(f"Error connecting to MCP server: {str(e)}")
-            raise ValueError(f"Error connecting to MCP server: {str(e)}")
+            self.logger.error("Error connecting to MCP server: %s", e)
+            raise ValueError(f"Error connecting to MCP server: {e}") from e
     
     async def execute_tool(self, uri: str, params: Optional[Dict[str, Any]] = None) -> Any:
         """
@@ -220,18 +304,18 @@ class MCPClient:
             ValueError: If the tool doesn't exist or the server returns an error
         """
         session = self._get_session()
-        # Extract the path from the URI (format: scheme://path)
-        if "://" not in uri:
+        parts = _split_uri(uri)
+        if parts is None:
             raise ValueError(f"Invalid tool URI format: {uri}")
         
-        scheme, path = uri.split("://", 1)
-        url = f"{self.server_config.url}/tools/{scheme}/{path}"
+        scheme, path = parts
+        url = self._tools_base + scheme + "/" + path
         headers = self._get_auth_headers()
         headers["Content-Type"] = "application/json"
         
         try:
             async with session.post(
-                url, headers=headers, json=params or {}
+                url, headers=headers, data=orjson.dumps(params or {})
             ) as response:
                 if response.status != 200:
                     error_text = await response.text()
@@ -239,7 +323,248 @@ class MCPClient:
                         f"Error executing MCP tool: {response.status} - {error_text}"
                     )
                 
-                return await response.json()
+                return orjson.loads(await response.read())
         except aiohttp.ClientError as e:
-            self.logger.error(f"Error connecting to MCP server: {str(e)}")
-            raise ValueError(f"Error connecting to MCP server: {str(e)}") 
\ No newline at end of file
+            self.logger.error("Error connecting to MCP server: %s", e)
+            raise ValueError(f"Error connecting to MCP server: {e}") from e
+    
+    async def bulk_get_resources(self, uris: List[str]) -> List[Union[MCPResource, Exception]]:
+        """
+        Get several resources from the MCP server concurrently.
+        
+        At most MAX_CONCURRENT_REQUESTS requests are in flight at once. A failed
+        fetch does not cancel the others; its exception is returned in place of
+        the resource.
+        
+        Args:
+            uris: The URIs of the resources
+        
+        Returns:
+            List[Union[MCPResource, Exception]]: The resources or errors, in the
+                same order as uris
+        """
+        async def fetch(uri: str) -> MCPResource:
+            async with self._semaphore:
+                return await self.get_resource(uri)
+        
+        return await asyncio.gather(*(fetch(uri) for uri in uris), return_exceptions=True)
+    
+    async def bulk_execute_tool(
+        self,
+        calls: List[Tuple[str, Optional[Dict[str, Any]]]]
+    ) -> List[Any]:
+        """
+        Execute several tools on the MCP server concurrently.
+        
+        At most MAX_CONCURRENT_REQUESTS requests are in flight at once. A failed
+        call does not cancel the others; its exception is returned in place of
+        the result.
+        
+        Args:
+            calls: (uri, params) pairs for the tools to execute
+        
+        Returns:
+            List[Any]: The results or errors, in the same order as calls
+        """
+        async def execute(uri: str, params: Optional[Dict[str, Any]]) -> Any:
+            async with self._semaphore:
+                return await self.execute_tool(uri, params)
+        
+        return await asyncio.gather(
+            *(execute(uri, params) for uri, params in calls), return_exceptions=True
+        ) 
+
+
+class _ListCache:
+    """
+    Per-server cache of resource and tool listings that expire after a TTL.
+    
+    Listings change rarely, so repeated list calls can be answered without
+    contacting the server.
+    """
+    
+    def __init__(self, ttl: float = 300.0):
+        """
+        Initialize the cache.
+        
+        Args:
+            ttl: Seconds a listing stays valid
+        """
+        self.ttl = ttl
+        # (server name, kind) -> (time fetched on the monotonic clock, listing)
+        self._store: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+    
+    def get(self, server: str, kind: str) -> Optional[Any]:
+        """
+        Get a cached listing.
+        
+        Args:
+            server: Name of the server
+            kind: The kind of listing ("resources" or "tools")
+        
+        Returns:
+            Optional[Any]: The listing, or None if it isn't cached or has expired
+        """
+        entry = self._store.get((server, kind))
+        if entry is None or time.monotonic() - entry[0] >= self.ttl:
+            return None
+        return entry[1]
+    
+    def set(self, server: str, kind: str, listing: Any) -> None:
+        """
+        Cache a listing.
+        
+        Args:
+            server: Name of the server
+            kind: The kind of listing ("resources" or "tools")
+            listing: The listing returned by the server
+        """
+        self._store[(server, kind)] = (time.monotonic(), listing)
+    
+    def invalidate(self, server: Optional[str] = None, kind: Optional[str] = None) -> None:
+        """
+        Drop cached listings.
+        
+        Args:
+            server: Only drop listings for this server (all servers if not provided)
+            kind: Only drop this kind of listing (all kinds if not provided)
+        """
+        for key in list(self._store):
+            if (server is None or key[0] == server) and (kind is None or key[1] == kind):
+                del self._store[key]
+
+
+class AsyncLoopThread(threading.Thread):
+    """
+    Daemon thread running an event loop dedicated to MCP I/O.
+    
+    Callers on other threads or event loops submit coroutines to it, so
+    traffic from several agents is multiplexed over one loop and one
+    connection pool without blocking the callers.
+    """
+    
+    _shared: Optional["AsyncLoopThread"] = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self) -> None:
+        """Create the thread and its event loop; call start() to run it."""
+        super().__init__(name="mycoder-mcp-loop", daemon=True)
+        self._loop = asyncio.new_event_loop()
+    
+    @classmethod
+    def shared(cls) -> "AsyncLoopThread":
+        """
+        Get the process-wide loop thread, starting it if needed.
+        
+        Returns:
+            AsyncLoopThread: The running shared loop thread
+        """
+        with cls._shared_lock:
+            if cls._shared is None or not cls._shared.is_alive():
+                cls._shared = cls()
+                cls._shared.start()
+            return cls._shared
+    
+    def run(self) -> None:
+        """Run the event loop until stop() is called."""
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+            self._loop.close()
+    
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+        """
+        Schedule a coroutine on the loop thread.
+        
+        Args:
+            coro: The coroutine to run
+        
+        Returns:
+            concurrent.futures.Future[T]: Future for the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+    
+    def stop(self) -> None:
+        """Stop the event loop and wait for the thread to exit."""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self.join()
+
+
+class MCPClientRegistry:
+    """
+    Long-lived MCP clients, one per server.
+    
+    Tools share a registry so that each server's client is set up once and
+    reused for every call, instead of being opened and closed per call. The
+    registry also holds the cache of server listings shared by the tools.
+    
+    If a loop thread is given, all client I/O runs on that thread's event
+    loop instead of the caller's.
+    """
+    
+    def __init__(self, list_cache_ttl: float = 300.0, loop_thread: Optional[AsyncLoopThread] = None):
+        """
+        Initialize an empty registry.
+        
+        Args:
+            list_cache_ttl: Seconds that resource and tool listings are cached
+            loop_thread: Optional loop thread to run client I/O on (e.g.
+                AsyncLoopThread.shared())
+        """
+        self._clients: Dict[str, MCPClient] = {}
+        self._locks: DefaultDict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.list_cache = _ListCache(list_cache_ttl)
+        self.loop_thread = loop_thread
+    
+    async def call(self, server_config: MCPServer, method: str, *args: Any) -> Any:
+        """
+        Call a client method for a server, on the loop thread if there is one.
+        
+        Args:
+            server_config: Configuration for the MCP server
+            method: Name of the MCPClient method to call
+            *args: Arguments for the method
+        
+        Returns:
+            Any: The method's result
+        """
+        async def invoke() -> Any:
+            client = await self.get(server_config)
+            return await getattr(client, method)(*args)
+        
+        if self.loop_thread is None:
+            return await invoke()
+        # Cancelling the wrapped future also cancels the task on the loop thread
+        return await asyncio.wrap_future(self.loop_thread.submit(invoke()))
+    
+    async def get(self, server_config: MCPServer) -> MCPClient:
+        """
+        Get the connected client for a server, connecting it on first use.
+        
+        Args:
+            server_config: Configuration for the MCP server
+        
+        Returns:
+            MCPClient: The connected client
+        """
+        client = self._clients.get(server_config.name)
+        if client is not None and client.connected:
+            return client
+        
+        async with self._locks[server_config.name]:
+            # Another caller may have connected the client while we waited
+            client = self._clients.get(server_config.name)
+            if client is None or not client.connected:
+                client = MCPClient(server_config)
+                await client.__aenter__()
+                self._clients[server_config.name] = client
+        return client
+    
+    async def shutdown(self) -> None:
+        """Disconnect all clients held by the registry."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.__aexit__(None, None, None)
@@ -6,14 +6,86 @@ This module provides tools for interacting with MCP servers.
 
 import asyncio
 import logging
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
 from pydantic import BaseModel, Field
 
 from src.mycoder.agent.tools.base import Tool
 from src.mycoder.utils.errors import ToolExecutionError
-from src.mycoder.settings.config import MCPSettings
-from .client import MCPClient, MCPResource, MCPTool
+from src.mycoder.settings.config import MCPServer, MCPSettings
+from .client import MCPClientRegistry, MCPResource, MCPTool
+
+
+T = TypeVar("T")
+
+
+# Returned by an attempt when the server doesn't have what was asked for
+_NOT_FOUND = object()
+
+
+async def _first_success(
+    servers: List[MCPServer],
+    call: Callable[[MCPServer], Awaitable[T]]
+) -> Optional[Tuple[MCPServer, T]]:
+    """
+    Run a call against several servers concurrently and return the first success.
+    
+    A ValueError means the server doesn't have what was asked for. Once one
+    server succeeds the remaining calls are cancelled.
+    
+    Args:
+        servers: The servers to try
+        call: Coroutine function making the request to one server
+        
+    Returns:
+        Optional[Tuple[MCPServer, T]]: The server that answered and its result,
+            or None if no server succeeded
+    """
+    async def attempt(mcp_server: MCPServer) -> Any:
+        try:
+            return await call(mcp_server)
+        except ValueError:
+            return _NOT_FOUND
+    
+    tasks = {asyncio.create_task(attempt(mcp_server)): mcp_server for mcp_server in servers}
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # Prefer servers in config order when several finish together
+            for task in sorted(done, key=list(tasks).index):
+                result = task.result()
+                if result is not _NOT_FOUND:
+                    return tasks[task], result
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
+        # Collect the cancelled attempts so their errors aren't reported as unretrieved
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _paginate(items: List[T], cursor: Optional[str], limit: int) -> Tuple[List[T], Optional[str]]:
+    """
+    Take one page of a listing.
+    
+    Args:
+        items: The full listing
+        cursor: Cursor from the previous page (the first page if not provided)
+        limit: Maximum number of items in the page
+        
+    Returns:
+        Tuple[List[T], Optional[str]]: The page and the cursor for the next
+            page, or None if this is the last page
+        
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    start = int(cursor) if cursor else 0
+    if start < 0 or limit < 1:
+        raise ValueError(f"Invalid page: cursor={cursor!r}, limit={limit}")
+    end = start + limit
+    return items[start:end], (str(end) if end < len(items) else None)
 
 
 class ListMCPServersArgs(BaseModel):
@@ -28,6 +100,14 @@ class ListMCPResourcesArgs(BaseModel):
         default=None,
         description="Name of the server to list resources from (if not provided, lists from all servers)"
     )
+    cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor returned by a previous call, to fetch the next page"
+    )
+    limit: Optional[int] = Field(
+        default=None,
+        description="Maximum number of resources per page (if not provided, returns everything at once)"
+    )
 
 
 class GetMCPResourceArgs(BaseModel):
@@ -42,6 +122,14 @@ class GetMCPResourceArgs(BaseModel):
     )
 
 
+class BatchGetMCPResourceArgs(BaseModel):
+    """Arguments for the batch_get_mcp_resource tool."""
+    
+    items: List[GetMCPResourceArgs] = Field(
+        description="Resources to retrieve"
+    )
+
+
 class ListMCPToolsArgs(BaseModel):
     """Arguments for the list_mcp_tools tool."""
     
@@ -49,6 +137,14 @@ class ListMCPToolsArgs(BaseModel):
         default=None,
         description="Name of the server to list tools from (if not provided, lists from all servers)"
     )
+    cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor returned by a previous call, to fetch the next page"
+    )
+    limit: Optional[int] = Field(
+        default=None,
+        description="Maximum number of tools per page (if not provided, returns everything at once)"
+    )
 
 
 class ExecuteMCPToolArgs(BaseModel):
@@ -67,50 +163,71 @@ class ExecuteMCPToolArgs(BaseModel):
     )
 
 
-class ListMCPServersTool(Tool):
-    """Tool to list available MCP servers."""
+class BatchExecuteMCPToolArgs(BaseModel):
+    """Arguments for the batch_execute_mcp_tool tool."""
     
-    name = "list_mcp_servers"
-    description = "List all configured MCP servers"
+    items: List[ExecuteMCPToolArgs] = Field(
+        description="Tool calls to execute"
+    )
+
+
+class RefreshMCPCacheArgs(BaseModel):
+    """Arguments for the refresh_mcp_cache tool."""
     
-    def __init__(self, mcp_settings: MCPSettings):
+    server: Optional[str] = Field(
+        default=None,
+        description="Name of the server to refresh (if not provided, refreshes all servers)"
+    )
+
+
+class _MCPServerTool(Tool):
+    """Base class for tools that send requests to the configured MCP servers."""
+    
+    __slots__ = ("mcp_settings", "registry", "_servers_by_name")
+    
+    def __init__(self, mcp_settings: MCPSettings, registry: Optional[MCPClientRegistry] = None):
         """
         Initialize the tool.
         
         Args:
             mcp_settings: MCP configuration settings
+            registry: Registry of connected MCP clients to share with other tools
         """
         self.mcp_settings = mcp_settings
-        self.logger = logging.getLogger("mycoder.mcp.tools.list_servers")
+        self.registry = registry or MCPClientRegistry()
+        self._servers_by_name: Dict[str, MCPServer] = {s.name: s for s in mcp_settings.servers}
     
-    async def run(self) -> List[Dict[str, str]]:
+    def _select_servers(self, server: Optional[str] = None) -> List[MCPServer]:
         """
-        List all configured MCP servers.
+        Get the servers a request should be sent to.
         
+        Args:
+            server: Name of a single server to use (if not provided, all servers are used)
+            
         Returns:
-            List[Dict[str, str]]: List of servers with their name and URL
+            List[MCPServer]: The selected servers, in configuration order
+            
+        Raises:
+            ToolExecutionError: If no server has the given name
         """
+        if not server:
+            return self.mcp_settings.servers
         try:
-            servers = []
-            for server in self.mcp_settings.servers:
-                servers.append({
-                    "name": server.name,
-                    "url": server.url
-                })
-            return servers
-        except Exception as e:
-            self.logger.error(f"Error listing MCP servers: {str(e)}")
+            return [self._servers_by_name[server]]
+        except KeyError:
             raise ToolExecutionError(
-                message=f"Error listing MCP servers: {str(e)}",
+                message=f"Unknown MCP server: {server}",
                 tool_name=self.name
-            )
+            ) from None
 
 
-class ListMCPResourcesTool(Tool):
-    """Tool to list resources from MCP servers."""
+class ListMCPServersTool(Tool):
+    """Tool to list available MCP servers."""
     
-    name = "list_mcp_resources"
-    description = "List resources available from MCP servers"
+    name = "list_mcp_servers"
+    description = "List all configured MCP servers"
+    logger = logging.getLogger("mycoder.mcp.tools.list_servers")
+    __slots__ = ("mcp_settings",)
     
     def __init__(self, mcp_settings: MCPSettings):
         """
@@ -120,68 +237,96 @@ class ListMCPResourcesTool(Tool):
             mcp_settings: MCP configuration settings
         """
         self.mcp_settings = mcp_settings
-        self.logger = logging.getLogger("mycoder.mcp.tools.list_resources")
     
-    async def run(self, server: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def run(self) -> List[Dict[str, str]]:
+        """
+        List all configured MCP servers.
+        
+        Returns:
+            List[Dict[str, str]]: List of servers with their name and URL
+        """
+        return [{"name": server.name, "url": server.url} for server in self.mcp_settings.servers]
+
+
+class ListMCPResourcesTool(_MCPServerTool):
+    """Tool to list resources from MCP servers."""
+    
+    name = "list_mcp_resources"
+    description = "List resources available from MCP servers"
+    logger = logging.getLogger("mycoder.mcp.tools.list_resources")
+    __slots__ = ()
+    
+    async def run(
+        self, server: Optional[str] = None, cursor: Optional[str] = None, limit: Optional[int] = None
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         """
         List resources from MCP servers.
         
         Args:
             server: Name of the server to list resources from (if not provided, lists from all servers)
+            cursor: Cursor returned by a previous call, to fetch the next page
+            limit: Maximum number of resources per page (if not provided, returns everything at once)
             
         Returns:
-            List[Dict[str, Any]]: List of resources
+            Union[List[Dict[str, Any]], Dict[str, Any]]: List of resources, or
+                with a limit, {"items": [...], "next_cursor": ...}
             
         Raises:
             ToolExecutionError: If there's an error listing resources
         """
         try:
-            resources = []
+            servers = self._select_servers(server)
             
-            for mcp_server in self.mcp_settings.servers:
-                # Skip if server is specified and doesn't match
-                if server and mcp_server.name != server:
-                    continue
-                
-                try:
-                    async with MCPClient(mcp_server) as client:
-                        server_resources = await client.list_resources()
-                        
-                        # Add server name to each resource
-                        for resource in server_resources:
-                            resource["server"] = mcp_server.name
-                        
-                        resources.extend(server_resources)
-                except Exception as e:
+            async def list_from(mcp_server: MCPServer) -> List[Dict[str, Any]]:
+                server_resources = self.registry.list_cache.get(mcp_server.name, "resources")
+                if server_resources is None:
+                    server_resources = await self.registry.call(mcp_server, "list_resources")
+                    self.registry.list_cache.set(mcp_server.name, "resources", server_resources)
+                return server_resources
+            
+            # Query all servers at once rather than one after another
+            results = await asyncio.gather(
+                *(list_from(mcp_server) for mcp_server in servers), return_exceptions=True
+            )
+            
+            found: List[Tuple[str, Dict[str, Any]]] = []
+            for mcp_server, result in zip(servers, results):
+                if isinstance(result, BaseException):
                     self.logger.warning(
-                        f"Error listing resources from MCP server {mcp_server.name}: {str(e)}"
+                        "Error listing resources from MCP server %s: %s", mcp_server.name, result
                     )
                     # Continue with other servers
+                    continue
+                found.extend((mcp_server.name, resource) for resource in result)
+            
+            next_cursor = None
+            if limit is not None:
+                found, next_cursor = _paginate(found, cursor, limit)
             
-            return resources
+            # Add server name to each resource, leaving the cached listing untouched
+            resources = [{**resource, "server": server_name} for server_name, resource in found]
+            if limit is None:
+                return resources
+            return {"items": resources, "next_cursor": next_cursor}
+        except ToolExecutionError:
+            # Already describes the failure; don't wrap it a second time
+            raise
         except Exception as e:
-            self.logger.error(f"Error listing MCP resources: {str(e)}")
+            self.logger.error("Error listing MCP resources: %s", e)
             raise ToolExecutionError(
                 message=f"Error listing MCP resources: {str(e)}",
-                tool_name=self.name
-            )
+                tool_name=self.name,
+                original_error=e
+            ) from e
 
 
-class GetMCPResourceTool(Tool):
+class GetMCPResourceTool(_MCPServerTool):
     """Tool to get a resource from an MCP server."""
     
     name = "get_mcp_resource"
     description = "Get a resource from an MCP server"
-    
-    def __init__(self, mcp_settings: MCPSettings):
-        """
-        Initialize the tool.
-        
-        Args:
-            mcp_settings: MCP configuration settings
-        """
-        self.mcp_settings = mcp_settings
-        self.logger = logging.getLogger("mycoder.mcp.tools.get_resource")
+    logger = logging.getLogger("mycoder.mcp.tools.get_resource")
+    __slots__ = ()
     
     async def run(self, uri: str, server: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -198,118 +343,180 @@ class GetMCPResourceTool(Tool):
             ToolExecutionError: If there's an error getting the resource
         """
         try:
-            for mcp_server in self.mcp_settings.servers:
-                # Skip if server is specified and doesn't match
-                if server and mcp_server.name != server:
-                    continue
-                
-                try:
-                    async with MCPClient(mcp_server) as client:
-                        resource = await client.get_resource(uri)
-                        return {
-                            "uri": resource.uri,
-                            "content": resource.content,
-                            "metadata": resource.metadata,
-                            "server": mcp_server.name
-                        }
-                except ValueError:
-                    # Resource not found on this server, try the next one
-                    continue
-            
-            # If we get here, the resource wasn't found on any server
-            raise ToolExecutionError(
-                message=f"Resource not found: {uri}",
-                tool_name=self.name
-            )
+            return await self._get_one(uri, server)
+        except ToolExecutionError:
+            # Already describes the failure; don't wrap it a second time
+            raise
         except Exception as e:
-            self.logger.error(f"Error getting MCP resource: {str(e)}")
+            self.logger.error("Error getting MCP resource: %s", e)
             raise ToolExecutionError(
                 message=f"Error getting MCP resource: {str(e)}",
+                tool_name=self.name,
+                original_error=e
+            ) from e
+    
+    async def _get_one(self, uri: str, server: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Find a resource on the MCP servers.
+        
+        Args:
+            uri: URI of the resource
+            server: Name of the server to get the resource from (if not provided, tries all servers)
+            
+        Returns:
+            Dict[str, Any]: The resource content and metadata
+            
+        Raises:
+            ToolExecutionError: If no server has the resource
+        """
+        async def get_from(mcp_server: MCPServer) -> MCPResource:
+            return await self.registry.call(mcp_server, "get_resource", uri)
+        
+        # Ask every server at once and take the first one that has the resource
+        found = await _first_success(self._select_servers(server), get_from)
+        if found is None:
+            raise ToolExecutionError(
+                message=f"Resource not found: {uri}",
                 tool_name=self.name
             )
+        
+        mcp_server, resource = found
+        return {
+            "uri": resource.uri,
+            "content": resource.content,
+            "metadata": resource.metadata,
+            "server": mcp_server.name
+        }
 
 
-class ListMCPToolsTool(Tool):
-    """Tool to list tools from MCP servers."""
+class BatchGetMCPResourceTool(GetMCPResourceTool):
+    """Tool to get several resources from MCP servers in one call."""
     
-    name = "list_mcp_tools"
-    description = "List tools available from MCP servers"
+    name = "batch_get_mcp_resource"
+    description = "Get several resources from MCP servers at once"
+    logger = logging.getLogger("mycoder.mcp.tools.batch_get_resource")
+    __slots__ = ()
     
-    def __init__(self, mcp_settings: MCPSettings):
+    async def run(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Initialize the tool.
+        Get several resources concurrently.
+        
+        Repeated (server, uri) pairs are only fetched once.
         
         Args:
-            mcp_settings: MCP configuration settings
+            items: The resources to get, each with a uri and optional server
+            
+        Returns:
+            List[Dict[str, Any]]: The resources in the same order as items; a
+                resource that couldn't be fetched has an "error" entry instead
+                of content
         """
-        self.mcp_settings = mcp_settings
-        self.logger = logging.getLogger("mycoder.mcp.tools.list_tools")
+        requests = [GetMCPResourceArgs.model_validate(item) for item in items]
+        unique = list(dict.fromkeys((request.server, request.uri) for request in requests))
+        
+        results = await asyncio.gather(
+            *(self._get_one(uri, server) for server, uri in unique), return_exceptions=True
+        )
+        
+        by_key: Dict[Tuple[Optional[str], str], Dict[str, Any]] = {}
+        for (server, uri), result in zip(unique, results):
+            if isinstance(result, BaseException):
+                self.logger.warning("Error getting MCP resource %s: %s", uri, result)
+                result = {"uri": uri, "server": server, "error": str(result)}
+            by_key[(server, uri)] = result
+        
+        return [by_key[(request.server, request.uri)] for request in requests]
+
+
+class ListMCPToolsTool(_MCPServerTool):
+    """Tool to list tools from MCP servers."""
+    
+    name = "list_mcp_tools"
+    description = "List tools available from MCP servers"
+    logger = logging.getLogger("mycoder.mcp.tools.list_tools")
+    __slots__ = ()
     
-    async def run(self, server: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def run(
+        self, server: Optional[str] = None, cursor: Optional[str] = None, limit: Optional[int] = None
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         """
         List tools from MCP servers.
         
         Args:
             server: Name of the server to list tools from (if not provided, lists from all servers)
+            cursor: Cursor returned by a previous call, to fetch the next page
+            limit: Maximum number of tools per page (if not provided, returns everything at once)
             
         Returns:
-            List[Dict[str, Any]]: List of tools
+            Union[List[Dict[str, Any]], Dict[str, Any]]: List of tools, or with
+                a limit, {"items": [...], "next_cursor": ...}
             
         Raises:
             ToolExecutionError: If there's an error listing tools
         """
         try:
-            tools_list = []
+            servers = self._select_servers(server)
             
-            for mcp_server in self.mcp_settings.servers:
-                # Skip if server is specified and doesn't match
-                if server and mcp_server.name != server:
-                    continue
-                
-                try:
-                    async with MCPClient(mcp_server) as client:
-                        server_tools = await client.list_tools()
-                        
-                        # Convert tools to dicts and add server name
-                        for tool in server_tools:
-                            tools_list.append({
-                                "uri": tool.uri,
-                                "name": tool.name,
-                                "description": tool.description,
-                                "parameters": tool.parameters,
-                                "returns": tool.returns,
-                                "server": mcp_server.name
-                            })
-                except Exception as e:
+            async def list_from(mcp_server: MCPServer) -> List[MCPTool]:
+                server_tools = self.registry.list_cache.get(mcp_server.name, "tools")
+                if server_tools is None:
+                    server_tools = await self.registry.call(mcp_server, "list_tools")
+                    self.registry.list_cache.set(mcp_server.name, "tools", server_tools)
+                return server_tools
+            
+            # Query all servers at once rather than one after another
+            results = await asyncio.gather(
+                *(list_from(mcp_server) for mcp_server in servers), return_exceptions=True
+            )
+            
+            found: List[Tuple[str, MCPTool]] = []
+            for mcp_server, result in zip(servers, results):
+                if isinstance(result, BaseException):
                     self.logger.warning(
-                        f"Error listing tools from MCP server {mcp_server.name}: {str(e)}"
+                        "Error listing tools from MCP server %s: %s", mcp_server.name, result
                     )
                     # Continue with other servers
+                    continue
+                found.extend((mcp_server.name, tool) for tool in result)
+            
+            next_cursor = None
+            if limit is not None:
+                found, next_cursor = _paginate(found, cursor, limit)
             
-            return tools_list
+            # Convert only the returned tools to dicts and add server name
+            tools_list = [
+                {
+                    "uri": tool.uri,
+                    "name": tool.name,
+                    "description": tool.description,
+                    "parameters": tool.parameters,
+                    "returns": tool.returns,
+                    "server": server_name
+                }
+                for server_name, tool in found
+            ]
+            if limit is None:
+                return tools_list
+            return {"items": tools_list, "next_cursor": next_cursor}
+        except ToolExecutionError:
+            # Already describes the failure; don't wrap it a second time
+            raise
         except Exception as e:
-            self.logger.error(f"Error listing MCP tools: {str(e)}")
+            self.logger.error("Error listing MCP tools: %s", e)
             raise ToolExecutionError(
                 message=f"Error listing MCP tools: {str(e)}",
-                tool_name=self.name
-            )
+                tool_name=self.name,
+                original_error=e
+            ) from e
 
 
-class ExecuteMCPToolTool(Tool):
+class ExecuteMCPToolTool(_MCPServerTool):
     """Tool to execute a tool on an MCP server."""
     
     name = "execute_mcp_tool"
     description = "Execute a tool on an MCP server"
-    
-    def __init__(self, mcp_settings: MCPSettings):
-        """
-        Initialize the tool.
-        
-        Args:
-            mcp_settings: MCP configuration settings
-        """
-        self.mcp_settings = mcp_settings
-        self.logger = logging.getLogger("mycoder.mcp.tools.execute_tool")
+    logger = logging.getLogger("mycoder.mcp.tools.execute_tool")
+    __slots__ = ()
     
     async def run(
         self, uri: str, params: Optional[Dict[str, Any]] = None, server: Optional[str] = None
@@ -329,49 +536,143 @@ class ExecuteMCPToolTool(Tool):
             ToolExecutionError: If there's an error executing the tool
         """
         try:
-            for mcp_server in self.mcp_settings.servers:
-                # Skip if server is specified and doesn't match
-                if server and mcp_server.name != server:
-                    continue
-                
-                try:
-                    async with MCPClient(mcp_server) as client:
-                        result = await client.execute_tool(uri, params)
-                        return {
-                            "result": result,
-                            "server": mcp_server.name
-                        }
-                except ValueError:
-                    # Tool not found on this server, try the next one
-                    continue
-            
-            # If we get here, the tool wasn't found on any server
-            raise ToolExecutionError(
-                message=f"Tool not found: {uri}",
-                tool_name=self.name
-            )
+            return await self._execute_one(uri, params, server)
+        except ToolExecutionError:
+            # Already describes the failure; don't wrap it a second time
+            raise
         except Exception as e:
-            self.logger.error(f"Error executing MCP tool: {str(e)}")
+            self.logger.error("Error executing MCP tool: %s", e)
             raise ToolExecutionError(
                 message=f"Error executing MCP tool: {str(e)}",
-                tool_name=self.name
-            )
+                tool_name=self.name,
+                original_error=e
+            ) from e
+    
+    async def _execute_one(
+        self, uri: str, params: Optional[Dict[str, Any]] = None, server: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute a tool on the first MCP server that has it.
+        
+        Args:
+            uri: URI of the tool
+            params: Parameters to pass to the tool
+            server: Name of the server to execute the tool on (if not provided, tries all servers)
+            
+        Returns:
+            Dict[str, Any]: The result and the server that produced it
+            
+        Raises:
+            ToolExecutionError: If no server has the tool
+        """
+        # Servers are tried one at a time: executing a tool can have side
+        # effects, so it must not run on more than one server
+        for mcp_server in self._select_servers(server):
+            try:
+                result = await self.registry.call(mcp_server, "execute_tool", uri, params)
+                return {
+                    "result": result,
+                    "server": mcp_server.name
+                }
+            except ValueError:
+                # Tool not found on this server, try the next one
+                continue
+        
+        # If we get here, the tool wasn't found on any server
+        raise ToolExecutionError(
+            message=f"Tool not found: {uri}",
+            tool_name=self.name
+        )
 
 
-def get_mcp_tools(mcp_settings: MCPSettings) -> List[Tool]:
+class BatchExecuteMCPToolTool(ExecuteMCPToolTool):
+    """Tool to execute several tools on MCP servers in one call."""
+    
+    name = "batch_execute_mcp_tool"
+    description = "Execute several tools on MCP servers at once"
+    logger = logging.getLogger("mycoder.mcp.tools.batch_execute_tool")
+    __slots__ = ()
+    
+    async def run(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute several tools concurrently.
+        
+        Unlike resource fetches, repeated calls are not merged, since each
+        execution may have its own side effects.
+        
+        Args:
+            items: The tool calls, each with a uri and optional params and server
+            
+        Returns:
+            List[Dict[str, Any]]: The results in the same order as items; a call
+                that failed has an "error" entry instead of a result
+        """
+        requests = [ExecuteMCPToolArgs.model_validate(item) for item in items]
+        results = await asyncio.gather(
+            *(self._execute_one(r.uri, r.params, r.server) for r in requests),
+            return_exceptions=True
+        )
+        
+        outputs = []
+        for request, result in zip(requests, results):
+            if isinstance(result, BaseException):
+                self.logger.warning("Error executing MCP tool %s: %s", request.uri, result)
+                result = {"uri": request.uri, "server": request.server, "error": str(result)}
+            outputs.append(result)
+        return outputs
+
+
+class RefreshMCPCacheTool(_MCPServerTool):
+    """Tool to discard cached resource and tool listings."""
+    
+    name = "refresh_mcp_cache"
+    description = "Discard cached MCP resource and tool listings so they are fetched again"
+    logger = logging.getLogger("mycoder.mcp.tools.refresh_cache")
+    __slots__ = ()
+    
+    async def run(self, server: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Discard cached listings.
+        
+        Args:
+            server: Name of the server to refresh (if not provided, refreshes all servers)
+            
+        Returns:
+            Dict[str, Any]: The servers whose listings were discarded
+            
+        Raises:
+            ToolExecutionError: If the server is not configured
+        """
+        servers = self._select_servers(server)
+        self.registry.list_cache.invalidate(server)
+        return {"refreshed": [mcp_server.name for mcp_server in servers]}
+
+
+def get_mcp_tools(
+    mcp_settings: MCPSettings,
+    registry: Optional[MCPClientRegistry] = None
+) -> List[Tool]:
     """
     Get all MCP tools.
     
+    The tools share one client registry, so each server is connected once.
+    Call registry.shutdown() when the tools are no longer needed.
+    
     Args:
         mcp_settings: MCP configuration settings
+        registry: Registry of connected MCP clients (a new one is created if not provided)
         
     Returns:
         List[Tool]: List of MCP tools
     """
+    registry = registry or MCPClientRegistry()
     return [
         ListMCPServersTool(mcp_settings),
-        ListMCPResourcesTool(mcp_settings),
-        GetMCPResourceTool(mcp_settings),
-        ListMCPToolsTool(mcp_settings),
-        ExecuteMCPToolTool(mcp_settings)
-    ] 
\ No newline at end of file
+        ListMCPResourcesTool(mcp_settings, registry),
+        GetMCPResourceTool(mcp_settings, registry),
+        BatchGetMCPResourceTool(mcp_settings, registry),
+        ListMCPToolsTool(mcp_settings, registry),
+        ExecuteMCPToolTool(mcp_settings, registry),
+        BatchExecuteMCPToolTool(mcp_settings, registry),
+        RefreshMCPCacheTool(mcp_settings, registry)
+    ]
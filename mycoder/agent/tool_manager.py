@@ -131,6 +131,21 @@ class ToolManager:
         """
         return [tool.get_schema_for_llm(provider) for tool in self.tools.values()]
     
+    def get_tool_schemas_json(self, provider: str = "anthropic") -> bytes:
+        """
+        Get schemas for all tools as a JSON array.
+        
+        Each tool's schema is serialized once and cached, so building the
+        array only joins the pre-encoded schemas.
+        
+        Args:
+            provider: LLM provider name (currently only "anthropic" supported)
+            
+        Returns:
+            bytes: JSON array of tool schemas
+        """
+        return b"[" + b",".join(tool.get_schema_json(provider) for tool in self.tools.values()) + b"]"
+    
     async def execute_tool(
         self, name: str, arguments: Dict[str, Any], handle_errors: bool = True
     ) -> Union[Any, Dict[str, str]]:
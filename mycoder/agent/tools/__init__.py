@@ -5,7 +5,9 @@ This package contains tools that enable the agent to interact with the world,
 including file operations, shell commands, and user interactions.
 """
 
-from typing import List, Set
+import asyncio
+import atexit
+from typing import Any, List, Set
 
 from src.mycoder.agent.tools.base import Tool, create_tool_from_func
 from src.mycoder.agent.tools.browser import Browser
@@ -40,6 +42,7 @@ __all__ = [
     "get_default_tools",
     "get_tools_by_categories",
     "load_mcp_tools",
+    "close_mcp_tools",
 ]
 
 # Organize tools by category
@@ -53,6 +56,9 @@ TOOLS_BY_CATEGORY = {
     "mcp": []  # MCP tools are loaded dynamically from settings
 }
 
+# Client registries of the MCP tools loaded so far, disconnected by close_mcp_tools()
+_mcp_registries: List[Any] = []
+
 
 def get_default_tools() -> List[type]:
     """
@@ -103,10 +109,50 @@ def load_mcp_tools(settings: Settings) -> List[Tool]:
     
     try:
         # Dynamic import to avoid circular imports
+        from src.mycoder.agent.mcp.client import AsyncLoopThread, MCPClientRegistry
         from src.mycoder.agent.mcp.tools import get_mcp_tools
-        return get_mcp_tools(settings.mcp)
     except ImportError:
         import logging
         logger = logging.getLogger("mycoder.tools")
         logger.warning("MCP tools package not available")
         return []
+    
+    # Run all MCP traffic on one loop thread, so agents on other threads and
+    # loops share its connection pool without blocking each other
+    registry = MCPClientRegistry(loop_thread=AsyncLoopThread.shared())
+    _mcp_registries.append(registry)
+    return get_mcp_tools(settings.mcp, registry)
+
+
+async def close_mcp_tools() -> None:
+    """
+    Disconnect the MCP clients of the tools returned by load_mcp_tools().
+    
+    Call this when the agent shuts down; it also runs at exit. The HTTP
+    session shared by the clients is closed as well, on the loop thread
+    it belongs to.
+    """
+    if not _mcp_registries:
+        return
+    
+    from src.mycoder.agent.mcp.client import MCPClient
+    registries = list(_mcp_registries)
+    _mcp_registries.clear()
+    for registry in registries:
+        await registry.shutdown()
+    loop_thread = registries[-1].loop_thread
+    await asyncio.wrap_future(loop_thread.submit(MCPClient.aclose_shared()))
+
+
+def _close_mcp_tools_at_exit() -> None:
+    """Best-effort cleanup of the MCP clients when the interpreter exits."""
+    if not _mcp_registries:
+        return
+    try:
+        asyncio.run(close_mcp_tools())
+    except Exception:
+        # The loop thread the session was bound to may already be gone
+        pass
+
+
+atexit.register(_close_mcp_tools_at_exit)
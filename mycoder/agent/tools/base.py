@@ -5,11 +5,21 @@ This module defines the abstract base Tool class that all specific tools inherit
 along with utility functions for tool validation and management.
 """
 
+import functools
 import inspect
+import types
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Type, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Type, Union, get_args, get_origin
 
-from pydantic import BaseModel, ValidationError, create_model
+import orjson
+from pydantic import BaseModel, TypeAdapter, ValidationError, create_model
+from pydantic.fields import FieldInfo
+
+# JSON schema types for Python scalar annotations; anything else is an object
+_JSON_TYPES: Dict[Any, str] = {str: "string", int: "integer", float: "number", bool: "boolean"}
+
+# Origins of Optional[X] and, on Python 3.10+, X | None
+_UNION_TYPES = (Union, getattr(types, "UnionType", Union))
 
 
 class Tool(ABC):
@@ -25,6 +35,9 @@ class Tool(ABC):
     args_schema: Type[BaseModel]
     returns_schema: Optional[Type[BaseModel]] = None
     
+    # Subclasses can declare their own __slots__ to avoid a per-instance __dict__
+    __slots__ = ()
+    
     def __init__(self) -> None:
         """Initialize the tool with validation of required attributes."""
         # Validate that required attributes are set
@@ -51,7 +64,7 @@ class Tool(ABC):
             ValidationError: If arguments don't match the schema
         """
         try:
-            validated = self.args_schema(**kwargs)
+            validated = _get_args_adapter(self.args_schema).validate_python(kwargs)
             return validated.model_dump()
         except ValidationError as e:
             # Re-raise with more helpful message
@@ -119,24 +132,32 @@ class Tool(ABC):
         
         return schema
     
+    def get_schema_json(self, provider: str = "anthropic") -> bytes:
+        """
+        Get the LLM schema serialized as compact JSON.
+        
+        The encoding is cached, so adapters that send schemas as JSON don't
+        re-serialize them on every request.
+        
+        Args:
+            provider: LLM provider name (currently only "anthropic" supported)
+            
+        Returns:
+            bytes: The JSON-encoded schema
+        """
+        return _encode_schema(self.name, self.description, self.args_schema)
+    
     def _get_parameters_schema(self) -> Dict[str, Any]:
         """
         Get a generic schema representation of the parameters.
         
+        The schema is built once per args_schema class and shared between
+        calls, so it must not be modified.
+        
         Returns:
             Dict[str, Any]: Parameters schema
         """
-        return {
-            "type": "object",
-            "properties": {
-                name: self._get_property_schema(field)
-                for name, field in self.args_schema.model_fields.items()
-            },
-            "required": [
-                name for name, field in self.args_schema.model_fields.items()
-                if field.is_required
-            ]
-        }
+        return _build_parameters_schema(self.args_schema)
     
     def _get_property_schema(self, field) -> Dict[str, Any]:
         """
@@ -148,57 +169,146 @@ class Tool(ABC):
         Returns:
             Dict[str, Any]: Schema property definition
         """
-        property_schema = {}
-        
-        # Get type
-        annotation = field.annotation
-        
-        # Handle optional types
-        is_optional = False
-        if getattr(annotation, "__origin__", None) is Union:
-            args = annotation.__args__
-            if type(None) in args:
-                is_optional = True
-                # Filter out None type
-                non_none_args = [arg for arg in args if arg is not type(None)]
-                if len(non_none_args) == 1:
-                    annotation = non_none_args[0]
-        
-        # Map Python types to JSON schema types
-        if annotation is str:
-            property_schema["type"] = "string"
-        elif annotation is int:
-            property_schema["type"] = "integer"
-        elif annotation is float:
-            property_schema["type"] = "number"
-        elif annotation is bool:
-            property_schema["type"] = "boolean"
-        elif getattr(annotation, "__origin__", None) is list:
-            property_schema["type"] = "array"
-            if hasattr(annotation, "__args__") and annotation.__args__:
-                item_type = annotation.__args__[0]
-                if item_type is str:
-                    property_schema["items"] = {"type": "string"}
-                elif item_type is int:
-                    property_schema["items"] = {"type": "integer"}
-                elif item_type is float:
-                    property_schema["items"] = {"type": "number"}
-                elif item_type is bool:
-                    property_schema["items"] = {"type": "boolean"}
-                else:
-                    property_schema["items"] = {"type": "object"}
-        elif getattr(annotation, "__origin__", None) is dict:
-            property_schema["type"] = "object"
-        else:
-            property_schema["type"] = "object"
-        
-        # Add description from field info if available
-        if field.description:
-            property_schema["description"] = field.description
-        
-        return property_schema
+        return _build_property_schema(field)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_args_adapter(args_schema: Type[BaseModel]) -> TypeAdapter:
+    """
+    Get a reusable validator for a tool's arguments model.
+    
+    Args:
+        args_schema: The tool's arguments model
+        
+    Returns:
+        TypeAdapter: Adapter that validates a dict of arguments into the model
+    """
+    return TypeAdapter(args_schema)
+
+
+@functools.lru_cache(maxsize=None)
+def _encode_schema(name: str, description: str, args_schema: Type[BaseModel]) -> bytes:
+    """
+    Serialize a tool's LLM schema to JSON.
+    
+    Args:
+        name: The tool name
+        description: The tool description
+        args_schema: The tool's arguments model
+        
+    Returns:
+        bytes: The JSON-encoded schema
+    """
+    return orjson.dumps({
+        "name": name,
+        "description": description,
+        "parameters": _build_parameters_schema(args_schema),
+    })
+
+
+@functools.lru_cache(maxsize=None)
+def _build_parameters_schema(args_schema: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Build the parameters schema for a tool's arguments model.
+    
+    Args:
+        args_schema: The tool's arguments model
+        
+    Returns:
+        Dict[str, Any]: Parameters schema
+    """
+    return {
+        "type": "object",
+        "properties": {
+            name: _build_property_schema(field)
+            for name, field in args_schema.model_fields.items()
+        },
+        "required": [
+            name for name, field in args_schema.model_fields.items()
+            if field.is_required()
+        ]
+    }
+
+
+def _build_property_schema(field: FieldInfo) -> Dict[str, Any]:
+    """
+    Convert a Pydantic field to a schema property.
+    
+    Args:
+        field: Pydantic field
+        
+    Returns:
+        Dict[str, Any]: Schema property definition
+    """
+    property_schema = {}
+    
+    # Get type
+    annotation = field.annotation
+    
+    # Unwrap Optional[X] and X | None to X
+    if get_origin(annotation) in _UNION_TYPES:
+        non_none_args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(non_none_args) == 1:
+            annotation = non_none_args[0]
+    
+    # Map Python types to JSON schema types
+    origin = get_origin(annotation)
+    if origin is list:
+        property_schema["type"] = "array"
+        args = get_args(annotation)
+        if args:
+            property_schema["items"] = {"type": _JSON_TYPES.get(args[0], "object")}
+    else:
+        property_schema["type"] = _JSON_TYPES.get(annotation, "object")
+    
+    # Add description from field info if available
+    if field.description:
+        property_schema["description"] = field.description
+    
+    return property_schema
 
 
+@functools.lru_cache(maxsize=None)
+def _signature_fields(func: Callable[..., Any]) -> Tuple[Tuple[str, Any, Any], ...]:
+    """
+    Get the argument model fields for a function's parameters.
+    
+    Args:
+        func: The function to inspect
+        
+    Returns:
+        Tuple[Tuple[str, Any, Any], ...]: (name, annotation, default) for each
+            parameter, with Any for missing annotations and ... for required ones
+    """
+    fields = []
+    for param_name, param in inspect.signature(func).parameters.items():
+        annotation = param.annotation
+        if annotation is inspect.Parameter.empty:
+            annotation = Any
+            
+        default = ... if param.default is inspect.Parameter.empty else param.default
+        fields.append((param_name, annotation, default))
+    return tuple(fields)
+
+
+@functools.lru_cache(maxsize=None)
+def _create_args_model(model_name: str, fields: Tuple[Tuple[str, Any, Any], ...]) -> Type[BaseModel]:
+    """
+    Create an arguments model, reusing it for identical signatures.
+    
+    Args:
+        model_name: Name of the model class
+        fields: (name, annotation, default) for each parameter
+        
+    Returns:
+        Type[BaseModel]: The arguments model
+    """
+    return create_model(
+        model_name, **{name: (annotation, default) for name, annotation, default in fields}
+    )
+
+
+@functools.lru_cache(maxsize=None)
 def create_tool_from_func(
     func, 
     name: Optional[str] = None,
@@ -208,7 +318,8 @@ def create_tool_from_func(
     Create a Tool class from a function.
     
     This is a factory function that creates a Tool subclass from a given function,
-    using type annotations to generate the args_schema.
+    using type annotations to generate the args_schema. Repeated calls with the
+    same arguments return the same class.
     
     Args:
         func: The async function to convert to a Tool
@@ -221,26 +332,25 @@ def create_tool_from_func(
     if not inspect.iscoroutinefunction(func):
         raise ValueError(f"Function {func.__name__} must be an async function (coroutine)")
     
-    # Get function signature and annotations
-    sig = inspect.signature(func)
-    
     # Create args model dynamically
-    fields = {}
-    for param_name, param in sig.parameters.items():
-        annotation = param.annotation
-        if annotation is inspect.Parameter.empty:
-            annotation = Any
-            
-        default = ... if param.default is inspect.Parameter.empty else param.default
-        fields[param_name] = (annotation, default)
+    fields = _signature_fields(func)
+    model_name = f"{func.__name__.title()}Args"
+    try:
+        args_model = _create_args_model(model_name, fields)
+    except TypeError:
+        # Unhashable defaults or annotations can't be used as a cache key
+        args_model = _create_args_model.__wrapped__(model_name, fields)
     
-    args_model = create_model(f"{func.__name__.title()}Args", **fields)
+    # Resolve these outside the class body, which can't see this function's locals
+    tool_name = name or func.__name__
+    tool_description = description or inspect.getdoc(func) or f"Run the {func.__name__} function"
     
     # Create the tool class
     class FunctionTool(Tool):
-        name = name or func.__name__
-        description = description or inspect.getdoc(func) or f"Run the {func.__name__} function"
+        name = tool_name
+        description = tool_description
         args_schema = args_model
+        __slots__ = ()
         
         async def run(self, **kwargs: Any) -> Any:
             return await func(**kwargs)
@@ -5,9 +5,23 @@ This module provides tools for reading, writing, and manipulating files in
 the file system.
 """
 
+import asyncio
+import codecs
+import fnmatch
+import functools
+import io
+import mmap
 import os
+import queue
+import re
+import stat
+import threading
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Callable, Iterator, List, Optional, Tuple, Union
 
 import aiofiles
 from pydantic import BaseModel, Field, validator
@@ -18,6 +32,311 @@ from src.mycoder.utils.logging import get_logger
 
 logger = get_logger("mycoder.agent.tools.file_ops")
 
+# Buffer size for reading line ranges, large enough that typical source files are read in one go
+READ_BUFFER_SIZE = 128 * 1024
+
+# Buffer size for whole-file reads and writes, so large files take few syscalls
+LARGE_BUFFER_SIZE = 2 * 1024 * 1024
+
+# Files smaller than this are read in one call rather than through a pooled buffer
+POOLED_READ_THRESHOLD = 32 * 1024
+
+# Reusable scratch buffers for large reads, shared by the worker threads
+_BUFFER_POOL: "queue.LifoQueue[bytearray]" = queue.LifoQueue(maxsize=4)
+
+
+@contextmanager
+def _pooled_buffer() -> Iterator[bytearray]:
+    """
+    Borrow a scratch buffer from the pool.
+    
+    A new buffer is allocated if the pool is empty, and dropped instead of
+    returned if the pool is full.
+    
+    Yields:
+        bytearray: A buffer of LARGE_BUFFER_SIZE bytes
+    """
+    try:
+        buf = _BUFFER_POOL.get_nowait()
+    except queue.Empty:
+        buf = bytearray(LARGE_BUFFER_SIZE)
+    try:
+        yield buf
+    finally:
+        try:
+            _BUFFER_POOL.put_nowait(buf)
+        except queue.Full:
+            pass
+
+
+# Flags for opening files to read. O_NONBLOCK stops a FIFO from blocking the
+# open and has no effect on regular files.
+_READ_FLAGS = os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_NONBLOCK', 0)
+
+# Linux only: don't update the access time of files we own
+_O_NOATIME = getattr(os, 'O_NOATIME', 0)
+
+
+class _NotAFileError(OSError):
+    """Raised when a path to be read is not a regular file."""
+
+
+def _open_file(path: Path) -> Tuple[int, os.stat_result]:
+    """
+    Open a regular file for reading.
+    
+    A single open and fstat replace separate exists and is_file checks.
+    
+    Args:
+        path: Path of the file to open
+        
+    Returns:
+        Tuple[int, os.stat_result]: The open file descriptor and its stat result
+        
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        _NotAFileError: If the path is not a regular file
+    """
+    if _O_NOATIME:
+        try:
+            fd = os.open(path, _READ_FLAGS | _O_NOATIME)
+        except PermissionError:
+            # O_NOATIME is only allowed on files we own
+            fd = os.open(path, _READ_FLAGS)
+    else:
+        fd = os.open(path, _READ_FLAGS)
+    
+    try:
+        st = os.fstat(fd)
+        if not stat.S_ISREG(st.st_mode):
+            raise _NotAFileError(f"Not a regular file: {path}")
+    except BaseException:
+        os.close(fd)
+        raise
+    return fd, st
+
+
+def _read_text(fd: int, size: int) -> str:
+    """
+    Read a whole file as UTF-8 text with universal newlines.
+    
+    Large files are read through a pooled buffer and decoded chunk by chunk,
+    so no intermediate bytes object the size of the file is allocated.
+    
+    Args:
+        fd: Open file descriptor, which is closed afterwards
+        size: Size of the file in bytes
+        
+    Returns:
+        str: The file's contents
+    """
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder('utf-8')(errors='replace'), translate=True
+    )
+    with open(fd, mode='rb', buffering=0) as f:
+        if size < POOLED_READ_THRESHOLD:
+            return decoder.decode(f.readall(), final=True)
+        
+        chunks = []
+        with _pooled_buffer() as buf, memoryview(buf) as view:
+            while True:
+                count = f.readinto(buf)
+                if not count:
+                    break
+                chunks.append(decoder.decode(view[:count]))
+        chunks.append(decoder.decode(b'', final=True))
+        return ''.join(chunks)
+
+
+# Line breaks as recognised by universal newlines mode
+_LINE_BREAK = re.compile(rb'\r\n?|\n')
+
+# Number of files whose line offsets are remembered
+LINE_INDEX_CACHE_SIZE = 32
+
+# Byte offset of the start of each line, keyed by file identity and version
+_line_index_cache: "OrderedDict[Tuple[int, int, int, int], array]" = OrderedDict()
+_line_index_lock = threading.Lock()
+
+
+# Reads of at most this many lines from the start of a file skip building the line index
+HEAD_READ_LINES = 1000
+
+
+def _count_lines(f: io.RawIOBase) -> int:
+    """
+    Count the lines in a file the way universal newlines mode splits them.
+    
+    The file is read through a pooled buffer and line breaks are counted with
+    bytearray.count, so no line objects are created.
+    
+    Args:
+        f: Unbuffered binary file positioned at the start
+        
+    Returns:
+        int: Number of lines in the file
+    """
+    total_lines = 0
+    last = None
+    with _pooled_buffer() as buf:
+        while True:
+            count = f.readinto(buf)
+            if not count:
+                break
+            # \r\n is one line break, and so are lone \r and \n
+            total_lines += buf.count(b'\n', 0, count) + buf.count(b'\r', 0, count) - buf.count(b'\r\n', 0, count)
+            if last == 0x0D and buf[0] == 0x0A:
+                # A \r\n split between chunks was counted twice
+                total_lines -= 1
+            last = buf[count - 1]
+    # A final line without a line break still counts
+    if last is not None and last not in (0x0A, 0x0D):
+        total_lines += 1
+    return total_lines
+
+
+def _cached_line_index(st: os.stat_result) -> Optional[array]:
+    """
+    Get a file's line index if it has already been built.
+    
+    Args:
+        st: Stat result for the file
+        
+    Returns:
+        Optional[array]: Byte offset of the start of each line, or None
+    """
+    key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+    with _line_index_lock:
+        starts = _line_index_cache.get(key)
+        if starts is not None:
+            _line_index_cache.move_to_end(key)
+        return starts
+
+
+def _line_index(fd: int, st: os.stat_result) -> array:
+    """
+    Get the byte offset of the start of each line in a file.
+    
+    The offsets are found with one scan of the memory-mapped file and cached
+    until the file's size or modification time changes.
+    
+    Args:
+        fd: Open file descriptor
+        st: Stat result for the file
+        
+    Returns:
+        array: Byte offset of the start of each line
+    """
+    starts = _cached_line_index(st)
+    if starts is not None:
+        return starts
+    
+    starts = array('q')
+    if st.st_size:
+        starts.append(0)
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            starts.extend(match.end() for match in _LINE_BREAK.finditer(mm))
+        # A trailing line break doesn't start another line
+        if starts[-1] == st.st_size:
+            starts.pop()
+    
+    with _line_index_lock:
+        _line_index_cache[(st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)] = starts
+        if len(_line_index_cache) > LINE_INDEX_CACHE_SIZE:
+            _line_index_cache.popitem(last=False)
+    return starts
+
+
+def _read_lines(path: Path, offset: int, limit: Optional[int]) -> Tuple[str, int, int, int]:
+    """
+    Read a range of lines from a file.
+    
+    Ranged reads use a cached index of line offsets to read only the bytes
+    of the requested lines. Whole-file reads skip line splitting entirely.
+    
+    Args:
+        path: Path of the file to read
+        offset: Number of lines to skip
+        limit: Maximum number of lines to return (all remaining lines if None)
+        
+    Returns:
+        Tuple[str, int, int, int]: The selected text, the index of the first
+            selected line, the number of selected lines, and the total number
+            of lines in the file
+        
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        _NotAFileError: If the path is not a regular file
+    """
+    fd, st = _open_file(path)
+    
+    if offset == 0 and limit is None:
+        content = _read_text(fd, st.st_size)
+        total_lines = content.count('\n')
+        if content and not content.endswith('\n'):
+            total_lines += 1
+        return content, 0, total_lines, total_lines
+    
+    if not hasattr(os, 'pread'):
+        with open(fd, mode='r', encoding='utf-8', errors='replace', buffering=READ_BUFFER_SIZE) as f:
+            start_line = sum(1 for _ in islice(f, offset))
+            lines = list(islice(f, limit))
+            total_lines = start_line + len(lines) + sum(1 for _ in f)
+        return ''.join(lines), start_line, len(lines), total_lines
+    
+    if offset == 0 and limit <= HEAD_READ_LINES and _cached_line_index(st) is None:
+        # Reading the head of a file doesn't need the index: count the lines
+        # in bulk, then read just the first few. The file that closes the
+        # descriptor is opened first, so it is closed even if counting fails
+        with open(fd, mode='r', encoding='utf-8', errors='replace', buffering=READ_BUFFER_SIZE) as f:
+            total_lines = _count_lines(f.buffer.raw)
+            f.seek(0)
+            lines = list(islice(f, limit))
+        return ''.join(lines), 0, len(lines), total_lines
+    
+    # Look up where the requested lines are and read just those bytes
+    try:
+        starts = _line_index(fd, st)
+        total_lines = len(starts)
+        start_line = min(offset, total_lines)
+        end_line = total_lines if limit is None else min(start_line + limit, total_lines)
+        begin = starts[start_line] if start_line < total_lines else st.st_size
+        end = starts[end_line] if end_line < total_lines else st.st_size
+        data = os.pread(fd, end - begin, begin) if end > begin else b''
+    finally:
+        os.close(fd)
+    
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder('utf-8')(errors='replace'), translate=True
+    )
+    return decoder.decode(data, final=True), start_line, end_line - start_line, total_lines
+
+
+# Kinds of ListDirTool pattern: a path without wildcards, a wildcard matched
+# against names in the directory, or a wildcard that reaches into subdirectories
+PATTERN_LITERAL = "literal"
+PATTERN_NAME = "name"
+PATTERN_DEEP = "deep"
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> Tuple[str, Optional[Callable[[str], Optional[re.Match]]]]:
+    """
+    Classify a ListDirTool pattern and compile it if it matches names.
+    
+    Args:
+        pattern: Glob pattern
+        
+    Returns:
+        Tuple[str, Optional[Callable[[str], Optional[re.Match]]]]: The kind of
+            pattern, and for PATTERN_NAME a function matching entry names
+    """
+    if not any(c in pattern for c in '*?['):
+        return PATTERN_LITERAL, None
+    if os.sep in pattern or '/' in pattern or '**' in pattern:
+        return PATTERN_DEEP, None
+    return PATTERN_NAME, re.compile(fnmatch.translate(pattern)).match
+
 
 class ReadFileArgs(BaseModel):
     """Arguments for the read_file tool."""
@@ -151,38 +470,13 @@ class ReadFileTool(Tool):
         logger.debug(f"Reading file: {path}")
         
         try:
-            # Check if file exists
-            if not path.exists():
-                raise ToolExecutionError(
-                    message=f"File does not exist: {file_path}",
-                    tool_name=self.name,
-                    original_error=None
-                )
-            
-            # Check if path is a file
-            if not path.is_file():
-                raise ToolExecutionError(
-                    message=f"Path is not a file: {file_path}",
-                    tool_name=self.name,
-                    original_error=None
-                )
-            
-            # Read file contents
-            async with aiofiles.open(path, mode='r', encoding='utf-8', errors='replace') as f:
-                lines = await f.readlines()
-            
-            # Apply offset and limit
-            total_lines = len(lines)
-            start_line = min(offset, total_lines)
-            
-            if limit is not None:
-                end_line = min(start_line + limit, total_lines)
-            else:
-                end_line = total_lines
-            
-            # Get the relevant lines
-            selected_lines = lines[start_line:end_line]
-            content = ''.join(selected_lines)
+            # Read the requested lines in a worker thread; a plain buffered read
+            # is much cheaper than going through aiofiles line by line
+            loop = asyncio.get_running_loop()
+            content, start_line, line_count, total_lines = await loop.run_in_executor(
+                None, _read_lines, path, offset or 0, limit
+            )
+            end_line = start_line + line_count
             
             # Create result
             result = FileContentsResult(
@@ -196,9 +490,18 @@ class ReadFileTool(Tool):
             logger.debug(f"Read {end_line - start_line} lines from {path}")
             return result
             
-        except ToolExecutionError:
-            # Re-raise ToolExecutionError
-            raise
+        except FileNotFoundError:
+            raise ToolExecutionError(
+                message=f"File does not exist: {file_path}",
+                tool_name=self.name,
+                original_error=None
+            ) from None
+        except (IsADirectoryError, _NotAFileError):
+            raise ToolExecutionError(
+                message=f"Path is not a file: {file_path}",
+                tool_name=self.name,
+                original_error=None
+            ) from None
         except Exception as e:
             raise ToolExecutionError(
                 message=f"Error reading file: {str(e)}",
@@ -247,7 +550,7 @@ class WriteFileTool(Tool):
                 path.parent.mkdir(parents=True, exist_ok=True)
             
             # Write to file
-            async with aiofiles.open(path, mode=mode, encoding='utf-8') as f:
+            async with aiofiles.open(path, mode=mode, encoding='utf-8', buffering=LARGE_BUFFER_SIZE) as f:
                 await f.write(content)
             
             logger.debug(f"Successfully wrote to {path}")
@@ -313,37 +616,71 @@ class ListDirTool(Tool):
                     original_error=None
                 )
             
-            # Get directory contents
+            # Get directory contents, filtering and describing entries in one pass.
+            # The values come straight from stat calls, so the models are built
+            # without validation.
             items = []
             
-            if pattern:
-                entries = list(path.glob(pattern))
-            else:
-                entries = list(path.iterdir())
-            
-            # Filter out hidden files if needed
-            if not include_hidden:
-                entries = [entry for entry in entries if not entry.name.startswith('.')]
+            kind, matches = _compile_pattern(pattern) if pattern else (None, None)
             
-            # Create FileInfo objects
-            for entry in entries:
-                try:
-                    stat = entry.stat()
-                    items.append(
-                        FileInfo(
-                            name=entry.name,
-                            path=str(entry),
-                            is_dir=entry.is_dir(),
-                            size=stat.st_size,
-                            last_modified=stat.st_mtime
+            if kind == PATTERN_LITERAL:
+                # A pattern without wildcards names at most one entry, which
+                # a single stat call can find
+                candidate = path / pattern
+                if include_hidden or not candidate.name.startswith('.'):
+                    try:
+                        entry_stat = candidate.stat()
+                        items.append(
+                            FileInfo.model_construct(
+                                name=candidate.name,
+                                path=str(candidate),
+                                is_dir=stat.S_ISDIR(entry_stat.st_mode),
+                                size=entry_stat.st_size,
+                                last_modified=entry_stat.st_mtime
+                            )
                         )
-                    )
-                except Exception:
-                    # Skip entries that can't be accessed
-                    continue
+                    except OSError:
+                        pass
+            else:
+                # Patterns that reach into subdirectories need a real glob. Otherwise
+                # scandir's entries know whether they are directories without another
+                # stat call, unlike Path objects.
+                deep = kind == PATTERN_DEEP
+                in_cwd = str(path) == '.'
+                
+                with (nullcontext(path.glob(pattern)) if deep else os.scandir(path)) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        if not include_hidden and name[0] == '.':
+                            continue
+                        if matches is not None and not matches(name):
+                            continue
+                    
+                        if deep:
+                            entry_path = str(entry)
+                        else:
+                            # Match str(path / name), which has no leading "./"
+                            entry_path = name if in_cwd else entry.path
+                        try:
+                            # Take the type from the same stat result; it follows
+                            # symlinks just like is_dir(), without another call
+                            # for symlinks and glob results
+                            entry_stat = entry.stat()
+                            items.append(
+                                FileInfo.model_construct(
+                                    name=name,
+                                    path=entry_path,
+                                    is_dir=stat.S_ISDIR(entry_stat.st_mode),
+                                    size=entry_stat.st_size,
+                                    last_modified=entry_stat.st_mtime
+                                )
+                            )
+                        except Exception:
+                            # Skip entries that can't be accessed
+                            continue
             
             # Create result
-            result = DirContentsResult(
+            result = DirContentsResult.model_construct(
                 items=items,
                 dir_path=str(path),
                 count=len(items)
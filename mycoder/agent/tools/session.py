@@ -5,11 +5,14 @@ This tool allows the agent to store and retrieve data
 across interactions and execution cycles.
 """
 
-import json
+import asyncio
+import atexit
 import os
+import weakref
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Set, Union
 
+import orjson
 from pydantic import BaseModel, Field, validator
 
 from .base import Tool
@@ -19,6 +22,38 @@ from .base import Tool
 _session_data: Dict[str, Dict[str, Any]] = {}
 _session_dir = None
 
+# Session file path for each session ID, valid until the directory changes
+_session_files: Dict[str, Path] = {}
+
+# Like the json module, accept non-string keys by converting them to strings
+_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+# Seconds to wait before writing changed sessions, so bursts of changes are written once
+FLUSH_INTERVAL = 0.1
+
+# Sessions changed since they were last written, and the task that will write them
+_dirty_sessions: Set[str] = set()
+_flush_task: Optional[asyncio.Task] = None
+
+# Hash of each session's contents as last written to disk
+_saved_digests: Dict[str, int] = {}
+
+# Encoded JSON of each session value, so unchanged values aren't encoded again on save
+_encoded_values: Dict[str, Dict[str, bytes]] = {}
+
+# Keys whose values callers hold a reference to and may change in place, so
+# their encoding can't be cached and is redone on every save
+_shared_keys: Dict[str, Set[str]] = {}
+
+# Values of these types can't change in place, so caching their encoding is always safe
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+
+# Session writes are serialized per shard, so different sessions can be written in parallel
+WRITE_SHARDS = 16
+_write_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, List[asyncio.Lock]]" = (
+    weakref.WeakKeyDictionary()
+)
+
 
 def set_session_directory(directory: str) -> None:
     """
@@ -31,6 +66,7 @@ def set_session_directory(directory: str) -> None:
     path = Path(directory)
     path.mkdir(parents=True, exist_ok=True)
     _session_dir = path
+    _session_files.clear()
 
 
 def _get_session_file(session_id: str) -> Path:
@@ -44,13 +80,18 @@ def _get_session_file(session_id: str) -> Path:
         Path: Path to the session file
     """
     global _session_dir
+    session_file = _session_files.get(session_id)
+    if session_file is not None:
+        return session_file
+    
     if _session_dir is None:
         # Default to .mycoder/sessions in user's home directory
         home = Path.home()
         _session_dir = home / ".mycoder" / "sessions"
         _session_dir.mkdir(parents=True, exist_ok=True)
     
-    return _session_dir / f"{session_id}.json"
+    session_file = _session_files[session_id] = _session_dir / f"{session_id}.json"
+    return session_file
 
 
 def _load_session(session_id: str) -> Dict[str, Any]:
@@ -70,13 +111,15 @@ def _load_session(session_id: str) -> Dict[str, Any]:
         return _session_data[session_id]
     
     # Otherwise, try to load from disk
+    _encoded_values.pop(session_id, None)
+    _shared_keys.pop(session_id, None)
     session_file = _get_session_file(session_id)
     if session_file.exists():
         try:
-            with open(session_file, 'r') as f:
-                _session_data[session_id] = json.load(f)
+            with open(session_file, 'rb') as f:
+                _session_data[session_id] = orjson.loads(f.read())
             return _session_data[session_id]
-        except (json.JSONDecodeError, IOError):
+        except (orjson.JSONDecodeError, IOError):
             pass
     
     # If not found or error, create a new empty session
@@ -84,24 +127,202 @@ def _load_session(session_id: str) -> Dict[str, Any]:
     return _session_data[session_id]
 
 
+def _encode_value(value: Any) -> bytes:
+    """
+    Encode a session value as it appears inside the indented session file.
+    
+    Args:
+        value: Value to encode
+        
+    Returns:
+        bytes: The value's JSON, indented to sit under a top-level key
+        
+    Raises:
+        TypeError: If the value is not JSON serializable
+    """
+    # JSON strings can't contain raw newlines, so this only touches indentation
+    return orjson.dumps(value, option=_JSON_OPTIONS | orjson.OPT_INDENT_2).replace(b'\n', b'\n  ')
+
+
+def _share_value(session_id: str, key: str, value: Any) -> None:
+    """
+    Note that a session value is being handed to code outside the session store.
+    
+    Mutable values may then be changed in place, so their cached encoding is
+    dropped and they are encoded afresh on every save from now on.
+    
+    Args:
+        session_id: Unique session identifier
+        key: Key of the value
+        value: The value being handed out
+    """
+    if not isinstance(value, _IMMUTABLE_TYPES):
+        _encoded_values.get(session_id, {}).pop(key, None)
+        _shared_keys.setdefault(session_id, set()).add(key)
+
+
+def _encode_session(session_id: str) -> bytes:
+    """
+    Encode a session as indented JSON, reusing the encoding of unchanged values.
+    
+    Args:
+        session_id: Unique session identifier
+        
+    Returns:
+        bytes: The session's JSON
+    """
+    encoded = _encoded_values.setdefault(session_id, {})
+    shared = _shared_keys.get(session_id, ())
+    parts = []
+    for key, value in _session_data[session_id].items():
+        fragment = encoded.get(key)
+        if fragment is None:
+            fragment = _encode_value(value)
+            if key not in shared:
+                encoded[key] = fragment
+        parts.append(b'  ' + orjson.dumps(key, option=_JSON_OPTIONS) + b': ' + fragment)
+    if not parts:
+        return b'{}'
+    return b'{\n' + b',\n'.join(parts) + b'\n}'
+
+
+def _write_session_file(session_file: Path, data: bytes) -> None:
+    """
+    Write a session file atomically.
+    
+    The data is written to a temporary file that then replaces the old one,
+    so a crash mid-write can't leave a truncated session behind.
+    
+    Args:
+        session_file: Path of the session file
+        data: Encoded session
+        
+    Raises:
+        OSError: If the file can't be written
+    """
+    temp_file = session_file.with_suffix('.json.tmp')
+    fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    os.replace(temp_file, session_file)
+
+
 def _save_session(session_id: str) -> None:
     """
     Save a session to disk.
     
+    Nothing is written if the session hasn't changed since it was last saved.
+    
     Args:
         session_id: Unique session identifier
     """
     global _session_data
     
     if session_id in _session_data:
-        session_file = _get_session_file(session_id)
+        data = _encode_session(session_id)
+        digest = hash(data)
+        if _saved_digests.get(session_id) == digest:
+            return
+        
+        try:
+            _write_session_file(_get_session_file(session_id), data)
+            _saved_digests[session_id] = digest
+        except IOError:
+            pass
+
+
+def _shard_locks() -> List[asyncio.Lock]:
+    """
+    Get the running event loop's session write locks.
+    
+    Returns:
+        List[asyncio.Lock]: One lock per shard
+    """
+    loop = asyncio.get_running_loop()
+    locks = _write_locks.get(loop)
+    if locks is None:
+        locks = _write_locks[loop] = [asyncio.Lock() for _ in range(WRITE_SHARDS)]
+    return locks
+
+
+async def _save_session_async(session_id: str) -> None:
+    """
+    Save a changed session to disk without blocking the event loop.
+    
+    The session is encoded on the event loop and written in a worker thread,
+    holding its shard's lock so two writes of one session can't overlap.
+    
+    Args:
+        session_id: Unique session identifier
+    """
+    async with _shard_locks()[hash(session_id) % WRITE_SHARDS]:
+        # Another flush may have written it while we waited for the lock
+        if session_id not in _dirty_sessions:
+            return
+        _dirty_sessions.discard(session_id)
+        if session_id not in _session_data:
+            return
+        
+        data = _encode_session(session_id)
+        digest = hash(data)
+        if _saved_digests.get(session_id) == digest:
+            return
+        
+        loop = asyncio.get_running_loop()
         try:
-            with open(session_file, 'w') as f:
-                json.dump(_session_data[session_id], f, indent=2)
+            await loop.run_in_executor(None, _write_session_file, _get_session_file(session_id), data)
+            _saved_digests[session_id] = digest
         except IOError:
             pass
 
 
+def _schedule_save(session_id: str) -> None:
+    """
+    Mark a session as changed and make sure it will be written to disk soon.
+    
+    Must be called from a running event loop.
+    
+    Args:
+        session_id: Unique session identifier
+    """
+    global _flush_task
+    
+    _dirty_sessions.add(session_id)
+    loop = asyncio.get_running_loop()
+    if _flush_task is None or _flush_task.done() or _flush_task.get_loop() is not loop:
+        _flush_task = loop.create_task(_flush_later())
+
+
+async def _flush_later() -> None:
+    """Write changed sessions to disk every FLUSH_INTERVAL until none are left."""
+    while _dirty_sessions:
+        await asyncio.sleep(FLUSH_INTERVAL)
+        await _flush_dirty()
+
+
+async def _flush_dirty() -> None:
+    """Write every changed session to disk, in parallel across shards."""
+    await asyncio.gather(*(_save_session_async(session_id) for session_id in list(_dirty_sessions)))
+
+
+def flush_sessions() -> None:
+    """
+    Write every changed session to disk now.
+    
+    This blocks, and is meant for when no event loop is running, such as at exit.
+    """
+    while _dirty_sessions:
+        _save_session(_dirty_sessions.pop())
+
+
+# Don't lose changes that were still waiting to be written
+atexit.register(flush_sessions)
+
+
 class StoreArgs(BaseModel):
     """Arguments for storing data in a session."""
     
@@ -227,6 +448,14 @@ class Session(Tool):
         else:
             return await self._list_keys(**kwargs)
     
+    async def flush(self) -> None:
+        """Write every changed session to disk without waiting for the next flush."""
+        await _flush_dirty()
+        # Wait for writes that other flushes already started
+        for lock in _shard_locks():
+            async with lock:
+                pass
+    
     async def _store(
         self, 
         session_id: str, 
@@ -247,18 +476,22 @@ class Session(Tool):
             dict: Result of the store operation
         """
         try:
-            # Ensure the value is JSON serializable
-            json.dumps(value)
+            # Encode the value now, which also checks it is JSON serializable,
+            # so saving the session doesn't have to encode it again
+            encoded = _encode_value(value)
             
             # Load the session
             session = _load_session(session_id)
             
-            # Store the value
+            # Store the value; the caller keeps a reference to it, so a mutable
+            # value's encoding may go stale and is only cached if it can't change
             session[key] = value
+            _encoded_values.setdefault(session_id, {})[key] = encoded
+            _share_value(session_id, key, value)
             
             # Persist to disk if requested
             if persist:
-                _save_session(session_id)
+                _schedule_save(session_id)
             
             return {
                 "success": True,
@@ -298,10 +531,12 @@ class Session(Tool):
             
             # Check if key exists
             if key in session:
+                value = session[key]
+                _share_value(session_id, key, value)
                 return {
                     "success": True,
                     "message": f"Retrieved data for key '{key}' from session '{session_id}'",
-                    "data": session[key]
+                    "data": value
                 }
             else:
                 return {
@@ -363,10 +598,12 @@ class Session(Tool):
             if key in session:
                 # Delete the key
                 del session[key]
+                _encoded_values.get(session_id, {}).pop(key, None)
+                _shared_keys.get(session_id, set()).discard(key)
                 
                 # Persist to disk if requested
                 if persist:
-                    _save_session(session_id)
+                    _schedule_save(session_id)
                 
                 return {
                     "success": True,
@@ -397,10 +634,12 @@ class Session(Tool):
         try:
             # Create a new empty session
             _session_data[session_id] = {}
+            _encoded_values.pop(session_id, None)
+            _shared_keys.pop(session_id, None)
             
             # Persist to disk if requested
             if persist:
-                _save_session(session_id)
+                _schedule_save(session_id)
             
             return {
                 "success": True,
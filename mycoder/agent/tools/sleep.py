@@ -5,12 +5,85 @@ This tool allows the agent to pause execution for a specified period.
 """
 
 import asyncio
-from typing import Optional
+import math
+import weakref
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field, validator
 
 from .base import Tool
 
+# Width of a timer wheel bucket in seconds; sleeps are rounded up to a bucket boundary
+BUCKET_SECONDS = 0.05
+
+# Sleeps shorter than this use asyncio.sleep directly, since rounding would distort them
+MIN_WHEEL_SECONDS = 0.1
+
+# Sleeps shorter than this return immediately
+MIN_SLEEP_SECONDS = 0.001
+
+
+class _TimerWheel:
+    """
+    Wakes sleepers in 50 ms buckets so concurrent sleeps share one timer.
+    
+    Each bucket is woken at an absolute loop time, so rounding never adds up
+    across repeated sleeps.
+    """
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        """
+        Initialize the wheel.
+        
+        Args:
+            loop: Event loop to schedule wake-ups on
+        """
+        self._loop = loop
+        self._buckets: Dict[int, List[asyncio.Future]] = {}
+    
+    def sleep(self, seconds: float) -> asyncio.Future:
+        """
+        Get a future that completes at least the given number of seconds from now.
+        
+        Args:
+            seconds: Number of seconds to sleep
+            
+        Returns:
+            asyncio.Future: Future completed when the sleeper's bucket is woken
+        """
+        bucket = math.ceil((self._loop.time() + seconds) / BUCKET_SECONDS)
+        waiter = self._loop.create_future()
+        sleepers = self._buckets.get(bucket)
+        if sleepers is None:
+            sleepers = self._buckets[bucket] = []
+            self._loop.call_at(bucket * BUCKET_SECONDS, self._wake, bucket)
+        sleepers.append(waiter)
+        return waiter
+    
+    def _wake(self, bucket: int) -> None:
+        """Complete every sleeper in a bucket that is still waiting."""
+        for waiter in self._buckets.pop(bucket, ()):
+            if not waiter.done():
+                waiter.set_result(None)
+
+
+# One wheel per event loop
+_timer_wheels: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _TimerWheel]" = weakref.WeakKeyDictionary()
+
+
+async def _wheel_sleep(seconds: float) -> None:
+    """
+    Sleep on the current event loop's timer wheel.
+    
+    Args:
+        seconds: Number of seconds to sleep
+    """
+    loop = asyncio.get_running_loop()
+    wheel = _timer_wheels.get(loop)
+    if wheel is None:
+        wheel = _timer_wheels[loop] = _TimerWheel(loop)
+    await wheel.sleep(seconds)
+
 
 class SleepArgs(BaseModel):
     """Arguments for the Sleep tool."""
@@ -64,5 +137,9 @@ class Sleep(Tool):
         Returns:
             dict: Confirmation message after sleeping
         """
-        await asyncio.sleep(seconds)
+        if seconds >= MIN_WHEEL_SECONDS:
+            await _wheel_sleep(seconds)
+        elif seconds >= MIN_SLEEP_SECONDS:
+            await asyncio.sleep(seconds)
+        # Shorter sleeps are below timer resolution, so don't yield to the loop at all
         return {"message": f"Slept for {seconds} seconds"} 
\ No newline at end of file
@@ -5,16 +5,86 @@ This module provides a tool for spawning subordinate agents to handle tasks conc
 """
 
 import asyncio
-import copy
+import functools
 import os
-import uuid
-from typing import Any, Dict, List, Optional, Union
+import secrets
+import stat
+import weakref
+from typing import Any, Coroutine, Dict, List, Optional, Union
 
 from pydantic import BaseModel, Field, field_validator
 
 from src.mycoder.agent.tools.base import Tool
 
 
+# Python 3.12+: starts a task by running its coroutine until it first suspends
+_eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+
+
+# Sub-agents allowed to run at once on an event loop; the rest wait their turn
+MAX_SUB_AGENTS = int(os.getenv("MYCODER_MAX_SUBAGENTS", "32"))
+_agent_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _agent_slot() -> asyncio.Semaphore:
+    """
+    Get the running event loop's sub-agent semaphore.
+    
+    Returns:
+        asyncio.Semaphore: Semaphore with MAX_SUB_AGENTS slots
+    """
+    loop = asyncio.get_running_loop()
+    slots = _agent_slots.get(loop)
+    if slots is None:
+        slots = _agent_slots[loop] = asyncio.Semaphore(MAX_SUB_AGENTS)
+    return slots
+
+
+def _create_eager_task(coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+    """
+    Create a task that starts running immediately where supported.
+    
+    A coroutine that finishes or fails before its first suspension then
+    completes without waiting for an event loop iteration. Only this task is
+    eager; the loop's task factory is left alone.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        asyncio.Task: The task running the coroutine
+    """
+    loop = asyncio.get_running_loop()
+    if _eager_task_factory is None:
+        return loop.create_task(coro)
+    return _eager_task_factory(loop, coro)
+
+
+@functools.lru_cache(maxsize=512)
+def _validate_working_dir(path: str) -> str:
+    """
+    Check that a sub-agent working directory exists and is a directory.
+    
+    Valid paths are cached, so spawning many sub-agents in one workspace
+    checks it once. Invalid paths raise and are checked again next time.
+    
+    Args:
+        path: Working directory path
+        
+    Returns:
+        str: The path, unchanged
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        raise ValueError(f"Working directory {path} does not exist") from None
+    if not stat.S_ISDIR(st.st_mode):
+        raise ValueError(f"{path} is not a directory")
+    return path
+
+
 class SubAgentArgs(BaseModel):
     """Arguments for running a sub-agent."""
     
@@ -44,11 +114,7 @@ class SubAgentArgs(BaseModel):
     @classmethod
     def validate_working_dir(cls, v):
         """Validate that the working directory exists."""
-        if not os.path.exists(v):
-            raise ValueError(f"Working directory {v} does not exist")
-        if not os.path.isdir(v):
-            raise ValueError(f"{v} is not a directory")
-        return v
+        return _validate_working_dir(v)
 
 
 class SubAgentResult(BaseModel):
@@ -80,10 +146,10 @@ class SubAgent(Tool):
         """Run a sub-agent with the given prompt and parameters."""
         try:
             # Generate a unique ID for this sub-agent
-            agent_id = str(uuid.uuid4())
+            agent_id = secrets.token_hex(8)
             
             # Create the task to run the agent
-            task = asyncio.create_task(self._run_agent(
+            task = _create_eager_task(self._run_agent(
                 agent_id=agent_id,
                 prompt=prompt,
                 working_dir=working_dir,
@@ -92,8 +158,11 @@ class SubAgent(Tool):
                 model=model
             ))
             
-            # Store the task
+            # Store the task, and forget it once it is done, failed or cancelled.
+            # An eager task may already be done here; the callback then runs on
+            # the next loop iteration, after it has been stored.
             self._running_agents[agent_id] = task
+            task.add_done_callback(lambda _: self._running_agents.pop(agent_id, None))
             
             # If wait is True, wait for the task to complete
             if wait:
@@ -130,8 +199,10 @@ class SubAgent(Tool):
         Execute the agent in a separate task.
         
         This internal method handles the actual execution of the sub-agent.
+        At most MAX_SUB_AGENTS sub-agents run at once; later ones wait for a
+        slot while reporting their status as running.
         """
-        try:
+        async with _agent_slot():
             # In a real implementation, this would import and use the Agent class
             # Here we're using a placeholder implementation
             
@@ -149,23 +220,11 @@ class SubAgent(Tool):
             # result = await agent.run(prompt, working_dir=working_dir)
             
             # For now, just return a simulated result
-            result = {
+            return {
                 "message": f"Executed sub-agent with prompt: {prompt[:50]}...",
                 "tools_used": tools or ["inherited tools"],
                 "working_dir": working_dir
             }
-            
-            # Remove from running agents when done
-            if agent_id in self._running_agents:
-                del self._running_agents[agent_id]
-            
-            return result
-            
-        except Exception as e:
-            # Remove from running agents on error
-            if agent_id in self._running_agents:
-                del self._running_agents[agent_id]
-            raise e
     
     async def get_status(self, agent_id: str) -> Dict[str, Any]:
         """Get the status of a running sub-agent."""
@@ -215,14 +274,14 @@ class SubAgent(Tool):
             except asyncio.CancelledError:
                 pass
             
-            del self._running_agents[agent_id]
+            self._running_agents.pop(agent_id, None)
             
             return {
                 "status": "success",
                 "message": f"Sub-agent {agent_id} cancelled"
             }
         else:
-            del self._running_agents[agent_id]
+            self._running_agents.pop(agent_id, None)
             
             return {
                 "status": "error",
@@ -5,17 +5,244 @@ This tool provides more sophisticated file editing capabilities
 beyond the basic read/write operations in file_ops.py.
 """
 
+import asyncio
+import functools
 import os
 import re
-from difflib import unified_diff
+import stat
+from difflib import SequenceMatcher
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 
-import aiofiles
 from pydantic import BaseModel, Field, validator
 
 from .base import Tool
 
+# Lines of unchanged context shown around each hunk, as in difflib's unified_diff
+DIFF_CONTEXT = 3
+
+# Characters compared at a time when looking for the edited region
+DIFF_SCAN_CHUNK = 4096
+
+
+def _validate_file_path(file_path: str) -> str:
+    """
+    Check that a path names an existing regular file, with a single stat.
+    
+    Args:
+        file_path: Path to check
+        
+    Returns:
+        str: The resolved path
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        raise ValueError(f"File does not exist: {file_path}") from None
+    if not stat.S_ISREG(st.st_mode):
+        raise ValueError(f"Path is not a file: {file_path}")
+    return str(Path(file_path).resolve())
+
+
+def _read_lines(file_path: str) -> List[str]:
+    """Read a file as a list of lines, keeping their line endings."""
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return file.readlines()
+
+
+def _write_lines(file_path: str, lines: List[str]) -> None:
+    """Write a list of lines, which carry their own line endings, to a file."""
+    with open(file_path, 'w', encoding='utf-8') as file:
+        file.writelines(lines)
+
+
+def _append_text(file_path: str, content: str) -> None:
+    """Append text to the end of a file."""
+    with open(file_path, 'a', encoding='utf-8') as file:
+        file.write(content)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_search(search: str, regex: bool, case_sensitive: bool) -> re.Pattern:
+    """
+    Compile a search for _replace, reusing patterns across calls.
+    
+    Args:
+        search: Text or pattern to search for
+        regex: Whether search is a regular expression rather than literal text
+        case_sensitive: Whether the search should be case sensitive
+        
+    Returns:
+        re.Pattern: The compiled search
+    """
+    flags = 0 if case_sensitive else re.IGNORECASE
+    return re.compile(search if regex else re.escape(search), flags)
+
+
+def _common_prefix_length(a: str, b: str, size: int) -> int:
+    """
+    Find how many leading characters two strings share.
+    
+    Whole chunks are compared first and the mismatching chunk is then
+    bisected, so the comparisons themselves stay in C.
+    
+    Args:
+        a: First string
+        b: Second string
+        size: Upper bound on the result
+        
+    Returns:
+        int: Length of the common prefix
+    """
+    start = 0
+    step = DIFF_SCAN_CHUNK
+    while step and start < size:
+        end = min(start + step, size)
+        if a[start:end] == b[start:end]:
+            start = end
+        else:
+            step //= 2
+    return start
+
+
+def _common_suffix_length(a: str, b: str, size: int) -> int:
+    """
+    Find how many trailing characters two strings share.
+    
+    Args:
+        a: First string
+        b: Second string
+        size: Upper bound on the result
+        
+    Returns:
+        int: Length of the common suffix
+    """
+    a_end, b_end = len(a), len(b)
+    start = 0
+    step = DIFF_SCAN_CHUNK
+    while step and start < size:
+        end = min(start + step, size)
+        if a[a_end - end:a_end - start] == b[b_end - end:b_end - start]:
+            start = end
+        else:
+            step //= 2
+    return start
+
+
+def _format_range(start: int, length: int) -> str:
+    """Format a hunk range the way difflib's unified_diff does."""
+    if length == 1:
+        return f'{start + 1}'
+    if not length:
+        return f'{start},0'
+    return f'{start + 1},{length}'
+
+
+def _split_lines(text: str) -> List[str]:
+    """Split text on newlines, without an empty entry for a final newline."""
+    lines = text.split('\n')
+    if not lines[-1]:
+        lines.pop()
+    return lines
+
+
+class _AnchoredMatcher(SequenceMatcher):
+    """SequenceMatcher whose opcodes are given rather than computed."""
+    
+    def __init__(self, opcodes: List[Tuple[str, int, int, int, int]]):
+        super().__init__()
+        self._opcodes = opcodes
+    
+    def get_opcodes(self) -> List[Tuple[str, int, int, int, int]]:
+        # get_grouped_opcodes edits the list it gets back
+        return list(self._opcodes)
+
+
+def _diff_edit(original: str, new: str, file_name: str) -> str:
+    """
+    Build a unified diff between two versions of a file.
+    
+    The lines that differ are found from the common prefix and suffix of the
+    two contents, and only those lines and their context are split. The
+    unchanged lines around them are always matched as they are, so an edit
+    inside a run of repeated lines shows up where it was made, with its full
+    context, instead of being realigned across the run.
+    
+    Args:
+        original: Content before the edit
+        new: Content after the edit
+        file_name: Name to show in the diff header
+        
+    Returns:
+        str: The diff, or an empty string if the contents are equal
+    """
+    size = min(len(original), len(new))
+    prefix = _common_prefix_length(original, new, size)
+    if prefix == len(original) == len(new):
+        return ''
+    suffix = _common_suffix_length(original, new, size - prefix)
+    delta = len(new) - len(original)
+    
+    # Widen the changed characters to whole lines
+    head = original.rfind('\n', 0, prefix) + 1
+    tail = original.find('\n', len(original) - suffix)
+    tail = len(original) if tail < 0 else tail + 1
+    removed = _split_lines(original[head:tail])
+    added = _split_lines(new[head:tail + delta])
+    
+    # Add the context lines on either side
+    start = head
+    for _ in range(DIFF_CONTEXT):
+        if not start:
+            break
+        start = original.rfind('\n', 0, start - 1) + 1
+    end = tail
+    for _ in range(DIFF_CONTEXT):
+        if end >= len(original):
+            break
+        end = original.find('\n', end)
+        end = len(original) if end < 0 else end + 1
+    before = _split_lines(original[start:head])
+    after = _split_lines(original[tail:end])
+    
+    # Lines that only look changed because they share a partial line with the edit
+    while removed and added and removed[0] == added[0]:
+        before.append(removed.pop(0))
+        added.pop(0)
+    while removed and added and removed[-1] == added[-1]:
+        after.insert(0, removed.pop())
+        added.pop()
+    if not removed and not added:
+        return ''
+    
+    # Match the context as it stands and let difflib align only the changed lines
+    anchor = len(before)
+    opcodes = [('equal', 0, anchor, 0, anchor)] if before else []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, removed, added, autojunk=False).get_opcodes():
+        opcodes.append((tag, anchor + i1, anchor + i2, anchor + j1, anchor + j2))
+    if after:
+        i, j = anchor + len(removed), anchor + len(added)
+        opcodes.append(('equal', i, i + len(after), j, j + len(after)))
+    
+    original_lines = before + removed + after
+    new_lines = before + added + after
+    offset = original.count('\n', 0, start)
+    
+    diff_lines = [f'--- a/{file_name}', f'+++ b/{file_name}']
+    for group in _AnchoredMatcher(opcodes).get_grouped_opcodes(DIFF_CONTEXT):
+        first, last = group[0], group[-1]
+        diff_lines.append(
+            f'@@ -{_format_range(offset + first[1], last[2] - first[1])} '
+            f'+{_format_range(offset + first[3], last[4] - first[3])} @@'
+        )
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                diff_lines.extend(' ' + line for line in original_lines[i1:i2])
+                continue
+            diff_lines.extend('-' + line for line in original_lines[i1:i2])
+            diff_lines.extend('+' + line for line in new_lines[j1:j2])
+    return '\n'.join(diff_lines)
+
 
 class ReplaceArgs(BaseModel):
     """Arguments for the replace operation."""
@@ -40,12 +267,7 @@ class ReplaceArgs(BaseModel):
     
     @validator('file_path')
     def validate_file_path(cls, v):
-        path = Path(v)
-        if not path.exists():
-            raise ValueError(f"File does not exist: {v}")
-        if not path.is_file():
-            raise ValueError(f"Path is not a file: {v}")
-        return str(path.resolve())
+        return _validate_file_path(v)
 
 
 class InsertArgs(BaseModel):
@@ -63,12 +285,7 @@ class InsertArgs(BaseModel):
     
     @validator('file_path')
     def validate_file_path(cls, v):
-        path = Path(v)
-        if not path.exists():
-            raise ValueError(f"File does not exist: {v}")
-        if not path.is_file():
-            raise ValueError(f"Path is not a file: {v}")
-        return str(path.resolve())
+        return _validate_file_path(v)
     
     @validator('position')
     def validate_position(cls, v):
@@ -89,12 +306,7 @@ class AppendArgs(BaseModel):
     
     @validator('file_path')
     def validate_file_path(cls, v):
-        path = Path(v)
-        if not path.exists():
-            raise ValueError(f"File does not exist: {v}")
-        if not path.is_file():
-            raise ValueError(f"Path is not a file: {v}")
-        return str(path.resolve())
+        return _validate_file_path(v)
 
 
 class EditResult(BaseModel):
@@ -174,47 +386,38 @@ class TextEditor(Tool):
             dict: Result of the editing operation
         """
         # Read the original file
-        async with aiofiles.open(file_path, 'r') as file:
-            content = await file.read()
-        
-        # Store original for diff
-        original_lines = content.splitlines()
+        content = await asyncio.to_thread(Path(file_path).read_text, encoding='utf-8')
         
         # Perform the search and replace
         if regex:
-            flags = 0 if case_sensitive else re.IGNORECASE
-            pattern = re.compile(search, flags)
+            pattern = _compile_search(search, True, case_sensitive)
             new_content, count = pattern.subn(replacement, content)
         else:
             if not case_sensitive:
-                # Use case-insensitive replace for non-regex
-                def replace_case_insensitive(text, old, new):
-                    """Case insensitive search and replace."""
-                    regex = re.compile(re.escape(old), re.IGNORECASE)
-                    return regex.sub(new, text)
-                
-                new_content, count = replace_case_insensitive(content, search, replacement), content.lower().count(search.lower())
+                # Use case-insensitive replace for non-regex, counting in the same pass.
+                # Backslashes are escaped so the replacement stays literal.
+                pattern = _compile_search(search, False, False)
+                new_content, count = pattern.subn(replacement.replace('\\', '\\\\'), content)
             else:
-                new_content = content.replace(search, replacement)
                 count = content.count(search)
+                new_content = content.replace(search, replacement) if count else content
+        
+        # Nothing matched, so there is nothing to write or diff
+        if count == 0:
+            return {
+                "success": False,
+                "changes": 0,
+                "diff": ""
+            }
         
-        # Only write if changes were made
-        if count > 0:
-            async with aiofiles.open(file_path, 'w') as file:
-                await file.write(new_content)
+        # Write the changes
+        await asyncio.to_thread(Path(file_path).write_text, new_content, encoding='utf-8')
         
         # Generate diff
-        new_lines = new_content.splitlines()
-        diff_lines = list(unified_diff(
-            original_lines, new_lines,
-            fromfile=f'a/{os.path.basename(file_path)}',
-            tofile=f'b/{os.path.basename(file_path)}',
-            lineterm=''
-        ))
-        diff = '\n'.join(diff_lines)
+        diff = _diff_edit(content, new_content, os.path.basename(file_path))
         
         return {
-            "success": count > 0,
+            "success": True,
             "changes": count,
             "diff": diff
         }
@@ -232,32 +435,34 @@ class TextEditor(Tool):
             dict: Result of the editing operation
         """
         # Read the original file
-        async with aiofiles.open(file_path, 'r') as file:
-            lines = await file.readlines()
-        
-        # Store original for diff
-        original_lines = [line.rstrip('\n') for line in lines]
+        lines = await asyncio.to_thread(_read_lines, file_path)
         
         # Position is 1-indexed, convert to 0-indexed
         position = min(position - 1, len(lines))
         
-        # Insert the content
+        # Keep the lines around the insertion point for the diff
+        start = max(position - DIFF_CONTEXT, 0)
+        original_lines = [line.rstrip('\n') for line in lines[start:position + DIFF_CONTEXT]]
+        
+        # Insert the content in place
         content_lines = content.split('\n')
-        new_lines = lines[:position] + [line + '\n' for line in content_lines] + lines[position:]
+        lines[position:position] = [line + '\n' for line in content_lines]
         
         # Write the file
-        async with aiofiles.open(file_path, 'w') as file:
-            await file.writelines(new_lines)
+        await asyncio.to_thread(_write_lines, file_path, lines)
         
-        # Generate diff
-        new_lines_stripped = [line.rstrip('\n') for line in new_lines]
-        diff_lines = list(unified_diff(
-            original_lines, new_lines_stripped,
-            fromfile=f'a/{os.path.basename(file_path)}',
-            tofile=f'b/{os.path.basename(file_path)}',
-            lineterm=''
-        ))
-        diff = '\n'.join(diff_lines)
+        # Generate diff; an insertion is always a single hunk, so it is built directly
+        file_name = os.path.basename(file_path)
+        split = position - start
+        diff = '\n'.join([
+            f'--- a/{file_name}',
+            f'+++ b/{file_name}',
+            f'@@ -{_format_range(start, len(original_lines))} '
+            f'+{_format_range(start, len(original_lines) + len(content_lines))} @@',
+            *(' ' + line for line in original_lines[:split]),
+            *('+' + line for line in content_lines),
+            *(' ' + line for line in original_lines[split:])
+        ])
         
         return {
             "success": True,
@@ -277,33 +482,20 @@ class TextEditor(Tool):
             dict: Result of the editing operation
         """
         # Read the original file
-        async with aiofiles.open(file_path, 'r') as file:
-            original_content = await file.read()
-        
-        # Store original for diff
-        original_lines = original_content.splitlines()
+        original_content = await asyncio.to_thread(Path(file_path).read_text, encoding='utf-8')
         
         # Append content, ensuring proper newline separation
         if original_content and not original_content.endswith('\n'):
             content = '\n' + content
         
         # Write the file
-        async with aiofiles.open(file_path, 'a') as file:
-            await file.write(content)
+        await asyncio.to_thread(_append_text, file_path, content)
         
-        # Read the updated file for diff
-        async with aiofiles.open(file_path, 'r') as file:
-            new_content = await file.read()
+        # The new content is already known, so there's no need to read it back
+        new_content = original_content + content
         
-        # Generate diff
-        new_lines = new_content.splitlines()
-        diff_lines = list(unified_diff(
-            original_lines, new_lines,
-            fromfile=f'a/{os.path.basename(file_path)}',
-            tofile=f'b/{os.path.basename(file_path)}',
-            lineterm=''
-        ))
-        diff = '\n'.join(diff_lines)
+        # Generate diff; only the tail of the file around the appended text is split
+        diff = _diff_edit(original_content, new_content, os.path.basename(file_path))
         
         # Count added lines
         content_lines = content.split('\n')
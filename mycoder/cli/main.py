@@ -5,14 +5,14 @@ This module defines the main CLI command group and handles the default command
 for running the AI agent with a prompt.
 """
 
+import asyncio
 import sys
+from importlib.metadata import version as package_version
 from pathlib import Path
 from typing import Optional
 
 import click
-import rich_click
 from rich.console import Console
-from rich.prompt import Prompt
 
 from src.mycoder.cli.options import add_shared_options, convert_options_to_settings_dict
 from src.mycoder.settings.config import Settings, load_settings
@@ -22,6 +22,25 @@ from src.mycoder.utils.logging import configure_logging, get_logger
 console = Console()
 
 
+def install_uvloop() -> bool:
+    """
+    Make new event loops use uvloop if it is installed.
+    
+    uvloop doesn't support Windows, so the default loop is kept there.
+    
+    Returns:
+        bool: Whether uvloop was installed
+    """
+    if sys.platform == "win32":
+        return False
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
 @click.group(invoke_without_command=True)
 @click.version_option(package_name="mycoder")
 @click.pass_context
@@ -32,6 +51,9 @@ def cli(ctx: click.Context) -> None:
     If no command is specified, the default behavior is to run the AI agent
     with the given prompt or interactively.
     """
+    # Every event loop the agent creates from here on runs on uvloop
+    install_uvloop()
+    
     # If we're not in a subcommand, invoke the default command
     if ctx.invoked_subcommand is None:
         # Create a new context for the default command
@@ -66,8 +88,7 @@ def default_command(
     logger = get_logger("mycoder.cli.default")
     
     # Log the version and startup information
-    import pkg_resources
-    version = pkg_resources.get_distribution("mycoder").version
+    version = package_version("mycoder")
     logger.info(f"MyCoder v{version} - AI-powered coding assistant")
     
     # Determine the prompt source
@@ -117,6 +138,9 @@ def get_prompt_source(
     
     # If interactive mode is enabled, prompt the user
     if settings.interactive:
+        # Only interactive sessions need the prompt widget
+        from rich.prompt import Prompt
+        
         try:
             interactive_prompt = Prompt.ask(
                 "[bold cyan]Enter your prompt[/bold cyan]", 
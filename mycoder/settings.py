@@ -1,39 +1,82 @@
+import functools
 import logging
 import os
+from dataclasses import dataclass
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
 class Settings:
-    """Settings for MyCoder application."""
+    """Settings for MyCoder application.
+
+    Settings are immutable, so one instance can be shared freely. Use
+    get_settings() to get the shared instance for an .env file.
+    """
+
+    __slots__ = (
+        'provider_type',
+        'default_model',
+        'anthropic_api_key',
+        'anthropic_base_url',
+        'workspace_dir'
+    )
+
+    # LLM provider settings
+    provider_type: str
+    default_model: str
+
+    # Anthropic settings
+    anthropic_api_key: str
+    anthropic_base_url: str
+
+    # Workspace settings
+    workspace_dir: str
+
+    @classmethod
+    def from_env(cls, env_file: str = '.env') -> 'Settings':
+        """Read settings from environment variables or .env file.
 
-    def __init__(self, env_file: str = '.env'):
-        """Initialize settings from environment variables or .env file.
-        
         Args:
             env_file: Path to .env file. Defaults to '.env'.
+
+        Returns:
+            Settings: The settings read from the environment
         """
-        self.logger = logging.getLogger(__name__)
-        
         # Load environment variables
         load_dotenv(dotenv_path=env_file)
-        
-        # LLM provider settings
-        self.provider_type = os.getenv('MYCODER_PROVIDER', 'anthropic')
-        self.default_model = os.getenv('MYCODER_DEFAULT_MODEL', 'claude-3-sonnet-20240229')
-        
-        # Anthropic settings
-        self.anthropic_api_key = os.getenv('ANTHROPIC_API_KEY', '')
-        self.anthropic_base_url = os.getenv('ANTHROPIC_BASE_URL', 'https://api.anthropic.com')
-        
-        # Workspace settings
-        self.workspace_dir = os.getenv('MYCODER_WORKSPACE_DIR', os.getcwd())
-        
+        env = os.environ
+
+        settings = cls(
+            provider_type=env.get('MYCODER_PROVIDER', 'anthropic'),
+            default_model=env.get('MYCODER_DEFAULT_MODEL', 'claude-3-sonnet-20240229'),
+            anthropic_api_key=env.get('ANTHROPIC_API_KEY', ''),
+            anthropic_base_url=env.get('ANTHROPIC_BASE_URL', 'https://api.anthropic.com'),
+            workspace_dir=env.get('MYCODER_WORKSPACE_DIR', os.getcwd())
+        )
+
         # Validate settings
-        self._validate_settings()
-    
+        settings._validate_settings()
+        return settings
+
     def _validate_settings(self):
         """Validate necessary settings."""
         if self.provider_type == 'anthropic' and not self.anthropic_api_key:
-            self.logger.warning('ANTHROPIC_API_KEY not set. Anthropic provider will not work.')
-        
+            logger.warning('ANTHROPIC_API_KEY not set. Anthropic provider will not work.')
+
         if not os.path.exists(self.workspace_dir):
-            self.logger.warning(f'Workspace directory {self.workspace_dir} does not exist.') 
\ No newline at end of file
+            logger.warning(f'Workspace directory {self.workspace_dir} does not exist.')
+
+
+@functools.lru_cache(maxsize=None)
+def get_settings(env_file: str = '.env') -> Settings:
+    """Get the shared settings for an .env file, reading them on first use.
+
+    Args:
+        env_file: Path to .env file. Defaults to '.env'.
+
+    Returns:
+        Settings: The shared settings
+    """
+    return Settings.from_env(env_file)
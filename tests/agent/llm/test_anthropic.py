@@ -0,0 +1,337 @@
+"""
+Tests for the Anthropic LLM provider.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import anthropic
+import httpx
+import pytest
+
+from mycoder.agent.llm import anthropic as anthropic_module
+from mycoder.agent.llm.anthropic import AnthropicConfig, AnthropicProvider
+from mycoder.agent.llm.base import Message, MessageRole
+from mycoder.agent.llm.exceptions import (
+    ContentFilterError,
+    ContextLengthExceededError,
+    ProviderAPIError,
+    ProviderRateLimitError,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Make sure each test starts with an empty response cache."""
+    anthropic_module._RESPONSE_CACHE.clear()
+    yield
+    anthropic_module._RESPONSE_CACHE.clear()
+
+
+@pytest.fixture
+def provider():
+    """Create an AnthropicProvider with a mocked API client."""
+    config = AnthropicConfig(api_key="test-key", model="claude-3-haiku-20240307")
+    provider = AnthropicProvider(config)
+    provider.client = SimpleNamespace(messages=SimpleNamespace(stream=MagicMock()))
+    return provider
+
+
+class FakeStream:
+    """Stand-in for the SDK's message stream that replays a final message."""
+
+    def __init__(self, message):
+        self.message = message
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    @property
+    async def text_stream(self):
+        for block in self.message.content:
+            if block.type == "text":
+                for word in block.text.split(" "):
+                    yield word + " "
+
+    async def get_final_message(self):
+        return self.message
+
+
+def make_api_response(*blocks):
+    """Build a fake Anthropic API stream from content blocks."""
+    return FakeStream(SimpleNamespace(
+        content=list(blocks),
+        usage=SimpleNamespace(input_tokens=10, output_tokens=5)
+    ))
+
+
+@pytest.fixture
+def messages():
+    """Create a list of test messages."""
+    return [
+        Message(role=MessageRole.SYSTEM, content="You are a helpful assistant."),
+        Message(role=MessageRole.USER, content="Hello, how are you?")
+    ]
+
+
+def test_format_messages(provider):
+    """System prompts are split out and empty or unlinked messages are dropped."""
+    formatted, system = provider.format_messages([
+        Message(role=MessageRole.SYSTEM, content="Be brief."),
+        Message(role=MessageRole.USER, content="List files"),
+        Message(role=MessageRole.ASSISTANT, content=""),
+        Message(role=MessageRole.TOOL, content="a.py", tool_call_id="toolu_1"),
+        Message(role=MessageRole.TOOL, content="orphan")
+    ])
+
+    assert system == "Be brief."
+    assert formatted == [
+        {"role": "user", "content": [{"type": "text", "text": "List files"}]},
+        {"role": "assistant", "content": [{"type": "tool_result", "tool_use_id": "toolu_1", "content": "a.py"}]}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_generate_text_response(provider, messages):
+    """Test generating a plain text response."""
+    provider.client.messages.stream.side_effect = lambda **kwargs: make_api_response(
+        SimpleNamespace(type="text", text="I'm fine, thanks!")
+    )
+
+    response = await provider.generate(messages)
+
+    assert response.message.role == MessageRole.ASSISTANT
+    assert response.message.content == "I'm fine, thanks!"
+    assert response.message.tool_calls is None
+    assert response.usage["total_tokens"] == 15
+
+    kwargs = provider.client.messages.stream.call_args.kwargs
+    assert kwargs["system"] == "You are a helpful assistant."
+    assert kwargs["messages"][0]["role"] == "user"
+
+
+@pytest.mark.asyncio
+async def test_generate_caches_deterministic_responses(provider, messages):
+    """Identical temperature 0 requests should only hit the API once."""
+    provider.client.messages.stream.side_effect = lambda **kwargs: make_api_response(
+        SimpleNamespace(type="text", text="Cached answer")
+    )
+
+    first = await provider.generate(messages, temperature=0)
+    second = await provider.generate(messages, temperature=0)
+
+    assert provider.client.messages.stream.call_count == 1
+    assert second.message.content == first.message.content
+
+    # Mutating a returned response must not affect the cached copy
+    second.message.content = "changed"
+    third = await provider.generate(messages, temperature=0)
+    assert third.message.content == "Cached answer"
+
+
+@pytest.mark.asyncio
+async def test_generate_skips_cache_for_sampled_requests(provider, messages):
+    """Requests with a non-zero temperature should never be cached."""
+    provider.client.messages.stream.side_effect = lambda **kwargs: make_api_response(
+        SimpleNamespace(type="text", text="Sampled answer")
+    )
+
+    await provider.generate(messages, temperature=0.7)
+    await provider.generate(messages, temperature=0.7)
+
+    assert provider.client.messages.stream.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_generate_does_not_cache_tool_calls(provider, messages):
+    """Responses containing tool calls should not be served from the cache."""
+    provider.client.messages.stream.side_effect = lambda **kwargs: make_api_response(
+        SimpleNamespace(type="tool_use", id="toolu_1", name="fetch", input={"url": "https://example.com"})
+    )
+
+    response = await provider.generate(messages, temperature=0)
+    await provider.generate(messages, temperature=0)
+
+    assert response.message.tool_calls[0].arguments == {"url": "https://example.com"}
+    assert provider.client.messages.stream.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_generate_marks_stable_prefix_for_prompt_caching(provider):
+    """Long system prompts and the tool list should carry cache_control markers."""
+    provider.client.messages.stream.side_effect = lambda **kwargs: make_api_response(
+        SimpleNamespace(type="text", text="ok")
+    )
+    system_prompt = "Follow the project conventions. " * 200
+    tools = [
+        {"name": "read_file", "description": "Read a file", "parameters": {}},
+        {"name": "write_file", "description": "Write a file", "parameters": {}}
+    ]
+
+    await provider.generate(
+        [
+            Message(role=MessageRole.SYSTEM, content=system_prompt),
+            Message(role=MessageRole.USER, content="Hi")
+        ],
+        tools=tools
+    )
+
+    kwargs = provider.client.messages.stream.call_args.kwargs
+    assert kwargs["system"] == [
+        {"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}
+    ]
+    assert "cache_control" not in kwargs["tools"][0]
+    assert kwargs["tools"][-1]["cache_control"] == {"type": "ephemeral"}
+
+
+def test_format_tools_is_memoized(provider):
+    """Formatted tool schemas should be reused for the same or an equal tool list."""
+    tools = [{"name": "read_file", "description": "Read a file", "parameters": {"type": "object"}}]
+
+    with patch.object(provider, "format_tool_for_anthropic", wraps=provider.format_tool_for_anthropic) as fmt:
+        first = provider._format_tools(tools)
+        second = provider._format_tools(tools)
+        rebuilt = provider._format_tools([dict(tools[0])])
+
+    assert first is second is rebuilt
+    assert fmt.call_count == 1
+    assert first[0]["input_schema"] == {"type": "object"}
+
+
+def test_count_tokens_is_memoized(provider):
+    """Repeated texts should only be counted by the SDK once."""
+    provider.client.count_tokens = MagicMock(return_value=7)
+    long_text = "word " * 1000
+
+    assert provider.count_tokens("Hello") == 7
+    assert provider.count_tokens("Hello") == 7
+    assert provider.count_tokens(long_text) == 7
+    assert provider.count_tokens(long_text) == 7
+    assert provider.count_tokens("") == 0
+
+    assert provider.client.count_tokens.call_count == 2
+
+
+def test_providers_share_client_per_api_key():
+    """Providers using the same API key should share one client and connection pool."""
+    first = AnthropicProvider(AnthropicConfig(api_key="shared-key"))
+    second = AnthropicProvider(AnthropicConfig(api_key="shared-key"))
+    other = AnthropicProvider(AnthropicConfig(api_key="other-key"))
+
+    assert first.client is second.client
+    assert first.client is not other.client
+
+
+def make_rate_limit_error():
+    """Build an Anthropic rate limit error."""
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    return anthropic.RateLimitError(
+        "rate limited", response=httpx.Response(429, request=request), body=None
+    )
+
+
+@pytest.mark.asyncio
+async def test_generate_retries_rate_limit_errors(provider, messages):
+    """Rate limit errors should be retried with backoff before succeeding."""
+    provider.client.messages.stream.side_effect = [
+        make_rate_limit_error(),
+        make_api_response(SimpleNamespace(type="text", text="Recovered"))
+    ]
+
+    with patch("asyncio.sleep", new=AsyncMock()) as mock_sleep:
+        response = await provider.generate(messages)
+
+    assert response.message.content == "Recovered"
+    assert provider.client.messages.stream.call_count == 2
+    mock_sleep.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_generate_gives_up_after_max_retries(provider, messages):
+    """Persistent rate limiting should surface as a ProviderRateLimitError."""
+    provider.config.max_retries = 2
+    provider.client.messages.stream.side_effect = make_rate_limit_error()
+
+    with patch("asyncio.sleep", new=AsyncMock()):
+        with pytest.raises(ProviderRateLimitError):
+            await provider.generate(messages)
+
+    assert provider.client.messages.stream.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_generate_stream_yields_partial_messages(provider, messages):
+    """Streaming should yield growing partial messages, ending with the full response."""
+    provider.client.messages.stream.side_effect = lambda **kwargs: make_api_response(
+        SimpleNamespace(type="text", text="Hello there"),
+        SimpleNamespace(type="tool_use", id="toolu_1", name="fetch", input={"url": "https://example.com"})
+    )
+
+    partials = [message async for message in provider.generate_stream(messages)]
+
+    assert [message.content for message in partials[:-1]] == ["Hello ", "Hello there "]
+    assert partials[-1].content == "Hello there"
+    assert partials[-1].tool_calls[0].name == "fetch"
+
+
+async def iterate(items):
+    """Yield items from an async iterator."""
+    for item in items:
+        yield item
+
+
+@pytest.mark.asyncio
+async def test_generate_batch_returns_results_in_request_order(provider, messages):
+    """Batch results should be polled for and mapped back to the caller's order."""
+    def succeeded(custom_id, text):
+        message = make_api_response(SimpleNamespace(type="text", text=text)).message
+        return SimpleNamespace(custom_id=custom_id, result=SimpleNamespace(type="succeeded", message=message))
+
+    batches = SimpleNamespace(
+        create=AsyncMock(return_value=SimpleNamespace(id="batch_1", processing_status="in_progress")),
+        retrieve=AsyncMock(return_value=SimpleNamespace(id="batch_1", processing_status="ended")),
+        results=AsyncMock(return_value=iterate([succeeded("1", "second"), succeeded("0", "first")]))
+    )
+    provider.client.messages.batches = batches
+
+    with patch("asyncio.sleep", new=AsyncMock()):
+        responses = await provider.generate_batch([
+            (messages, None, 0.0, None),
+            (messages, None, 0.5, 100)
+        ])
+
+    assert [response.message.content for response in responses] == ["first", "second"]
+    requests = batches.create.call_args.kwargs["requests"]
+    assert [request["custom_id"] for request in requests] == ["0", "1"]
+    assert requests[1]["params"]["max_tokens"] == 100
+    batches.retrieve.assert_awaited_once_with("batch_1")
+
+
+def make_bad_request_error(message):
+    """Build an Anthropic bad request error."""
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    return anthropic.BadRequestError(message, response=httpx.Response(400, request=request), body=None)
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("Prompt is too long: 210000 tokens > 200000 maximum", ContextLengthExceededError),
+    ("Output blocked by Content Policy", ContentFilterError),
+    ("messages: roles must alternate", ProviderAPIError)
+])
+def test_bad_request_errors_are_classified(provider, message, expected):
+    """Bad requests should map to the most specific error type."""
+    error = provider._translate_error(make_bad_request_error(message))
+
+    assert type(error) is expected
+    assert error.provider == "anthropic"
+
+
+def test_api_errors_are_translated_by_type(provider):
+    """API errors should map to provider errors and keep their status code."""
+    error = provider._translate_error(make_rate_limit_error())
+
+    assert type(error) is ProviderRateLimitError
+    assert error.status_code == 429
@@ -0,0 +1,29 @@
+"""
+Tests for the LLM base models.
+"""
+
+from mycoder.agent.llm.base import ToolCall
+
+
+def test_tool_call_arguments_json():
+    """Arguments should stay a dict, with a JSON encoding available on demand."""
+    tool_call = ToolCall(id="toolu_1", name="write_file", arguments={"path": "a.txt", "lines": [1, 2]})
+
+    assert tool_call.arguments == {"path": "a.txt", "lines": [1, 2]}
+    assert tool_call.arguments_json == '{"path":"a.txt","lines":[1,2]}'
+    assert "arguments_json" not in tool_call.model_dump()
+
+
+def test_tool_call_arguments_json_follows_changes():
+    """The JSON should reflect the arguments after they are replaced or edited."""
+    tool_call = ToolCall(id="toolu_1", name="write_file", arguments={"path": "a.txt"})
+    assert tool_call.arguments_json == '{"path":"a.txt"}'
+
+    tool_call.arguments["path"] = "b.txt"
+    assert tool_call.arguments_json == '{"path":"b.txt"}'
+
+    tool_call.arguments = {"path": "c.txt"}
+    assert tool_call.arguments_json == '{"path":"c.txt"}'
+
+    copy = tool_call.model_copy(update={"arguments": {"path": "d.txt"}})
+    assert copy.arguments_json == '{"path":"d.txt"}'
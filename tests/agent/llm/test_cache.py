@@ -0,0 +1,226 @@
+"""
+Tests for the LLM response cache.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from mycoder.agent.llm.base import LLMResponse, Message, MessageRole
+from mycoder.agent.llm.cache import (
+    INITIAL_INDEX_ROWS,
+    RedisResponseCache,
+    ResponseCache,
+    SemanticCache,
+    _VectorIndex,
+    make_cache_key,
+)
+
+
+def make_response(text: str) -> LLMResponse:
+    """Create a simple assistant response."""
+    return LLMResponse(message=Message(role=MessageRole.ASSISTANT, content=text))
+
+
+def test_make_cache_key_is_order_independent():
+    """Keys should not depend on dict insertion order."""
+    first = make_cache_key({"model": "m", "temperature": 0, "messages": [{"role": "user"}]})
+    second = make_cache_key({"messages": [{"role": "user"}], "temperature": 0, "model": "m"})
+
+    assert first == second
+    assert first != make_cache_key({"model": "other", "temperature": 0, "messages": [{"role": "user"}]})
+
+
+@pytest.mark.asyncio
+async def test_response_cache_get_and_set():
+    """Test storing and retrieving responses."""
+    cache = ResponseCache(maxsize=4)
+
+    assert await cache.get("missing") is None
+
+    await cache.set("key", make_response("hello"))
+    cached = await cache.get("key")
+
+    assert cached is not None
+    assert cached.message.content == "hello"
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_response_cache_evicts_least_recently_used():
+    """The least recently used entry should be evicted when the cache is full."""
+    cache = ResponseCache(maxsize=2)
+
+    await cache.set("a", make_response("a"))
+    await cache.set("b", make_response("b"))
+    await cache.get("a")
+    await cache.set("c", make_response("c"))
+
+    assert await cache.get("a") is not None
+    assert await cache.get("b") is None
+    assert await cache.get("c") is not None
+
+
+@pytest.mark.asyncio
+async def test_response_cache_expires_entries():
+    """Entries should be dropped once their TTL has passed."""
+    cache = ResponseCache(maxsize=4, ttl=10)
+
+    with patch("time.monotonic", return_value=100.0):
+        await cache.set("key", make_response("hello"))
+    with patch("time.monotonic", return_value=105.0):
+        assert await cache.get("key") is not None
+    with patch("time.monotonic", return_value=111.0):
+        assert await cache.get("key") is None
+    assert len(cache) == 0
+
+
+def keyword_embedding(text: str):
+    """Embed text as counts of a few keywords, for deterministic tests."""
+    words = text.lower().replace("?", "").split()
+    return [float(words.count(keyword)) for keyword in ("python", "rust", "weather", "capital")]
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_matches_similar_prompts():
+    """A paraphrased prompt should reuse the cached response."""
+    cache = SemanticCache(threshold=0.9, embed=keyword_embedding)
+    context = [Message(role=MessageRole.SYSTEM, content="You are helpful.")]
+
+    await cache.insert(
+        "model",
+        context + [Message(role=MessageRole.USER, content="What is Python?")],
+        make_response("A programming language.")
+    )
+
+    hit = await cache.lookup("model", context + [Message(role=MessageRole.USER, content="Tell me about Python")])
+    miss = await cache.lookup("model", context + [Message(role=MessageRole.USER, content="What is Rust?")])
+
+    assert hit is not None
+    assert hit.message.content == "A programming language."
+    assert miss is None
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_is_partitioned_by_namespace_and_context():
+    """Responses should not leak across models or conversation contexts."""
+    cache = SemanticCache(threshold=0.9, embed=keyword_embedding)
+    prompt = Message(role=MessageRole.USER, content="What is Python?")
+
+    await cache.insert("model-a", [prompt], make_response("cached"))
+
+    assert await cache.lookup("model-a", [prompt]) is not None
+    assert await cache.lookup("model-b", [prompt]) is None
+    assert await cache.lookup(
+        "model-a", [Message(role=MessageRole.SYSTEM, content="Be brief."), prompt]
+    ) is None
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_replaces_oldest_entry_when_full():
+    """Each scope should keep at most maxsize entries, dropping the oldest."""
+    cache = SemanticCache(threshold=0.9, maxsize=2, embed=keyword_embedding)
+
+    for topic in ("Python", "Rust", "weather"):
+        await cache.insert("model", [Message(role=MessageRole.USER, content=topic)], make_response(topic))
+
+    assert await cache.lookup("model", [Message(role=MessageRole.USER, content="Python")]) is None
+    rust = await cache.lookup("model", [Message(role=MessageRole.USER, content="Rust")])
+    weather = await cache.lookup("model", [Message(role=MessageRole.USER, content="weather")])
+    assert rust.message.content == "Rust"
+    assert weather.message.content == "weather"
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_drops_least_recently_used_scopes():
+    """A new context every turn should not grow the cache past max_scopes partitions."""
+    cache = SemanticCache(threshold=0.9, embed=keyword_embedding, max_scopes=3)
+    prompt = Message(role=MessageRole.USER, content="What is Python?")
+
+    def turn(number):
+        return [Message(role=MessageRole.SYSTEM, content=f"Turn {number}"), prompt]
+
+    await cache.insert("model", turn(0), make_response("turn 0"))
+    await cache.insert("model", turn(1), make_response("turn 1"))
+    assert await cache.lookup("model", turn(0)) is not None
+    await cache.insert("model", turn(2), make_response("turn 2"))
+    await cache.insert("model", turn(3), make_response("turn 3"))
+
+    # Turn 1 was the least recently used scope
+    assert await cache.lookup("model", turn(1)) is None
+    assert await cache.lookup("model", turn(0)) is not None
+
+    for number in range(4, 200):
+        await cache.insert("model", turn(number), make_response(f"turn {number}"))
+
+    assert len(cache._entries) == 3
+    assert (await cache.lookup("model", turn(199))).message.content == "turn 199"
+
+
+class FakeRedis:
+    """In-memory stand-in for a redis.asyncio client."""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.expiry[key] = ex
+
+
+@pytest.mark.asyncio
+async def test_redis_response_cache_round_trips_responses():
+    """Responses should be serialized to Redis with the configured TTL."""
+    client = FakeRedis()
+    cache = RedisResponseCache("redis://localhost", ttl=60, client=client)
+    key = make_cache_key({"model": "m"})
+
+    assert await cache.get(key) is None
+
+    await cache.set(key, make_response("hello"))
+    cached = await cache.get(key)
+
+    assert cached.message.content == "hello"
+    assert list(client.expiry.values()) == [60]
+
+
+@pytest.mark.asyncio
+async def test_redis_response_cache_treats_errors_as_misses():
+    """An unavailable Redis server should not fail the caller."""
+    class BrokenRedis:
+        async def get(self, key):
+            raise ConnectionError("down")
+
+        async def set(self, key, value, ex=None):
+            raise ConnectionError("down")
+
+    cache = RedisResponseCache("redis://localhost", client=BrokenRedis())
+    key = make_cache_key({"model": "m"})
+
+    await cache.set(key, make_response("hello"))
+    assert await cache.get(key) is None
+
+
+def test_vector_index_grows_matrix_as_it_fills():
+    """The NumPy index should start small, double as needed and keep its ring behaviour."""
+    np = pytest.importorskip("numpy")
+    index = _VectorIndex(maxsize=20)
+    vectors = [tuple(np.eye(20, dtype=np.float32)[i]) for i in range(20)]
+
+    index.add(vectors[0], make_response("0"))
+    assert index._matrix.shape == (INITIAL_INDEX_ROWS, 20)
+
+    for i in range(1, 20):
+        index.add(vectors[i], make_response(str(i)))
+    assert index._matrix.shape == (20, 20)
+
+    index.add(vectors[0], make_response("again"))
+    for i in range(1, 20):
+        score, response = index.best_match(vectors[i])
+        assert score == pytest.approx(1.0)
+        assert response.message.content == str(i)
+    assert index.best_match(vectors[0])[1].message.content == "again"
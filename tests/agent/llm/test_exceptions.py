@@ -0,0 +1,35 @@
+"""
+Tests for the LLM exceptions.
+"""
+
+import pickle
+
+from mycoder.agent.llm.exceptions import (
+    ContextLengthExceededError,
+    LLMError,
+    ProviderRateLimitError,
+)
+
+
+def test_error_message_includes_provider_and_model():
+    """The message should be prefixed with whatever context is available."""
+    assert str(LLMError("failed")) == "failed"
+    assert str(LLMError("failed", provider="anthropic")) == "[anthropic] failed"
+    assert str(LLMError("failed", provider="anthropic", model="claude")) == "[anthropic/claude] failed"
+
+
+def test_errors_round_trip_through_pickle():
+    """Slot attributes should survive pickling."""
+    rate_limit = pickle.loads(pickle.dumps(
+        ProviderRateLimitError("slow down", provider="anthropic", model="claude", status_code=429)
+    ))
+    context = pickle.loads(pickle.dumps(
+        ContextLengthExceededError("too long", provider="ollama", token_count=9000, max_tokens=8192)
+    ))
+
+    assert type(rate_limit) is ProviderRateLimitError
+    assert str(rate_limit) == "[anthropic/claude] slow down"
+    assert rate_limit.status_code == 429
+    assert rate_limit.details == {"status_code": 429}
+    assert context.token_count == 9000
+    assert context.max_tokens == 8192
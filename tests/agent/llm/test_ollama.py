@@ -2,14 +2,21 @@
 Tests for the Ollama LLM provider.
 """
 
+import asyncio
 import json
 import re
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
-from mycoder.agent.llm.base import Message, MessageRole
-from mycoder.agent.llm.ollama import OllamaConfig, OllamaProvider, OllamaResponse
+from mycoder.agent.llm.base import Message, MessageRole, ToolCall
+from mycoder.agent.llm.ollama import (
+    OllamaConfig,
+    OllamaProvider,
+    OllamaResponse,
+    extract_json_object,
+)
 
 
 @pytest.fixture
@@ -83,7 +90,7 @@ async def test_generate_text_response(ollama_provider, mock_http_client, mock_re
     """Test generating a text response."""
     # Set up mock response
     mock_post_response = MagicMock()
-    mock_post_response.json.return_value = mock_response
+    mock_post_response.content = json.dumps(mock_response).encode()
     mock_post_response.raise_for_status = MagicMock()
     mock_http_client.post.return_value = mock_post_response
     
@@ -101,11 +108,12 @@ async def test_generate_text_response(ollama_provider, mock_http_client, mock_re
     mock_http_client.post.assert_called_once()
     args, kwargs = mock_http_client.post.call_args
     assert args[0] == "/api/generate"
-    assert "model" in kwargs["json"]
-    assert kwargs["json"]["model"] == "llama3"
-    assert "prompt" in kwargs["json"]
-    assert "stream" in kwargs["json"]
-    assert not kwargs["json"]["stream"]  # Should not be streaming
+    payload = json.loads(kwargs["content"])
+    assert "model" in payload
+    assert payload["model"] == "llama3"
+    assert "prompt" in payload
+    assert "stream" in payload
+    assert not payload["stream"]  # Should not be streaming
 
 
 @pytest.mark.asyncio
@@ -132,7 +140,7 @@ async def test_generate_tool_call(ollama_provider, mock_http_client, messages):
     
     # Set up mock
     mock_post_response = MagicMock()
-    mock_post_response.json.return_value = tool_call_response
+    mock_post_response.content = json.dumps(tool_call_response).encode()
     mock_post_response.raise_for_status = MagicMock()
     mock_http_client.post.return_value = mock_post_response
     
@@ -228,4 +236,153 @@ async def test_format_tool_prompt(ollama_provider, messages):
     
     # Should include tool call and result
     assert "I need to use the fetch tool" in prompt
-    assert "Result from fetch" in prompt 
\ No newline at end of file
+    assert "Result from fetch" in prompt
+
+
+@pytest.mark.asyncio
+async def test_generate_coalesces_identical_deterministic_requests(ollama_provider, mock_response, messages):
+    """Concurrent identical temperature 0 requests should share one server request."""
+    async def slow_post(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return MagicMock(content=json.dumps(mock_response).encode())
+
+    ollama_provider._http_client = MagicMock(post=AsyncMock(side_effect=slow_post))
+
+    first, second = await asyncio.gather(
+        ollama_provider.generate(messages, temperature=0),
+        ollama_provider.generate(messages, temperature=0)
+    )
+    await ollama_provider.generate(messages, temperature=0.7)
+
+    assert first.message.content == second.message.content == mock_response["response"]
+    assert ollama_provider._http_client.post.await_count == 2
+    assert not ollama_provider._in_flight
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('Sure.\n```json\n{"name": "a", "arguments": {}}\n```', '{"name": "a", "arguments": {}}'),
+    ('```\n{"name": "a", "arguments": {"s": "} \\" {"}}\n```', '{"name": "a", "arguments": {"s": "} \\" {"}}'),
+    ('Calling {"name": "a", "arguments": {"x": 1}} now', '{"name": "a", "arguments": {"x": 1}}'),
+    ('```python\nprint(1)\n``` then {"name": "b", "arguments": {}}', '{"name": "b", "arguments": {}}'),
+    ("No tool call here", None),
+    ('{"name": "unterminated"', None)
+])
+def test_extract_json_object(text, expected):
+    """The first complete JSON object should be found, preferring fenced blocks."""
+    assert extract_json_object(text) == expected
+
+
+@pytest.mark.asyncio
+async def test_generate_stream_yields_partial_messages(ollama_provider, messages):
+    """Streamed NDJSON chunks should be yielded as growing partial messages."""
+    chunks = [
+        {"model": "llama3", "created_at": "2023-01-01T00:00:00Z", "response": "Hello", "done": False},
+        {"model": "llama3", "created_at": "2023-01-01T00:00:00Z", "response": " there", "done": False},
+        {"model": "llama3", "created_at": "2023-01-01T00:00:00Z", "response": "", "done": True, "eval_count": 2}
+    ]
+
+    def handler(request):
+        assert json.loads(request.content)["stream"] is True
+        body = "\n".join(json.dumps(chunk) for chunk in chunks) + "\n"
+        return httpx.Response(200, content=body.encode())
+
+    ollama_provider._http_client = httpx.AsyncClient(
+        base_url="http://localhost:11434", transport=httpx.MockTransport(handler)
+    )
+
+    partials = [message async for message in ollama_provider.generate_stream(messages)]
+
+    assert [message.content for message in partials] == ["Hello", "Hello there", "Hello there"]
+
+
+def test_tool_instruction_is_memoized(ollama_provider):
+    """Equal tool sets should reuse the same instruction string."""
+    tools = [{"name": "fetch", "description": "Fetch a URL", "parameters": {"type": "object"}}]
+
+    first = ollama_provider._generate_tool_instruction(tools)
+    second = ollama_provider._generate_tool_instruction([dict(tools[0])])
+
+    assert first is second
+    assert first.startswith(OllamaProvider.TOOL_INSTRUCTION_PREFIX)
+    assert 'Parameters: {\n  "type": "object"\n}' in first
+
+
+
+def test_format_prompt_formats_only_new_messages(ollama_provider):
+    """Each turn should format just the messages added since the last one."""
+    conversation = [
+        Message(role=MessageRole.USER, content="List files"),
+        Message(
+            role=MessageRole.ASSISTANT,
+            content="",
+            tool_calls=[ToolCall(id="call_1", name="list_dir", arguments={"path": "."})]
+        ),
+        Message(role=MessageRole.TOOL, content="a.py", tool_call_id="call_1"),
+        Message(role=MessageRole.USER, content="Thanks")
+    ]
+    first = ollama_provider._format_prompt(conversation)
+
+    for turn in range(3):
+        added = [
+            Message(role=MessageRole.ASSISTANT, content=f"Reply {turn}"),
+            Message(role=MessageRole.TOOL, content=f"again {turn}", tool_call_id="call_1")
+        ]
+        conversation += added
+        with patch.object(
+            OllamaProvider, "_format_message", wraps=OllamaProvider._format_message
+        ) as format_message:
+            prompt = ollama_provider._format_prompt(conversation)
+
+        assert [call.args[0] for call in format_message.call_args_list] == added
+        assert prompt.startswith(first[:-len("Assistant: ")])
+        assert prompt.endswith(f"Result from list_dir: again {turn}\nAssistant: ")
+
+
+def test_format_prompt_reformats_changed_messages(ollama_provider):
+    """Messages from the first changed one onwards should be formatted again."""
+    tool_call = ToolCall(id="call_1", name="read_file", arguments={"path": "a.py"})
+    conversation = [
+        Message(role=MessageRole.USER, content="Read a.py"),
+        Message(role=MessageRole.ASSISTANT, content="", tool_calls=[tool_call]),
+        Message(role=MessageRole.TOOL, content="print()", tool_call_id="call_1")
+    ]
+    ollama_provider._format_prompt(conversation)
+
+    tool_call.arguments["path"] = "b.py"
+    with patch.object(
+        OllamaProvider, "_format_message", wraps=OllamaProvider._format_message
+    ) as format_message:
+        prompt = ollama_provider._format_prompt(conversation)
+
+    assert [call.args[0] for call in format_message.call_args_list] == conversation[1:]
+    assert '"path": "b.py"' in prompt
+    assert prompt.endswith("Result from read_file: print()\nAssistant: ")
+
+
+@pytest.mark.asyncio
+async def test_generate_caches_deterministic_responses(ollama_provider, mock_response, messages):
+    """Repeated temperature 0 requests should be answered from the cache."""
+    ollama_provider._http_client = MagicMock(
+        post=AsyncMock(return_value=MagicMock(content=json.dumps(mock_response).encode()))
+    )
+
+    first = await ollama_provider.generate(messages, temperature=0)
+    second = await ollama_provider.generate(messages, temperature=0)
+
+    assert second.message.content == first.message.content
+    assert ollama_provider._http_client.post.await_count == 1
+
+
+@pytest.mark.parametrize("text, is_tool_call", [
+    ('```json\n{"name": "fetch", "arguments": {"url": "x"}}\n```', True),
+    ("Use `config = {\"debug\": true}` in settings.", False),
+    ('{"name": "fetch", "arguments": {"url": }}', False)
+])
+def test_parse_response_only_accepts_tool_call_objects(ollama_provider, text, is_tool_call):
+    """Only well-formed objects with a name and arguments should become tool calls."""
+    tools = [{"name": "fetch", "description": "Fetch a URL", "parameters": {}}]
+
+    message = ollama_provider._parse_response(text, tools)
+
+    assert bool(message.tool_calls) is is_tool_call
+    assert message.content == ("" if is_tool_call else text)
@@ -2,11 +2,12 @@
 Tests for the MCP client implementation.
 """
 
+import asyncio
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from mycoder.agent.mcp.client import MCPClient, MCPResource, MCPTool
+from mycoder.agent.mcp.client import MCPClient, MCPClientRegistry, MCPResource, MCPTool, _split_uri
 from mycoder.settings.config import MCPServer, MCPServerAuth
 
 
@@ -37,4 +38,84 @@ def test_mcp_client_init():
     
     with patch("mycoder.agent.mcp.client.aiohttp.ClientSession"):
         client = MCPClient(config)
-        assert client.server_config == config 
\ No newline at end of file
+        assert client.server_config == config 
+
+
+@pytest.mark.asyncio
+async def test_mcp_clients_share_session():
+    """Clients should reuse one HTTP session and leave it open on exit."""
+    auth = MCPServerAuth(type="bearer", token="test_token")
+    config = MCPServer(name="test", url="http://localhost:8080", auth=auth)
+
+    async with MCPClient(config) as first:
+        first_session = first._get_session()
+    async with MCPClient(config) as second:
+        second_session = second._get_session()
+
+    assert first_session is second_session
+    assert not first_session.closed
+
+    await MCPClient.aclose_shared()
+    assert first_session.closed
+
+
+def test_registry_reconnects_clients_on_a_new_event_loop():
+    """A client connected on a loop that has since closed should be replaced."""
+    auth = MCPServerAuth(type="bearer", token="test_token")
+    registry = MCPClientRegistry()
+    config = MCPServer(name="test", url="http://localhost:8080", auth=auth)
+
+    async def connect():
+        client = await registry.get(config)
+        return client, client._get_session()
+
+    async def connect_and_close():
+        connection = await connect()
+        await MCPClient.aclose_shared()
+        return connection
+
+    first_client, first_session = asyncio.run(connect())
+    second_client, second_session = asyncio.run(connect_and_close())
+
+    assert second_client is not first_client
+    assert second_session is not first_session
+
+
+@pytest.mark.asyncio
+async def test_bulk_get_resources_keeps_order_and_errors():
+    """Bulk fetches should return results in request order, with errors in place."""
+    auth = MCPServerAuth(type="bearer", token="test_token")
+    client = MCPClient(MCPServer(name="test", url="http://localhost:8080", auth=auth))
+
+    async def fake_get_resource(uri):
+        if uri == "file://missing":
+            raise ValueError("not found")
+        return MCPResource(uri=uri, content=uri.upper())
+
+    with patch.object(client, "get_resource", side_effect=fake_get_resource):
+        results = await client.bulk_get_resources(["file://a", "file://missing", "file://b"])
+
+    assert results[0].content == "FILE://A"
+    assert isinstance(results[1], ValueError)
+    assert results[2].content == "FILE://B"
+
+
+def test_basic_auth_headers_are_cached_and_copied():
+    """Basic auth headers should be encoded once and handed out as copies."""
+    auth = MCPServerAuth(type="basic", username="user", password="pass")
+    client = MCPClient(MCPServer(name="test", url="http://localhost:8080", auth=auth))
+
+    headers = client._get_auth_headers()
+    headers["Content-Type"] = "application/json"
+
+    assert client._get_auth_headers() == {"Authorization": "Basic dXNlcjpwYXNz"}
+
+
+@pytest.mark.parametrize("uri, expected", [
+    ("file://docs/readme.md", ("file", "docs/readme.md")),
+    ("db://a://b", ("db", "a://b")),
+    ("no-scheme", None)
+])
+def test_split_uri(uri, expected):
+    """URIs should split on the first scheme separator."""
+    assert _split_uri(uri) == expected
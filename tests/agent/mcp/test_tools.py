@@ -0,0 +1,258 @@
+"""
+Tests for the MCP agent tools.
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from mycoder.agent.mcp.client import AsyncLoopThread, MCPClientRegistry, MCPResource, MCPTool
+from mycoder.agent.mcp.tools import (
+    BatchGetMCPResourceTool,
+    GetMCPResourceTool,
+    ListMCPToolsTool,
+    get_mcp_tools,
+)
+from mycoder.agent.tools import close_mcp_tools, load_mcp_tools
+from mycoder.settings.config import MCPServer, MCPServerAuth, MCPSettings
+
+
+def make_settings(*names):
+    """Create MCP settings with one server per name."""
+    auth = MCPServerAuth(type="bearer", token="test_token")
+    return MCPSettings(servers=[
+        MCPServer(name=name, url=f"http://{name}:8080", auth=auth) for name in names
+    ])
+
+
+class FakeMCPClient:
+    """MCPClient stand-in whose behaviour is looked up by server name."""
+
+    behaviours = {}
+
+    instances = []
+
+    def __init__(self, server_config):
+        self.server_config = server_config
+        self.connected = False
+        self.instances.append(self)
+
+    async def __aenter__(self):
+        self.connected = True
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.connected = False
+        return False
+
+    async def _respond(self):
+        delay, result = self.behaviours[self.server_config.name]
+        await asyncio.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def list_tools(self):
+        return await self._respond()
+
+    async def get_resource(self, uri):
+        return await self._respond()
+
+
+@pytest.fixture
+def fake_client():
+    """Patch the MCP tools to use FakeMCPClient."""
+    with patch("mycoder.agent.mcp.client.MCPClient", FakeMCPClient):
+        yield FakeMCPClient.behaviours
+    FakeMCPClient.behaviours = {}
+    FakeMCPClient.instances = []
+
+
+@pytest.mark.asyncio
+async def test_list_tools_queries_servers_concurrently(fake_client):
+    """Tools from every reachable server should be listed, skipping failed servers."""
+    fake_client.update({
+        "a": (0.05, [MCPTool(uri="a://one", name="one")]),
+        "b": (0.05, ValueError("down")),
+        "c": (0.05, [MCPTool(uri="c://two", name="two")])
+    })
+    tool = ListMCPToolsTool(make_settings("a", "b", "c"))
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    tools = await tool.run()
+
+    assert [(t["name"], t["server"]) for t in tools] == [("one", "a"), ("two", "c")]
+    assert loop.time() - started < 0.12
+
+
+@pytest.mark.asyncio
+async def test_get_resource_returns_first_server_that_has_it(fake_client):
+    """The resource should come from the first server to answer successfully."""
+    fake_client.update({
+        "a": (0.0, ValueError("not found")),
+        "b": (0.01, MCPResource(uri="file://x", content="from b")),
+        "c": (5.0, MCPResource(uri="file://x", content="from c"))
+    })
+    tool = GetMCPResourceTool(make_settings("a", "b", "c"))
+
+    result = await asyncio.wait_for(tool.run(uri="file://x"), timeout=1)
+
+    assert result["server"] == "b"
+    assert result["content"] == "from b"
+
+
+@pytest.mark.asyncio
+async def test_tools_share_connected_clients(fake_client):
+    """MCP tools should connect to each server once and reuse the client."""
+    fake_client.update({"a": (0.0, [MCPTool(uri="a://one", name="one")])})
+    registry = MCPClientRegistry()
+    list_tools = next(t for t in get_mcp_tools(make_settings("a"), registry) if t.name == "list_mcp_tools")
+
+    await list_tools.run()
+    await list_tools.run()
+
+    assert len(FakeMCPClient.instances) == 1
+    assert FakeMCPClient.instances[0].connected
+
+    await registry.shutdown()
+    assert not FakeMCPClient.instances[0].connected
+
+
+@pytest.mark.asyncio
+async def test_close_mcp_tools_shuts_down_loaded_registries():
+    """Closing the MCP tools should disconnect the registry load_mcp_tools created."""
+    tools = load_mcp_tools(SimpleNamespace(mcp=make_settings("a")))
+    registry = next(t for t in tools if t.name == "list_mcp_tools").registry
+    assert registry.loop_thread is not None and registry.loop_thread.is_alive()
+
+    with patch.object(registry, "shutdown", AsyncMock()) as shutdown:
+        await close_mcp_tools()
+        await close_mcp_tools()
+
+    shutdown.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_tool_listings_are_cached_until_refreshed(fake_client):
+    """Listings should be served from the cache until refresh_mcp_cache is run."""
+    fake_client.update({"a": (0.0, [MCPTool(uri="a://one", name="one")])})
+    tools = {t.name: t for t in get_mcp_tools(make_settings("a"))}
+
+    await tools["list_mcp_tools"].run()
+    fake_client["a"] = (0.0, [MCPTool(uri="a://two", name="two")])
+    cached = await tools["list_mcp_tools"].run()
+    await tools["refresh_mcp_cache"].run(server="a")
+    refreshed = await tools["list_mcp_tools"].run()
+
+    assert [t["name"] for t in cached] == ["one"]
+    assert [t["name"] for t in refreshed] == ["two"]
+
+
+@pytest.mark.asyncio
+async def test_batch_get_resource_dedupes_and_reports_errors(fake_client):
+    """Batched fetches should run once per (server, uri) and keep the request order."""
+    calls = []
+
+    async def get_resource(self, uri):
+        calls.append(uri)
+        if uri == "file://missing":
+            raise ValueError("not found")
+        return MCPResource(uri=uri, content=uri)
+
+    tool = BatchGetMCPResourceTool(make_settings("a"))
+    with patch.object(FakeMCPClient, "get_resource", get_resource):
+        results = await tool.run(items=[
+            {"uri": "file://x"},
+            {"uri": "file://missing"},
+            {"uri": "file://x"}
+        ])
+
+    assert sorted(calls) == ["file://missing", "file://x"]
+    assert results[0] == results[2]
+    assert results[0]["content"] == "file://x"
+    assert "not found" in results[1]["error"].lower()
+
+
+@pytest.mark.asyncio
+async def test_registry_runs_client_io_on_loop_thread(fake_client):
+    """With a loop thread, client calls should run there rather than on the caller's loop."""
+    threads = []
+
+    async def list_tools(self):
+        threads.append(threading.current_thread())
+        return [MCPTool(uri="a://one", name="one")]
+
+    loop_thread = AsyncLoopThread()
+    loop_thread.start()
+    try:
+        tool = ListMCPToolsTool(make_settings("a"), MCPClientRegistry(loop_thread=loop_thread))
+        with patch.object(FakeMCPClient, "list_tools", list_tools):
+            tools = await tool.run()
+    finally:
+        loop_thread.stop()
+
+    assert [t["name"] for t in tools] == ["one"]
+    assert threads == [loop_thread]
+
+
+@pytest.mark.asyncio
+async def test_unknown_server_fails_fast(fake_client):
+    """Naming a server that isn't configured should be an error, not an empty result."""
+    tool = ListMCPToolsTool(make_settings("a"))
+
+    with pytest.raises(Exception, match="Unknown MCP server: b"):
+        await tool.run(server="b")
+
+
+@pytest.mark.asyncio
+async def test_list_tools_pages_with_cursor(fake_client):
+    """With a limit, tools should be returned a page at a time across servers."""
+    fake_client.update({
+        "a": (0.0, [MCPTool(uri="a://one", name="one"), MCPTool(uri="a://two", name="two")]),
+        "b": (0.0, [MCPTool(uri="b://three", name="three")])
+    })
+    tool = ListMCPToolsTool(make_settings("a", "b"))
+
+    first = await tool.run(limit=2)
+    second = await tool.run(cursor=first["next_cursor"], limit=2)
+
+    assert [t["name"] for t in first["items"]] == ["one", "two"]
+    assert [(t["name"], t["server"]) for t in second["items"]] == [("three", "b")]
+    assert second["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_not_found_error_is_not_wrapped_twice(fake_client):
+    """A missing resource should surface as a single, unwrapped tool error."""
+    fake_client.update({"a": (0.0, ValueError("not found"))})
+    tool = GetMCPResourceTool(make_settings("a"))
+
+    with pytest.raises(Exception) as excinfo:
+        await tool.run(uri="file://x")
+
+    assert str(excinfo.value) == "Resource not found: file://x (Tool: get_mcp_resource)"
+
+
+@pytest.mark.asyncio
+async def test_get_resource_prefers_config_order_on_ties(fake_client):
+    """Servers answering together should resolve in the order they are configured."""
+    fake_client.update({
+        "a": (0.0, ValueError("not found")),
+        "b": (0.0, MCPResource(uri="file://x", content="from b")),
+        "c": (0.0, MCPResource(uri="file://x", content="from c"))
+    })
+    tool = GetMCPResourceTool(make_settings("a", "b", "c"))
+
+    result = await tool.run(uri="file://x")
+
+    assert result["server"] == "b"
+
+
+def test_mcp_tools_have_no_instance_dict():
+    """MCP tools should keep their state in slots rather than a per-instance dict."""
+    for tool in get_mcp_tools(make_settings("a")):
+        assert not hasattr(tool, "__dict__"), type(tool).__name__
@@ -0,0 +1,255 @@
+"""
+Tests for the file operation tools.
+"""
+
+import asyncio
+import os
+from unittest.mock import patch
+
+import pytest
+
+# The tools raise the error class from the package's own src.mycoder imports
+from src.mycoder.utils.errors import ToolExecutionError
+
+from mycoder.agent.tools import file_ops
+from mycoder.agent.tools.file_ops import DirContentsResult, ListDirTool, ReadFileTool, WriteFileTool
+
+
+@pytest.fixture
+def numbered_file(tmp_path):
+    """Create a file with ten numbered lines."""
+    path = tmp_path / "numbers.txt"
+    path.write_text("".join(f"line {i}\n" for i in range(10)))
+    return path
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("offset, limit, content, start_line, end_line", [
+    (0, 2, "line 0\nline 1\n", 0, 1),
+    (8, 5, "line 8\nline 9\n", 8, 9),
+    (0, None, "".join(f"line {i}\n" for i in range(10)), 0, 9),
+    (20, 3, "", 10, 10)
+])
+async def test_read_file_slices_lines(numbered_file, offset, limit, content, start_line, end_line):
+    """Only the requested lines should be returned, with the file's total line count."""
+    result = await ReadFileTool().run(str(numbered_file), offset=offset, limit=limit)
+
+    assert result.content == content
+    assert result.total_lines == 10
+    assert (result.start_line, result.end_line) == (start_line, end_line)
+
+
+@pytest.mark.asyncio
+async def test_read_file_missing(tmp_path):
+    """Reading a missing file should fail with a tool error."""
+    with pytest.raises(ToolExecutionError, match="File does not exist"):
+        await ReadFileTool().run(str(tmp_path / "missing.txt"))
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="FIFOs are not supported on this platform")
+async def test_read_file_rejects_non_files(tmp_path):
+    """Directories and FIFOs should be rejected without blocking."""
+    fifo = tmp_path / "pipe"
+    os.mkfifo(fifo)
+
+    for path in (tmp_path, fifo):
+        with pytest.raises(ToolExecutionError, match="Path is not a file"):
+            await asyncio.wait_for(ReadFileTool().run(str(path)), timeout=5)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("text, total_lines", [
+    ("", 0),
+    ("one", 1),
+    ("one\ntwo\n", 2),
+    ("one\r\ntwo", 2)
+])
+async def test_read_whole_file_counts_lines(tmp_path, text, total_lines):
+    """Whole-file reads should count lines the same way as ranged reads."""
+    path = tmp_path / "file.txt"
+    path.write_bytes(text.encode())
+
+    whole = await ReadFileTool().run(str(path))
+    ranged = await ReadFileTool().run(str(path), limit=100)
+
+    assert whole.content == ranged.content == text.replace("\r\n", "\n")
+    assert whole.total_lines == ranged.total_lines == total_lines
+    assert whole.end_line == ranged.end_line
+
+
+@pytest.mark.asyncio
+async def test_write_file_round_trips(tmp_path):
+    """Written content should be readable back, creating parent directories."""
+    path = tmp_path / "nested" / "out.txt"
+
+    assert await WriteFileTool().run(str(path), "hello\n")
+    assert await WriteFileTool().run(str(path), "again\n", mode="a")
+
+    assert path.read_text() == "hello\nagain\n"
+
+
+@pytest.mark.asyncio
+async def test_read_large_file_through_pooled_buffer(tmp_path):
+    """Multi-byte characters and CRLFs split across buffer chunks should decode intact."""
+    path = tmp_path / "large.txt"
+    # 5-byte lines: the first chunk ends inside "é", the second between "\r" and "\n"
+    path.write_bytes("aé\r\n".encode() * 1_000_000)
+
+    result = await ReadFileTool().run(str(path))
+
+    assert result.content == "aé\n" * 1_000_000
+    assert result.total_lines == 1_000_000
+
+
+@pytest.mark.asyncio
+async def test_ranged_reads_reuse_line_index_until_file_changes(numbered_file):
+    """Line offsets should be scanned once per file version."""
+    tool = ReadFileTool()
+
+    with patch.object(file_ops, "_LINE_BREAK", wraps=file_ops._LINE_BREAK) as line_break:
+        first = await tool.run(str(numbered_file), offset=3, limit=1)
+        second = await tool.run(str(numbered_file), offset=7, limit=2)
+        assert line_break.finditer.call_count == 1
+
+        numbered_file.write_text("a\rb\r\nc\n")
+        changed = await tool.run(str(numbered_file), offset=1, limit=5)
+        assert line_break.finditer.call_count == 2
+
+    assert first.content == "line 3\n"
+    assert second.content == "line 7\nline 8\n"
+    assert changed.content == "b\nc\n"
+    assert changed.total_lines == 3
+
+
+@pytest.fixture
+def listing_dir(tmp_path):
+    """Create a directory with files, a hidden file and a subdirectory."""
+    (tmp_path / "a.py").write_text("print(1)\n")
+    (tmp_path / "b.txt").write_text("b")
+    (tmp_path / ".hidden").write_text("h")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "c.py").write_text("")
+    return tmp_path
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("pattern, include_hidden, expected", [
+    (None, False, ["a.py", "b.txt", "sub"]),
+    (None, True, [".hidden", "a.py", "b.txt", "sub"]),
+    ("*.py", False, ["a.py"]),
+    ("**/*.py", False, ["a.py", "c.py"])
+])
+async def test_list_dir_filters_entries(listing_dir, pattern, include_hidden, expected):
+    """Entries should be filtered by pattern and visibility."""
+    result = await ListDirTool().run(str(listing_dir), pattern=pattern, include_hidden=include_hidden)
+
+    assert sorted(item.name for item in result.items) == expected
+    assert result.count == len(expected)
+
+
+@pytest.mark.asyncio
+async def test_list_dir_reports_entry_details(listing_dir, monkeypatch):
+    """Each entry should carry its path, type and size, relative to the listed path."""
+    monkeypatch.chdir(listing_dir)
+
+    result = await ListDirTool().run(".")
+
+    items = {item.name: item for item in result.items}
+    assert items["a.py"].path == "a.py"
+    assert items["a.py"].size == 9
+    assert not items["a.py"].is_dir
+    assert items["sub"].is_dir
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("pattern, expected", [
+    ("a.py", ["a.py"]),
+    ("sub/c.py", ["c.py"]),
+    ("sub", ["sub"]),
+    ("missing.py", []),
+    (".hidden", [])
+])
+async def test_list_dir_literal_pattern(listing_dir, pattern, expected):
+    """A pattern without wildcards should find just the named entry, if it exists."""
+    with patch.object(file_ops.os, "scandir") as scandir:
+        result = await ListDirTool().run(str(listing_dir), pattern=pattern)
+
+    scandir.assert_not_called()
+    assert [item.name for item in result.items] == expected
+    assert all(item.path == str(listing_dir / pattern) for item in result.items)
+
+
+@pytest.mark.asyncio
+async def test_list_dir_result_is_valid(listing_dir):
+    """Results built without validation should still pass validation."""
+    result = await ListDirTool().run(str(listing_dir), include_hidden=True)
+
+    assert DirContentsResult.model_validate(result.model_dump()) == result
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("pattern", [None, "*", "**/*"])
+async def test_list_dir_follows_symlinks(listing_dir, pattern):
+    """Symlinks should be described by their targets, as before."""
+    (listing_dir / "link").symlink_to(listing_dir / "sub")
+
+    result = await ListDirTool().run(str(listing_dir), pattern=pattern)
+
+    items = {item.name: item for item in result.items}
+    assert items["link"].is_dir
+    assert items["link"].size == (listing_dir / "sub").stat().st_size
+
+
+@pytest.mark.parametrize("pattern, kind", [
+    ("README.md", file_ops.PATTERN_LITERAL),
+    ("sub/c.py", file_ops.PATTERN_LITERAL),
+    ("*.py", file_ops.PATTERN_NAME),
+    ("[ab].txt", file_ops.PATTERN_NAME),
+    ("sub/*.py", file_ops.PATTERN_DEEP),
+    ("**/*.py", file_ops.PATTERN_DEEP)
+])
+def test_compile_pattern_kinds(pattern, kind):
+    """Patterns should be classified once and cached."""
+    assert file_ops._compile_pattern(pattern)[0] == kind
+    assert file_ops._compile_pattern(pattern) is file_ops._compile_pattern(pattern)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("unit, lines, head", [
+    # 3-byte lines put a "\r\n" across the first 2 MiB chunk boundary
+    (b"a\r\n", 1_000_000, "a\na\n"),
+    (b"a\rb\n", 2_000_000, "a\nb\n"),
+    (b"a\n", 1_000_000, "a\na\n")
+])
+async def test_head_read_counts_lines_in_bulk(tmp_path, unit, lines, head):
+    """Reading the first lines should count every line without building the index."""
+    path = tmp_path / "large.txt"
+    path.write_bytes(unit * 1_000_000 + b"tail")
+
+    with patch.object(file_ops, "_line_index") as line_index:
+        result = await ReadFileTool().run(str(path), limit=2)
+
+    line_index.assert_not_called()
+    assert result.content == head
+    assert result.total_lines == lines + 1
+
+
+@pytest.mark.asyncio
+async def test_head_read_closes_file_when_counting_fails(numbered_file):
+    """A failed head read shouldn't leave the file open."""
+    fds = []
+    open_file = file_ops._open_file
+
+    def record_open(path):
+        fd, st = open_file(path)
+        fds.append(fd)
+        return fd, st
+
+    with patch.object(file_ops, "_open_file", record_open), \
+            patch.object(file_ops, "_count_lines", side_effect=OSError("read failed")):
+        with pytest.raises(ToolExecutionError, match="read failed"):
+            await ReadFileTool().run(str(numbered_file), limit=2)
+
+    with pytest.raises(OSError):
+        os.fstat(fds[0])
@@ -0,0 +1,125 @@
+"""
+Tests for how the Session tool keeps sessions on disk.
+"""
+
+import json
+import os
+
+import pytest
+
+from mycoder.agent.tools import session as session_module
+from mycoder.agent.tools.session import Session, set_session_directory
+
+
+@pytest.fixture
+def session_dir(tmp_path):
+    """Store sessions in a temporary directory, starting from an empty store."""
+    set_session_directory(str(tmp_path))
+    yield tmp_path
+    for state in (
+        session_module._session_data,
+        session_module._dirty_sessions,
+        session_module._saved_digests,
+        session_module._encoded_values,
+        session_module._shared_keys
+    ):
+        state.clear()
+
+
+def read_session(session_dir, session_id):
+    """Load a session file as JSON."""
+    return json.loads((session_dir / f"{session_id}.json").read_text())
+
+
+@pytest.mark.asyncio
+async def test_changes_to_retrieved_values_are_saved(session_dir):
+    """A value changed in place after retrieval should be saved as it now is."""
+    tool = Session()
+    await tool._store("s", "items", [1])
+    await tool.flush()
+
+    retrieved = await tool._retrieve("s", "items")
+    retrieved["data"].append(2)
+    await tool._store("s", "other", "x")
+    await tool.flush()
+
+    assert read_session(session_dir, "s") == {"items": [1, 2], "other": "x"}
+
+
+@pytest.mark.asyncio
+async def test_changes_to_stored_values_are_saved(session_dir):
+    """The caller's object is the one stored, so later changes to it should be saved."""
+    tool = Session()
+    value = {"count": 1}
+    await tool._store("s", "state", value)
+    await tool.flush()
+
+    value["count"] = 2
+    await tool._store("s", "other", "x")
+    await tool.flush()
+
+    assert read_session(session_dir, "s") == {"state": {"count": 2}, "other": "x"}
+
+
+@pytest.mark.asyncio
+async def test_several_changes_are_written_once(session_dir, monkeypatch):
+    """Changes made before the next flush should share one write."""
+    writes = []
+    write_session_file = session_module._write_session_file
+
+    def record_write(session_file, data):
+        writes.append(session_file)
+        write_session_file(session_file, data)
+
+    monkeypatch.setattr(session_module, "_write_session_file", record_write)
+    tool = Session()
+    for count in range(3):
+        await tool._store("s", "count", count)
+    assert writes == []
+
+    await session_module._flush_task
+
+    assert writes == [session_dir / "s.json"]
+    assert read_session(session_dir, "s") == {"count": 2}
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_changes_now(session_dir):
+    """flush() should write changes without waiting for the next flush."""
+    tool = Session()
+    await tool._store("s", "key", "value")
+    assert not (session_dir / "s.json").exists()
+
+    await tool.flush()
+
+    assert read_session(session_dir, "s") == {"key": "value"}
+
+
+@pytest.mark.asyncio
+async def test_failed_write_keeps_the_old_file(session_dir, monkeypatch):
+    """A write that fails before the rename should leave the old session intact."""
+    tool = Session()
+    await tool._store("s", "key", "old")
+    await tool.flush()
+    assert [path.name for path in session_dir.iterdir()] == ["s.json"]
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+    await tool._store("s", "key", "new")
+    await tool.flush()
+
+    assert read_session(session_dir, "s") == {"key": "old"}
+
+
+@pytest.mark.asyncio
+async def test_flush_sessions_writes_pending_changes(session_dir):
+    """flush_sessions(), which runs at exit, should write changes still waiting."""
+    tool = Session()
+    await tool._store("s", "key", "value")
+
+    session_module.flush_sessions()
+
+    assert read_session(session_dir, "s") == {"key": "value"}
+    assert not session_module._dirty_sessions
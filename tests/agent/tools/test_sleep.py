@@ -0,0 +1,60 @@
+"""
+Tests for the Sleep tool.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from mycoder.agent.tools.sleep import Sleep
+
+
+@pytest.mark.asyncio
+async def test_sleep_waits_at_least_requested_time():
+    """Sleeps should never end early, and end within one bucket of the request."""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    result = await Sleep().run(seconds=0.1)
+
+    assert 0.1 <= loop.time() - started < 0.2
+    assert result == {"message": "Slept for 0.1 seconds"}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sleeps_share_a_timer():
+    """Sleeps ending in the same bucket should be woken by one timer."""
+    loop = asyncio.get_running_loop()
+    tool = Sleep()
+
+    with patch.object(loop, "call_at", wraps=loop.call_at) as call_at:
+        await asyncio.gather(*(tool.run(seconds=0.1) for _ in range(10)))
+
+    assert call_at.call_count <= 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_sleep_does_not_affect_others():
+    """Cancelling one sleeper should leave the rest of its bucket waiting."""
+    tool = Sleep()
+    cancelled = asyncio.create_task(tool.run(seconds=0.1))
+    kept = asyncio.create_task(tool.run(seconds=0.1))
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+
+    assert (await kept)["message"] == "Slept for 0.1 seconds"
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("seconds", [0, 0.0005])
+async def test_tiny_sleeps_return_immediately(seconds):
+    """Sleeps below timer resolution should not wait on the event loop."""
+    with patch("asyncio.sleep") as sleep:
+        result = await Sleep().run(seconds=seconds)
+
+    sleep.assert_not_called()
+    assert result == {"message": f"Slept for {seconds} seconds"}
@@ -2,13 +2,14 @@
 Tests for the SubAgent tool implementation.
 """
 
+import asyncio
 import os
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from mycoder.agent.tools.sub_agent import SubAgent, SubAgentArgs
+from mycoder.agent.tools.sub_agent import SubAgent, SubAgentArgs, _agent_slot, _validate_working_dir
 
 
 @pytest.fixture
@@ -47,4 +48,95 @@ def test_sub_agent_args_validation(temp_working_dir):
     temp_file.touch()
     with pytest.raises(ValueError) as e:
         SubAgentArgs(prompt="Test", working_dir=str(temp_file))
-    assert "not a directory" in str(e.value) 
\ No newline at end of file
+    assert "not a directory" in str(e.value) 
+
+@pytest.mark.asyncio
+async def test_sub_agent_status_after_immediate_failure(temp_working_dir):
+    """A sub-agent that fails before suspending should still report its failure."""
+    tool = SubAgent()
+
+    with patch.object(SubAgent, "_run_agent", side_effect=RuntimeError("boom")):
+        result = await tool.run(prompt="Test prompt", working_dir=temp_working_dir, wait=True)
+
+    assert result["status"] == "failed"
+    assert result["error"] == "boom"
+
+
+@pytest.mark.asyncio
+async def test_sub_agent_cancel_removes_agent(temp_working_dir):
+    """Cancelled sub-agents should be forgotten without errors."""
+    tool = SubAgent()
+
+    started = await tool.run(prompt="Test prompt", working_dir=temp_working_dir)
+    cancelled = await tool.cancel(started["agent_id"])
+
+    assert cancelled["status"] == "success"
+    assert started["agent_id"] not in SubAgent._running_agents
+    assert (await tool.get_status(started["agent_id"]))["status"] == "error"
+
+
+@pytest.mark.asyncio
+async def test_sub_agents_share_limited_slots(temp_working_dir):
+    """Sub-agents past the limit should wait, and cancelled ones should free their slot."""
+    tool = SubAgent()
+
+    with patch("mycoder.agent.tools.sub_agent.MAX_SUB_AGENTS", 1):
+        with patch("mycoder.agent.tools.sub_agent._agent_slots", {}):
+            first = await tool.run(prompt="First", working_dir=temp_working_dir)
+            second = await tool.run(prompt="Second", working_dir=temp_working_dir)
+            await asyncio.sleep(0)
+            slot = _agent_slot()
+
+            assert slot.locked()
+            assert (await tool.get_status(second["agent_id"]))["status"] == "running"
+
+            await tool.cancel(first["agent_id"])
+            await asyncio.sleep(0)
+            assert slot.locked()
+
+            await tool.cancel(second["agent_id"])
+            assert not slot.locked()
+
+
+def test_working_dir_validation_is_cached(temp_working_dir):
+    """Valid working directories should only be checked on the filesystem once."""
+    _validate_working_dir.cache_clear()
+
+    for _ in range(3):
+        SubAgentArgs(prompt="Test", working_dir=temp_working_dir)
+
+    assert _validate_working_dir.cache_info().misses == 1
+
+
+def run_eagerly(coro):
+    """Run a coroutine up to its first suspension now, as an eager task would."""
+    future = asyncio.get_running_loop().create_future()
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        future.set_result(stop.value)
+    except Exception as e:
+        future.set_exception(e)
+    else:
+        raise AssertionError("coroutine suspended")
+    return future
+
+
+@pytest.mark.asyncio
+async def test_sub_agent_failing_before_first_suspension_is_forgotten(temp_working_dir):
+    """An agent that is already done when run() stores it should still be removed."""
+    tool = SubAgent()
+    tasks = []
+
+    def create_task(coro):
+        tasks.append(run_eagerly(coro))
+        return tasks[-1]
+
+    with patch("mycoder.agent.tools.sub_agent._create_eager_task", create_task):
+        with patch("mycoder.agent.tools.sub_agent._agent_slot", side_effect=RuntimeError("boom")):
+            started = await tool.run(prompt="Test prompt", working_dir=temp_working_dir)
+            await asyncio.sleep(0)
+
+    assert started["status"] == "running"
+    assert started["agent_id"] not in SubAgent._running_agents
+    assert str(tasks[0].exception()) == "boom"
@@ -0,0 +1,212 @@
+"""
+Tests for the TextEditor tool.
+"""
+
+from difflib import unified_diff
+from unittest.mock import patch
+
+import pytest
+
+from mycoder.agent.tools.text_editor import (
+    AppendArgs,
+    InsertArgs,
+    ReplaceArgs,
+    TextEditor,
+    _compile_search,
+    _diff_edit,
+)
+
+
+@pytest.fixture
+def text_file(tmp_path):
+    """Create a small text file to edit."""
+    path = tmp_path / "notes.txt"
+    path.write_text("alpha\nbeta\ngamma\n")
+    return path
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("original, appended, expected, changes", [
+    ("alpha\nbeta\n", "gamma\n", "alpha\nbeta\ngamma\n", 2),
+    ("alpha\nbeta", "gamma", "alpha\nbeta\ngamma", 3),
+    ("", "gamma", "gamma", 1)
+])
+async def test_append(tmp_path, original, appended, expected, changes):
+    """Appended content should follow the existing text on a new line."""
+    path = tmp_path / "notes.txt"
+    path.write_text(original)
+
+    result = await TextEditor()._append(str(path), appended)
+
+    assert path.read_text() == expected
+    assert result["success"]
+    assert result["changes"] == changes
+    assert result["diff"].splitlines()[-1] == "+gamma"
+
+
+@pytest.mark.asyncio
+async def test_replace_diff_uses_file_line_numbers(tmp_path):
+    """Hunks far into a file should carry the line numbers of the whole file."""
+    path = tmp_path / "big.txt"
+    path.write_text("".join(f"line {i}\n" for i in range(1, 1001)))
+
+    result = await TextEditor()._replace(str(path), "line 500\nline 501", "middle")
+
+    assert result["changes"] == 1
+    assert result["diff"].splitlines() == [
+        "--- a/big.txt",
+        "+++ b/big.txt",
+        "@@ -497,8 +497,7 @@",
+        " line 497",
+        " line 498",
+        " line 499",
+        "-line 500",
+        "-line 501",
+        "+middle",
+        " line 502",
+        " line 503",
+        " line 504"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_replace_without_match_leaves_file(text_file):
+    """A search that matches nothing should report no changes and an empty diff."""
+    result = await TextEditor()._replace(str(text_file), "delta", "epsilon")
+
+    assert result == {"success": False, "changes": 0, "diff": ""}
+    assert text_file.read_text() == "alpha\nbeta\ngamma\n"
+
+
+@pytest.mark.asyncio
+async def test_replace_case_insensitive_literal(text_file):
+    """Case-insensitive literal replacement should count matches and keep the replacement literal."""
+    text_file.write_text("Beta beta BETA\n")
+
+    result = await TextEditor()._replace(str(text_file), "beta", r"\1.b", case_sensitive=False)
+
+    assert result["changes"] == 3
+    assert text_file.read_text() == "\\1.b \\1.b \\1.b\n"
+
+
+@pytest.mark.asyncio
+async def test_replace_reuses_compiled_regex(tmp_path):
+    """The same regex applied to several files should only be compiled once."""
+    _compile_search.cache_clear()
+    paths = [tmp_path / f"file{i}.txt" for i in range(3)]
+    for path in paths:
+        path.write_text("value = 1\nvalue = 22\n")
+
+    for path in paths:
+        result = await TextEditor()._replace(str(path), r"= (\d+)", r"= <\1>", regex=True)
+        assert result["changes"] == 2
+
+    assert paths[-1].read_text() == "value = <1>\nvalue = <22>\n"
+    assert _compile_search.cache_info().misses == 1
+
+
+@pytest.mark.asyncio
+async def test_insert(text_file):
+    """Inserted lines should land before the given 1-indexed line."""
+    result = await TextEditor()._insert(str(text_file), "one\ntwo", 2)
+
+    assert text_file.read_text() == "alpha\none\ntwo\nbeta\ngamma\n"
+    assert result["changes"] == 2
+    assert "+one\n+two" in result["diff"]
+
+
+@pytest.mark.asyncio
+async def test_edits_use_utf8(text_file):
+    """Files should be read and written as UTF-8 whatever the locale."""
+    text_file.write_bytes("café\n".encode("utf-8"))
+
+    await TextEditor()._replace(str(text_file), "café", "naïve")
+
+    assert text_file.read_bytes() == "naïve\n".encode("utf-8")
+
+
+def test_file_path_validation(tmp_path, text_file):
+    """Edits should only accept paths to existing regular files."""
+    assert ReplaceArgs(file_path=str(text_file), search="a", replacement="b").file_path == str(text_file.resolve())
+
+    with pytest.raises(ValueError, match="File does not exist"):
+        AppendArgs(file_path=str(tmp_path / "missing.txt"), content="x")
+    with pytest.raises(ValueError, match="Path is not a file"):
+        InsertArgs(file_path=str(tmp_path), content="x", position=1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("original, position, header", [
+    ("", 1, "@@ -0,0 +1,2 @@"),
+    ("alpha\n", 1, "@@ -1 +1,3 @@"),
+    ("alpha\nbeta\ngamma\n", 9, "@@ -1,3 +1,5 @@"),
+    ("".join(f"line {i}\n" for i in range(1, 11)), 6, "@@ -3,6 +3,8 @@")
+])
+async def test_insert_diff_header(text_file, original, position, header):
+    """Insertion diffs should number their hunk like unified_diff, including at the edges."""
+    text_file.write_text(original)
+
+    result = await TextEditor()._insert(str(text_file), "one\ntwo", position)
+
+    assert result["diff"].splitlines()[2] == header
+
+
+@pytest.mark.asyncio
+async def test_replace_without_match_skips_write_and_diff(text_file):
+    """A miss should return before writing the file or building a diff."""
+    with patch("mycoder.agent.tools.text_editor._diff_edit") as diff_edit:
+        result = await TextEditor()._replace(str(text_file), "delta", "epsilon", regex=True)
+
+    assert result == {"success": False, "changes": 0, "diff": ""}
+    diff_edit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_append_diff_shows_tail_context(tmp_path):
+    """Appending to a long file should diff only its last lines."""
+    path = tmp_path / "long.txt"
+    path.write_text("".join(f"line {i}\n" for i in range(1, 101)))
+
+    result = await TextEditor()._append(str(path), "extra")
+
+    assert result["diff"].splitlines()[2:] == [
+        "@@ -98,3 +98,4 @@",
+        " line 98",
+        " line 99",
+        " line 100",
+        "+extra"
+    ]
+
+
+@pytest.mark.parametrize("original, new", [
+    # Inserting into a run of blank lines
+    ("a\n\n\n\n\nb\n", "a\n\n\nq\n\n\nb\n"),
+    # Deleting one of several identical lines
+    ("x\n\n\ny\n    pass\ny\n    pass\n\n\n", "x\n\n\ny\n    pass\n\n\n    pass\n\n\n"),
+    # Changing part of a line inside repeated code
+    ("def f():\n    pass\n    pass\n\ny\n    pass\n", "def f():\n    pass\n    paq\n\ny\n    pass\n"),
+    # An edit that ends mid-line and one without a final newline
+    ("a\nb\nc\nd\ne\nf\ng\nh", "a\nb\nc\nD\nE\nf\ng\nh"),
+    ("a\nx", "a\nx\ny"),
+    ("keep\n", "")
+])
+def test_diff_edit_matches_unified_diff(original, new):
+    """Diffing only the changed window should give the same diff as the whole file."""
+    def lines(text):
+        return text.split("\n")[:-1] if text.endswith("\n") else text.split("\n") if text else []
+
+    expected = "\n".join(unified_diff(
+        lines(original), lines(new), fromfile="a/f", tofile="b/f", lineterm=""
+    ))
+
+    assert _diff_edit(original, new, "f") == expected
+
+
+def test_diff_edit_inserts_into_blank_lines_cleanly():
+    """Adding a line among blank lines should show as one added line with full context."""
+    original = "top\n" + "\n" * 8 + "bottom\n"
+    new = "top\n" + "\n" * 4 + "q\n" + "\n" * 4 + "bottom\n"
+
+    assert _diff_edit(original, new, "f").splitlines()[2:] == [
+        "@@ -3,6 +3,7 @@", " ", " ", " ", "+q", " ", " ", " "
+    ]
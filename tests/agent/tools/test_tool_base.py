@@ -0,0 +1,86 @@
+"""
+Tests for the base Tool class.
+"""
+
+from typing import List, Optional
+
+import orjson
+from pydantic import BaseModel, Field
+
+from mycoder.agent.tools.base import Tool, create_tool_from_func
+
+
+class SearchArgs(BaseModel):
+    """Arguments for the test search tool."""
+
+    query: str = Field(description="Text to search for")
+    paths: List[str] = Field(default_factory=list)
+    limit: Optional[int] = None
+
+
+class SearchTool(Tool):
+    """Tool used to exercise schema generation."""
+
+    name = "search"
+    description = "Search files"
+    args_schema = SearchArgs
+
+    async def run(self, **kwargs):
+        return kwargs
+
+
+def test_schema_for_llm_is_built_once_per_args_schema():
+    """Tools sharing an args schema should reuse the same parameters schema."""
+    first = SearchTool().get_schema_for_llm()
+    second = SearchTool().get_schema_for_llm()
+
+    assert first["parameters"] is second["parameters"]
+    assert first["parameters"] == {
+        "type": "object",
+        "properties": {
+            "query": {"type": "string", "description": "Text to search for"},
+            "paths": {"type": "array", "items": {"type": "string"}},
+            "limit": {"type": "integer"}
+        },
+        "required": ["query"]
+    }
+
+
+def test_validate_args_fills_defaults():
+    """Validated arguments should include defaults for omitted fields."""
+    assert SearchTool().validate_args(query="todo") == {"query": "todo", "paths": [], "limit": None}
+
+
+def test_create_tool_from_func_reuses_classes():
+    """Wrapping the same function twice should return the same tool class."""
+    async def greet(who: str, times: int = 1):
+        """Greet someone."""
+        return f"hi {who}" * times
+
+    first = create_tool_from_func(greet)
+    second = create_tool_from_func(greet)
+
+    assert first is second
+    assert first.name == "greet"
+    assert first.description == "Greet someone."
+    assert first().validate_args(who="Sam") == {"who": "Sam", "times": 1}
+
+
+def test_schema_json_matches_schema():
+    """The cached JSON encoding should match the schema dict."""
+    tool = SearchTool()
+
+    assert tool.get_schema_json() is SearchTool().get_schema_json()
+    assert orjson.loads(tool.get_schema_json()) == tool.get_schema_for_llm()
+
+
+def test_property_schema_handles_builtin_generics():
+    """PEP 585 and PEP 604 annotations should map like their typing equivalents."""
+    async def tag(names: list[int], note: "str | None" = None, meta: dict = None):
+        """Tag things."""
+
+    properties = create_tool_from_func(tag)().get_schema_for_llm()["parameters"]["properties"]
+
+    assert properties["names"] == {"type": "array", "items": {"type": "integer"}}
+    assert properties["note"] == {"type": "string"}
+    assert properties["meta"] == {"type": "object"}